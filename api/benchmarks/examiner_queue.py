@@ -0,0 +1,141 @@
+# Copyright © 2020 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark concurrent dequeues of the examiner queue (GET /requests/queues/@me/oldest).
+
+Creates --requests DRAFT requests and --examiners users in the database of the app config, then has every examiner take
+the oldest request, put it on HOLD and take the next one until the queue is empty. The NRO calls are left out. Run it
+from api, against a scratch database migrated to head:
+
+    python benchmarks/examiner_queue.py --examiners 16 --requests 2000
+
+Modes: for-update waits on the rows other examiners have locked (the dequeue before SKIP LOCKED), skip-locked passes
+them as Request.get_queued_oldest does. A request taken twice fails the run, a mode that ends before the queue is empty
+shows in taken.
+"""
+import argparse
+import threading
+import time
+
+from namex import create_app
+from namex.models import db, Request, State, User
+
+
+NR_NUM_PREFIX = 'NR 8'
+
+
+def dequeue(user, hold: float, skip_locked: bool):
+    """Take the oldest DRAFT request with the query of Request.get_queued_oldest, holding its lock for hold seconds."""
+    r = db.session.query(Request). \
+        filter(Request.stateCd == State.DRAFT). \
+        order_by(Request.priorityCd.desc(), Request.submittedDate.asc()). \
+        with_for_update(skip_locked=skip_locked).first()
+    if not r:
+        db.session.rollback()
+        return None
+
+    time.sleep(hold)
+    r.stateCd = State.INPROGRESS
+    r.userId = user.id
+    db.session.add(r)
+    db.session.commit()
+    return r
+
+
+# name: skip_locked
+MODES = {
+    'for-update': False,
+    'skip-locked': True
+}
+
+
+def seed(app, requests: int, examiners: int) -> list:
+    """Add the DRAFT requests and return the ids of the examiners."""
+    with app.app_context():
+        cleanup(app)
+        for i in range(requests):
+            nr = Request()
+            nr.nrNum = '{0}{1:06d}'.format(NR_NUM_PREFIX, i)
+            nr.stateCd = State.DRAFT
+            nr.priorityCd = 'Y' if i % 10 == 0 else 'N'
+            db.session.add(nr)
+
+        users = [User(username='queue-bench-{}'.format(i), firstname='queue', lastname='bench',
+                      sub='idir/queue-bench-{}'.format(i), iss='keycloak') for i in range(examiners)]
+        db.session.add_all(users)
+        db.session.commit()
+        return [user.id for user in users]
+
+
+def cleanup(app):
+    """Remove the requests and users of a previous run."""
+    with app.app_context():
+        db.session.query(Request).filter(Request.nrNum.like(NR_NUM_PREFIX + '%')). \
+            delete(synchronize_session=False)
+        db.session.query(User).filter(User.username.like('queue-bench-%')).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def examine(app, skip_locked: bool, user_id: int, hold: float, taken: list, errors: list):
+    """Take requests until the queue is empty, putting each on HOLD."""
+    with app.app_context():
+        user = db.session.query(User).get(user_id)
+        try:
+            while True:
+                r = dequeue(user, hold, skip_locked)
+                if r is None:
+                    break
+                r.stateCd = State.HOLD
+                db.session.add(r)
+                db.session.commit()
+                taken.append(r.nrNum)
+        except Exception as err:  # pylint: disable=broad-except; reported with the results
+            errors.append(repr(err))
+        finally:
+            db.session.remove()
+
+
+def run(examiners: int, requests: int, hold: float):
+    """Time the dequeues of the whole queue in each mode."""
+    app = create_app()
+
+    for mode, skip_locked in MODES.items():
+        user_ids = seed(app, requests, examiners)
+        taken = []
+        errors = []
+        threads = [threading.Thread(target=examine, args=(app, skip_locked, user_id, hold, taken, errors))
+                   for user_id in user_ids]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        assert len(taken) == len(set(taken)), 'mode={0} handed out a request twice'.format(mode)
+        print('mode={0:<12} examiners={1} taken={2}/{3}  {4:8.3f}s  {5:8.1f} dequeues/s  errors={6}'.format(
+            mode, examiners, len(taken), requests, elapsed, len(taken) / elapsed, len(errors)))
+
+    cleanup(app)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--examiners', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--hold', type=float, default=0.005,
+                        help='seconds an examiner holds the lock of the request taken, for the round trips')
+    arguments = parser.parse_args()
+
+    run(arguments.examiners, arguments.requests, arguments.hold)
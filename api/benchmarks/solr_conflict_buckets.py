@@ -0,0 +1,83 @@
+# Copyright © 2020 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the Solr query modes of the conflict bucket searches (/synonymbucket, /cobrsphonetics, /phonetics).
+
+Needs SOLR_BASE_URL, pointing to a Solr loaded with the possible.conflicts core of solr/cores, and
+SOLR_SYNONYMS_API_URL. Run it from api:
+
+    python benchmarks/solr_conflict_buckets.py --names "ARMSTRONG PLUMBING" "BLUE CEDAR HOLDINGS" --repeat 5
+
+Each mode searches the same names; the examiner output is checked against the one of the serial mode.
+"""
+import argparse
+import json
+import time
+
+from namex import create_app
+from namex.analytics.solr import SolrQueries
+
+
+BUCKETS = ['synonym', 'cobrs_phonetic', 'phonetic']
+
+# name: (SOLR_FANOUT_WORKERS, SOLR_BATCH_QUERIES), the workers of the parallel modes come from --workers
+MODES = {
+    'serial': (1, False),
+    'parallel': (None, False),
+    'batched': (1, True),
+    'batched-parallel': (None, True)
+}
+
+
+def search(names: list) -> str:
+    """Return the output of every bucket search of the names, as sent to the examiners."""
+    results = [SolrQueries.get_conflict_results(name, bucket, '') for name in names for bucket in BUCKETS]
+    return json.dumps(results, sort_keys=True)
+
+
+def run(names: list, workers: int, batch_size: int, repeat: int):
+    """Time the bucket searches of the names in each mode."""
+    app = create_app()
+    app.config['SOLR_BATCH_SIZE'] = batch_size
+
+    with app.app_context():
+        baseline = None
+        baseline_elapsed = None
+        for mode, (mode_workers, batch_queries) in MODES.items():
+            app.config['SOLR_FANOUT_WORKERS'] = mode_workers or workers
+            app.config['SOLR_BATCH_QUERIES'] = batch_queries
+            # Warm up the connections and the Solr caches before timing the mode
+            output = search(names)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                search(names)
+            elapsed = (time.perf_counter() - start) / repeat
+
+            if baseline is None:
+                baseline, baseline_elapsed = output, elapsed
+            assert output == baseline, 'mode={0} returned a different output'.format(mode)
+
+            print('mode={0:<17} names={1}  {2:8.3f}s  speedup={3:5.2f}x'.format(
+                mode, len(names), elapsed, baseline_elapsed / elapsed))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--names', nargs='+', default=['ARMSTRONG PLUMBING', 'BLUE CEDAR HOLDINGS'])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    run(arguments.names, arguments.workers, arguments.batch_size, arguments.repeat)
@@ -27,9 +27,49 @@ class Config(object):
 
     SOLR_BASE_URL = os.getenv('SOLR_BASE_URL', None)
     SOLR_SYNONYMS_API_URL = os.getenv('SOLR_SYNONYMS_API_URL', None)
+    # The queries of a conflict bucket search (/synonymbucket, /cobrsphonetics, /phonetics) are sent in parallel, by
+    # at most SOLR_FANOUT_WORKERS threads, and fail when they are not all answered within SOLR_BUCKET_TIMEOUT seconds
+    SOLR_FANOUT_WORKERS = int(os.getenv('SOLR_FANOUT_WORKERS', '8'))
+    SOLR_BUCKET_TIMEOUT = float(os.getenv('SOLR_BUCKET_TIMEOUT', '20'))
+    # Send the queries of a conflict bucket SOLR_BATCH_SIZE at a time, as the sub-queries of one Solr request
+    SOLR_BATCH_QUERIES = os.getenv('SOLR_BATCH_QUERIES', 'False').lower() == 'true'
+    SOLR_BATCH_SIZE = int(os.getenv('SOLR_BATCH_SIZE', '10'))
+    # Have Solr filter the phonetic bucket candidates on the name_phonetic_key of each word, once possible.conflicts is
+    # reindexed with the field
+    SOLR_PHONETIC_KEY_FILTER = os.getenv('SOLR_PHONETIC_KEY_FILTER', 'False').lower() == 'true'
+    # Seconds the Solr analysis and synonyms API lookups of the bucket searches are cached for, 0 caches them only for
+    # the request. They are dropped when a reload of the possible.conflicts core is seen, see solr_lookup_cache
+    SOLR_LOOKUP_CACHE_TTL = int(os.getenv('SOLR_LOOKUP_CACHE_TTL', '300'))
+    SOLR_LOOKUP_CACHE_SIZE = int(os.getenv('SOLR_LOOKUP_CACHE_SIZE', '10000'))
+    SOLR_CORE_RELOAD_CHECK_INTERVAL = int(os.getenv('SOLR_CORE_RELOAD_CHECK_INTERVAL', '10'))
+    # Seconds the exact-match lookups of the examiner UI are cached for, 0 disables the cache, see exact_match_service
+    EXACT_MATCH_CACHE_TTL = int(os.getenv('EXACT_MATCH_CACHE_TTL', '10'))
+    EXACT_MATCH_CACHE_SIZE = int(os.getenv('EXACT_MATCH_CACHE_SIZE', '1000'))
+    EXACT_MATCH_TIMEOUT = float(os.getenv('EXACT_MATCH_TIMEOUT', '5'))
     NRO_EXTRACTOR_URI = os.getenv('NRO_EXTRACTOR_URI', None)
     AUTO_ANALYZE_URL = os.getenv('AUTO_ANALYZE_URL', None)
     AUTO_ANALYZE_CONFIG = os.getenv('AUTO_ANALYZE_CONFIG', None)
+    # Score the conflict candidates with the streaming endpoint of the auto-analyze service, which stops at an exact match
+    AUTO_ANALYZE_STREAM = os.getenv('AUTO_ANALYZE_STREAM', 'True').lower() == 'true'
+    # Seconds to wait for the auto-analyze scores of the conflict candidates
+    AUTO_ANALYZE_TIMEOUT = float(os.getenv('AUTO_ANALYZE_TIMEOUT', '120'))
+
+    # Calls to the other services (auto-analyze, synonyms API, Solr) share keep-alive connections, see http_session
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+    HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', '0.2'))
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+    # Seconds between checks for word classification changes, the in-memory index is patched when there are some.
+    # 0 disables the index, the word classifications are then read from the database.
+    WORD_CLASSIFICATION_REFRESH_INTERVAL = int(os.getenv('WORD_CLASSIFICATION_REFRESH_INTERVAL', '10'))
+    # Seconds between refreshes of the conflict_names view the conflict search queries, 0 disables the view.
+    # The search goes back to the requests and names tables while the view is older than the max staleness.
+    CONFLICT_CORPUS_REFRESH_INTERVAL = int(os.getenv('CONFLICT_CORPUS_REFRESH_INTERVAL', '60'))
+    CONFLICT_CORPUS_MAX_STALENESS = int(os.getenv('CONFLICT_CORPUS_MAX_STALENESS', '300'))
+    # Seconds between checks for restricted word or condition edits, the in-memory index is rebuilt when there are some.
+    # 0 disables the index, the restricted words analysis then reads the tables.
+    RESTRICTED_WORD_REFRESH_INTERVAL = int(os.getenv('RESTRICTED_WORD_REFRESH_INTERVAL', '30'))
 
     ALEMBIC_INI = 'migrations/alembic.ini'
 
@@ -106,6 +146,16 @@ class TestConfig(Config):
         port=int(DB_PORT),
         name=DB_NAME
     )
+    # Read the word classifications the tests write straight from the database
+    WORD_CLASSIFICATION_REFRESH_INTERVAL = 0
+    # Search conflicts in the names the tests write, not in a snapshot of them
+    CONFLICT_CORPUS_REFRESH_INTERVAL = 0
+    # Don't carry the Solr lookups over from one test to the next
+    SOLR_LOOKUP_CACHE_TTL = 0
+    # The exact-match tests write to Solr directly, the cache wouldn't see it
+    EXACT_MATCH_CACHE_TTL = 0
+    # Read the restricted words the tests write straight from the database
+    RESTRICTED_WORD_REFRESH_INTERVAL = 0
 
     # We can't run NRO locally for running our tests
     DISABLE_NAMEREQUEST_NRO_UPDATES = int(os.getenv('DISABLE_NAMEREQUEST_NRO_UPDATES', 1))
@@ -0,0 +1,62 @@
+"""add names.search_name, a normalized name for the conflict search candidates
+
+Revision ID: 3f2b7c9d1e04
+Revises: 8b99aacb139b
+Create Date: 2020-12-14 09:12:41.532871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2b7c9d1e04'
+down_revision = '8b99aacb139b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+
+    op.add_column('names', sa.Column('search_name', sa.String(length=1024), nullable=True))
+
+    # The lower case name without punctuation or spaces and with repeated characters collapsed, eg.
+    # 'G.O.O.L.D  MINE' -> 'goldmine'
+    op.execute(
+        r"""
+        CREATE OR REPLACE FUNCTION public.get_search_name(p_name text) RETURNS text
+        LANGUAGE sql IMMUTABLE RETURNS NULL ON NULL INPUT
+        AS $$SELECT regexp_replace(regexp_replace(lower(p_name), '\W+', '', 'g'), '(.)\1+', '\1', 'g')$$;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.names_search_name_trigger() RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$BEGIN
+        NEW.search_name := get_search_name(NEW.name);
+        RETURN NEW;
+        END;$$;
+        """
+    )
+
+    op.execute(
+        """
+        CREATE TRIGGER names_search_name BEFORE INSERT OR UPDATE OF name ON names
+        FOR EACH ROW EXECUTE PROCEDURE names_search_name_trigger();
+        """
+    )
+
+    op.execute('UPDATE names SET search_name = get_search_name(name);')
+
+    op.execute('CREATE INDEX ix_names_search_name_trgm ON names USING gin (search_name gin_trgm_ops);')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_names_search_name_trgm;')
+    op.execute('DROP TRIGGER IF EXISTS names_search_name ON names;')
+    op.execute('DROP FUNCTION IF EXISTS public.names_search_name_trigger();')
+    op.execute('DROP FUNCTION IF EXISTS public.get_search_name(text);')
+    op.drop_column('names', 'search_name')
@@ -0,0 +1,27 @@
+"""add a partial index on the DRAFT requests, in the order the examiner queue hands them out
+
+Revision ID: 5a1d8e3f0c27
+Revises: c81e4a6d0b37
+Create Date: 2020-12-21 10:26:48.304517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a1d8e3f0c27'
+down_revision = 'c81e4a6d0b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Request.get_queued_oldest: WHERE state_cd = 'DRAFT' ORDER BY priority_cd DESC, submitted_date ASC
+    # FOR UPDATE SKIP LOCKED. The DRAFT requests are a small part of the table, the index only holds them.
+    op.create_index('ix_requests_draft_queue', 'requests', [sa.text('priority_cd DESC'), 'submitted_date'],
+                    postgresql_where=sa.text("state_cd = 'DRAFT'"))
+
+
+def downgrade():
+    op.drop_index('ix_requests_draft_queue', table_name='requests')
@@ -0,0 +1,29 @@
+"""add trigram indexes for the contains filters of the examiner search (GET /requests)
+
+Revision ID: 9e4c2b7a5d18
+Revises: 5a1d8e3f0c27
+Create Date: 2020-12-22 15:04:12.718203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4c2b7a5d18'
+down_revision = '5a1d8e3f0c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # compName is names.name ILIKE '%x%' and nrNum is nr_num LIKE '%x%', a b-tree can't serve either. pg_trgm is
+    # created by 3f2b7c9d1e04; the patterns need 3 characters or more to use the indexes.
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+    op.execute('CREATE INDEX ix_names_name_trgm ON names USING gin (name gin_trgm_ops);')
+    op.execute('CREATE INDEX ix_requests_nr_num_trgm ON requests USING gin (nr_num gin_trgm_ops);')
+
+
+def downgrade():
+    op.drop_index('ix_requests_nr_num_trgm', table_name='requests')
+    op.drop_index('ix_names_name_trgm', table_name='names')
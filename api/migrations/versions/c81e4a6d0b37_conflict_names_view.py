@@ -0,0 +1,53 @@
+"""add the conflict_names materialized view, the names the conflict search looks at
+
+Revision ID: c81e4a6d0b37
+Revises: 3f2b7c9d1e04
+Create Date: 2020-12-18 14:37:05.118640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81e4a6d0b37'
+down_revision = '3f2b7c9d1e04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Same rows as Request.get_general_query: the names of the queued requests, and the approved names of the
+    # completed ones. Filters that depend on the day (expiration_date) are applied when querying.
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW conflict_names AS
+        SELECT n.id, n.name, n.search_name, n.consumption_date, r.submitted_date, n.corp_num, r.nr_num,
+               r.request_type_cd, r.expiration_date, r.state_cd IN ('DRAFT', 'HOLD', 'INPROGRESS') AS queue
+        FROM requests r JOIN names n ON n.nr_id = r.id
+        WHERE r.request_type_cd IN ('PA', 'CR', 'CCR', 'CT', 'RCR', 'CP', 'CCP', 'CTC', 'RCP', 'FI', 'CFI', 'RFI',
+                                    'SO', 'ASO', 'CSO', 'CSSO', 'CTSO', 'RSO', 'UL', 'UC', 'CUL', 'ULCT', 'RUL',
+                                    'XSO', 'XASO', 'XCASO', 'XCSO', 'XRSO', 'CC', 'CCC', 'CCV', 'CCCT', 'RCC', 'PAR',
+                                    'XCR', 'XCCR', 'XRCR', 'AS', 'XUL', 'UA', 'XCUL', 'XRUL', 'XCP', 'XCCP', 'XRCP',
+                                    'BC')
+          AND (r.state_cd IN ('DRAFT', 'HOLD', 'INPROGRESS') OR
+               (r.state_cd IN ('APPROVED', 'CONDITIONAL', 'COND-RESERVE', 'RESERVED') AND
+                n.state IN ('APPROVED', 'CONDITION', 'RESERVED', 'COND-RESERVE')));
+        """
+    )
+    # REFRESH ... CONCURRENTLY needs a unique index
+    op.execute('CREATE UNIQUE INDEX ix_conflict_names_id ON conflict_names (id);')
+    op.execute('CREATE INDEX ix_conflict_names_queue ON conflict_names (queue);')
+    op.execute('CREATE INDEX ix_conflict_names_search_name_trgm ON conflict_names USING gin (search_name gin_trgm_ops);')
+
+    op.create_table('conflict_names_refresh',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('duration', sa.Float(), nullable=True),
+                    sa.PrimaryKeyConstraint('id'))
+    op.execute('INSERT INTO conflict_names_refresh (id, refreshed_at) VALUES (1, now());')
+
+
+def downgrade():
+    op.drop_table('conflict_names_refresh')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS conflict_names;')
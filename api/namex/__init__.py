@@ -19,6 +19,12 @@ jwt = JwtManager()
 from namex.services.nro import NROServices
 nro = NROServices()
 from namex.models import db, ma
+from namex.services.word_classification.word_classification_index import word_classification_index_service
+from namex.services.conflict_corpus.conflict_corpus import conflict_corpus_service
+from namex.services.restricted_words.restricted_word_index import restricted_word_index_service
+from namex.utils.http_session import http_session_service
+from namex.analytics.solr_lookup_cache import solr_lookup_cache
+from namex.services.exact_match.exact_match import exact_match_service
 from namex.resources import api
 from namex import models
 from namex.utils.run_version import get_run_version
@@ -39,6 +45,12 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     setup_jwt_manager(app, jwt)
 
     nro.init_app(app)
+    http_session_service.init_app(app)
+    solr_lookup_cache.init_app(app)
+    exact_match_service.init_app(app)
+    word_classification_index_service.init_app(app)
+    conflict_corpus_service.init_app(app)
+    restricted_word_index_service.init_app(app)
 
     @app.after_request
     def add_version(response):
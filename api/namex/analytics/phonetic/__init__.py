@@ -1,4 +1,4 @@
-
+from functools import lru_cache
 
 
 def first_vowels(word, leading_vowel = False):
@@ -167,3 +167,22 @@ def replace_special_leading_sounds(word):
             word = replacement + word[len(special_leading_sound):]
 
     return word
+
+
+# The phonetic bucket ignores these words, a set for the lookups of SolrQueries.post_treatment
+DESIGNATIONS = frozenset(designations())
+
+PHONETIC_KEY_CACHE_SIZE = 65536
+
+
+# The sound of a word the phonetic bucket compares, its first consonants and first vowels (in the order they come in
+# the word). Solr stores the key of each word of the names in the name_phonetic_key field of possible.conflicts, its
+# analysis chain must be kept in step with this function.
+@lru_cache(maxsize=PHONETIC_KEY_CACHE_SIZE)
+def phonetic_key(word):
+    word = replace_special_leading_sounds(word)
+    leading_vowel = has_leading_vowel(word)
+
+    if leading_vowel:
+        return first_vowels(word, leading_vowel) + first_consonants(word)
+    return first_consonants(word) + first_vowels(word, leading_vowel)
@@ -1,6 +1,7 @@
 from flask import jsonify, current_app
 from sqlalchemy import text, exc
 from namex.models import db
+from namex.services.restricted_words.restricted_word_index import restricted_word_index_service
 
 
 class RestrictedWords(object):
@@ -16,10 +17,15 @@ class RestrictedWords(object):
                 3. finds condition info with the 'word id' for each restricted word in 'content'
                         - pairs each word with its condition info in a dict
                 4. returns json containing the list of word/condition dicts
+            Steps 2 and 3 are a lookup in the restricted word index once it is loaded, see restricted_word_index
         """
 
         stripped_content = RestrictedWords.strip_content(content)
 
+        index = restricted_word_index_service.get()
+        if index is not None:
+            return {"restricted_words_conditions": index.find(stripped_content)}, None, None
+
         try:
             restricted_words_dict = RestrictedWords.find_restricted_words(stripped_content)
 
@@ -69,7 +75,7 @@ class RestrictedWords(object):
                 - query for list of all restricted words
                     - strip each word/phrase of spaces and check if they are a substring of 'stripped_content'
         """
-        restricted_words_obj = db.engine.execute("select * from restricted_word;")
+        restricted_words_obj = db.engine.execute("select * from restricted_word order by word_id;")
         restricted_words_dict = []
         for row in restricted_words_obj:
             if ' ' + row[1].upper().strip() + ' ' in content:
@@ -81,19 +87,19 @@ class RestrictedWords(object):
     def find_cnd_info(word_id):
         """ Get the condition info corresponding to the given word id
         """
-        get_cnd_id_sql = text("select cnd_id from restricted_word_condition where word_id = {}".format(word_id))
-        cnd_id_obj = db.engine.execute(get_cnd_id_sql)
+        get_cnd_id_sql = text("select cnd_id from restricted_word_condition where word_id = :word_id order by cnd_id")
+        cnd_id_obj = db.engine.execute(get_cnd_id_sql, word_id=word_id)
         cnd_ids = cnd_id_obj.fetchall()
 
         cnd_obj_list = []
         for id in cnd_ids:
-            cnd_id = id[0]
-            get_cnd_sql = text("select * from restricted_condition where cnd_id = {}".format(cnd_id))
-            cnd_obj_list.append(db.engine.execute(get_cnd_sql))
+            get_cnd_sql = text("select * from restricted_condition where cnd_id = :cnd_id")
+            cnd_obj_list.append(db.engine.execute(get_cnd_sql, cnd_id=id[0]))
 
         cnd_info = []
         for obj in cnd_obj_list:
             obj_tuple = obj.fetchall()[0]
+            cnd_id = obj_tuple[0]
             cnd_text = obj_tuple[1]
             cnd_allow_use = obj_tuple[2]
             cnd_consent_req = obj_tuple[3]
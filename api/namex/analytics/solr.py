@@ -1,12 +1,16 @@
 import json
+import os
 import string
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from typing import List
 
 from flask import current_app
-from urllib import request, parse
-from urllib.error import HTTPError
+from urllib import parse
 import re
-from namex.analytics.phonetic import first_vowels, designations, first_consonants, has_leading_vowel, replace_special_leading_sounds
+from namex.utils.http_session import get_session
+from namex.analytics.solr_lookup_cache import solr_lookup_cache
+from namex.analytics.phonetic import DESIGNATIONS, phonetic_key
 
 
 # Use this character in the search strings to indicate that the word should not by synonymized.
@@ -25,6 +29,38 @@ NO_SYNONYMS_PREFIX = '&fq=name_copy:'
 # Prefix used to indicate that we have synonyms.
 SYNONYMS_PREFIX = '&fq=name_with_synonyms:'
 
+# Characters name_pre_processing removes, the quotes only after the 'n (as in rock 'n roll)
+NAME_PUNCTUATION_TABLE = str.maketrans('', '', '!@#%&\\/{}[])(+-|?.,_')
+NAME_QUOTES_TABLE = str.maketrans('', '', '\'"')
+
+# Defaults of SOLR_FANOUT_WORKERS, SOLR_BUCKET_TIMEOUT and SOLR_BATCH_SIZE, see SolrQueries._get_all
+DEFAULT_FANOUT_WORKERS = 8
+DEFAULT_BUCKET_TIMEOUT = 20  # seconds
+DEFAULT_BATCH_SIZE = 10
+
+# Batched queries (SOLR_BATCH_QUERIES) are [subquery] fields named stack0, stack1, ..., see SolrQueries._get_batch
+SUBQUERY_FIELD_PREFIX = 'stack'
+SUBQUERY_IGNORED_PARAMS = ('wt', 'indent', 'hl')
+
+_fanout_executor = None
+_fanout_workers = None
+_fanout_pid = None
+_fanout_lock = threading.Lock()
+
+
+# The thread pool sending the Solr queries of the process, threads don't survive a fork (eg. the gunicorn workers).
+def _get_fanout_executor(workers):
+    global _fanout_executor, _fanout_workers, _fanout_pid
+
+    with _fanout_lock:
+        if _fanout_executor is None or _fanout_workers != workers or _fanout_pid != os.getpid():
+            if _fanout_executor is not None and _fanout_pid == os.getpid():
+                _fanout_executor.shutdown(wait=False)
+            _fanout_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='solr-fanout')
+            _fanout_workers = workers
+            _fanout_pid = os.getpid()
+        return _fanout_executor
+
 
 class SolrQueries:
     PROX_SYN_CONFLICTS = 'proxsynconflicts'
@@ -86,7 +122,7 @@ class SolrQueries:
             '&fl=source,id,name,score,start_date,jurisdiction'
             '&sort=score%20desc,txt_starts_with%20asc'
             '&fq=-{exact_name}'
-            '{synonyms_clause}',
+            '{synonyms_clause}{phonetic_key_clause}',
         CONFLICTS:
             '/solr/possible.conflicts/select?'
             'defType=edismax'
@@ -158,6 +194,14 @@ class SolrQueries:
         else:
             connections = cls.get_phonetic_results(solr_base_url, name, phon_search_strs, name_tokens)
 
+        return cls.stack_conflict_results(connections, bucket, list_name_split, stemmed_words, synonyms_for_word, start,
+                                          rows)
+
+    # Order the docs of the stacks (the (result, stack title) connections of the bucket) for the examiners: the
+    # stack titles, each followed by its docs not seen in an earlier stack, the ones with a synonym of the name first.
+    @classmethod
+    def stack_conflict_results(cls, connections, bucket, list_name_split, stemmed_words, synonyms_for_word, start=0,
+                               rows=100):
         try:
             solr = {'response':{'numFound': 0,
                                 'start': start,
@@ -166,8 +210,17 @@ class SolrQueries:
                                 'docs': []},
                     'highlighting': []}
 
-            seen_names = []
-            passed_names = []
+            # names are looked up in sets and the pre-processing of each name is done once, the docs of a stack are
+            # matched against every synonym of the name
+            processed_names = {}
+
+            def get_processed_name(doc_name):
+                processed_name = processed_names.get(doc_name)
+                if processed_name is None:
+                    processed_name = processed_names[doc_name] = cls.name_pre_processing(doc_name).upper()
+                return processed_name
+
+            seen_names = set()
             previous_stack_title = ''
             stem_count = len(stemmed_words) * 2 + 1
             count = -1
@@ -189,63 +242,45 @@ class SolrQueries:
                     stem_count -= 1
                     previous_stack_title = result_name
 
-                if len(result['response']['docs']) > 0:
+                docs = result['response']['docs']
+                if len(docs) > 0:
                     ordered_names = []
-                    missed_names = []
+                    # the docs not matching a synonym, in the order they were first seen, keyed by name
+                    missed_names = {}
                     # if there is a bracket in the stack title then there is a 'synonyms:(...)' clause
                     if 'synonyms:(' in result_name:
                         synonyms = result_name[result_name.find('(') + 1:result_name.find(')')]
                         synonyms = [x.strip() for x in synonyms.split(',')]
                         for synonym in synonyms:
-                            if synonym.upper() in synonyms_for_word:
-                                for word in synonyms_for_word[synonym.upper()]:
-                                    for item in result['response']['docs']:
-                                        processed_name = cls.name_pre_processing(item['name']).upper()
-                                        if item['name'] not in seen_ordered_names and item['name'] not in missed_names:
-                                            missed_names.append(item['name'])
-                                        if item['name'] not in seen_ordered_names:
-
-                                            if word.upper() in processed_name.upper():
-                                                seen_ordered_names.append(item['name'])
-                                                ordered_names.append({'name_info': item, 'stems': [word.upper()]})
-                                                missed_names.remove(item['name'])
-
-                                            elif word.upper()[:-1] in processed_name.upper() and len(word) > 4:
-                                                seen_ordered_names.append(item['name'])
-                                                ordered_names.append({'name_info': item, 'stems': [word.upper()[:-1]]})
-                                                missed_names.remove(item['name'])
-
-                                    # # in case a name has more than one synonym in it
-                                    # for ordered in ordered_names:
-                                    #     if word.upper() in cls.name_pre_processing(ordered['name_info']['name'].upper()):
-                                    #         for stem in ordered['stems']:
-                                    #             # i.e. don't want to add 'dev' if 'develop' is added as a stem
-                                    #             if word not in stem:
-                                    #                 ordered['stems'].append(word.upper())
-                                    #     elif word.upper()[:-1] in cls.name_pre_processing(ordered['name_info']['name'].upper()) and len(word) > 4:
-                                    #         for stem in ordered['stems']:
-                                    #             # i.e. don't want to add 'dev' if 'develop' is added as a stem
-                                    #             if word not in stem:
-                                    #                 ordered['stems'].append(word.upper()[:-1])
+                            for word in synonyms_for_word.get(synonym.upper(), ()):
+                                word_upper = word.upper()
+                                for item in docs:
+                                    if item['name'] in seen_ordered_names:
+                                        continue
+
+                                    processed_name = get_processed_name(item['name'])
+                                    if word_upper in processed_name:
+                                        stems = [word_upper]
+                                    elif word_upper[:-1] in processed_name and len(word) > 4:
+                                        stems = [word_upper[:-1]]
+                                    else:
+                                        missed_names.setdefault(item['name'], item)
+                                        continue
+
+                                    seen_ordered_names.add(item['name'])
+                                    ordered_names.append({'name_info': item, 'stems': stems})
+                                    missed_names.pop(item['name'], None)
 
                     else:
-                        for item in result['response']['docs']:
+                        for item in docs:
                             if item['name'] not in seen_ordered_names:
-                                seen_ordered_names.append(item['name'])
+                                seen_ordered_names.add(item['name'])
                                 ordered_names.append({'name_info': item, 'stems': []})
 
                     if len(missed_names) > 0:
-                        current_app.logger.debug('In {} stack UNSORTED results: {}'.format(previous_stack_title, missed_names))
-                        for missed in missed_names.copy():
-                            for item in result['response']['docs']:
-                                if missed == item['name']:
-                                    ordered_names.append({'name_info': item, 'stems': []})
-                                    missed_names.remove(missed)
-                                    break
-
-                        if len(missed_names) > 0:
-                            # should never get here
-                            current_app.logger.error('In {} stack MISSED results: {}'.format(previous_stack_title, missed_names))
+                        current_app.logger.debug('In {} stack UNSORTED results: {}'.format(previous_stack_title, list(missed_names)))
+                        for item in missed_names.values():
+                            ordered_names.append({'name_info': item, 'stems': []})
 
                     final_names_list = []
 
@@ -253,77 +288,53 @@ class SolrQueries:
                     if bucket == 'synonym':
 
                         pivot_list = []
-                        for key in name_tokens['stemmed_words']:
+                        for key in stemmed_words:
                             pivot_list.insert(0,key.upper())
-                        seen_for_pivot = []
                         if '*' not in connection[1]:
                             count += 1
                         for pivot in pivot_list[count:]:
                             sorted_names = []
-                            if pivot in synonyms_for_word:
-                                for synonym in synonyms_for_word[pivot]:
-                                    for name in ordered_names:
-                                        if name['name_info']['name'] in seen_for_pivot:
-                                            pass
+                            seen_for_pivot = set()
+                            for synonym in synonyms_for_word.get(pivot, ()):
+                                synonym_upper = synonym.upper()
+                                for name in ordered_names:
+                                    if name['name_info']['name'] in seen_for_pivot:
+                                        continue
+
+                                    processed_name = ' ' + get_processed_name(name['name_info']['name'])
+                                    if ' ' + synonym_upper in processed_name:
+                                        stem = [synonym_upper]
+                                        if stem[0] not in name['stems']:
+                                            sorted_names.append({'name_info': name['name_info'], 'stems': stem + name['stems'].copy()})
                                         else:
-                                            processed_name = cls.name_pre_processing(name['name_info']['name'])
-
-                                            if ' ' + synonym.upper() in ' ' + processed_name.upper():
-                                                stem = [synonym.upper()]
-                                                if stem[0] not in name['stems']:
-                                                    sorted_names.append({'name_info': name['name_info'], 'stems': stem + name['stems'].copy()})
-                                                else:
-                                                    sorted_names.append({'name_info': name['name_info'], 'stems': name['stems']})
-
-                                                seen_for_pivot.append(name['name_info']['name'])
-                                                if name['name_info']['name'] in passed_names:
-                                                    passed_names.remove(name['name_info']['name'])
-
-                                            elif ' ' + synonym.upper()[:-1] in ' ' + processed_name.upper() and len(synonym) > 4:
-                                                stem = [synonym.upper()[:-1]]
-                                                stack_title_info = solr['response']['docs'].pop()
-                                                if stem[0] not in name['stems']:
-                                                    sorted_names.append({'name_info': name['name_info'],'stems': stem + name['stems'].copy()})
-                                                    if stem[0] not in stack_title_info['stems'] and synonym.upper() in stack_title_info['stems']:
-                                                        stack_title_info['stems'] += stem
-                                                else:
-                                                    sorted_names.append(
-                                                        {'name_info': name['name_info'], 'stems': name['stems']})
-                                                solr['response']['docs'].append(stack_title_info)
-
-                                                seen_for_pivot.append(name['name_info']['name'])
-                                                if name['name_info']['name'] in passed_names:
-                                                    passed_names.remove(name['name_info']['name'])
-
-                                            elif name['name_info']['name'] not in passed_names:
-                                                passed_names.append(name['name_info']['name'])
-
-                            no_duplicates = []
-                            for ordered in ordered_names:
-                                duplicate = False
-                                for sorted in sorted_names:
-                                    if ordered['name_info']['name'] == sorted['name_info']['name']:
-                                        duplicate = True
-                                if not duplicate:
-                                    no_duplicates.append(ordered)
-
-                            ordered_names = sorted_names.copy() + no_duplicates.copy()
-
-                            for seen in seen_for_pivot:
-                                if seen not in seen_ordered_names:
-                                    seen_ordered_names.append(seen)
-
-                            seen_for_pivot.clear()
-                            sorted_names.clear()
+                                            sorted_names.append({'name_info': name['name_info'], 'stems': name['stems']})
+
+                                        seen_for_pivot.add(name['name_info']['name'])
+
+                                    elif ' ' + synonym_upper[:-1] in processed_name and len(synonym) > 4:
+                                        stem = [synonym_upper[:-1]]
+                                        stack_title_info = solr['response']['docs'][-1]
+                                        if stem[0] not in name['stems']:
+                                            sorted_names.append({'name_info': name['name_info'],'stems': stem + name['stems'].copy()})
+                                            if stem[0] not in stack_title_info['stems'] and synonym_upper in stack_title_info['stems']:
+                                                stack_title_info['stems'] += stem
+                                        else:
+                                            sorted_names.append(
+                                                {'name_info': name['name_info'], 'stems': name['stems']})
+
+                                        seen_for_pivot.add(name['name_info']['name'])
+
+                            ordered_names = sorted_names + [ordered for ordered in ordered_names
+                                                            if ordered['name_info']['name'] not in seen_for_pivot]
+                            seen_ordered_names |= seen_for_pivot
 
                         final_names_list += ordered_names
                     else:
                         for item in ordered_names:
                             final_names_list.append(item)
-                            seen_ordered_names.append(item['name_info']['name'])
+                            seen_ordered_names.add(item['name_info']['name'])
 
-                    seen_names += seen_ordered_names.copy()
-                    seen_ordered_names.clear()
+                    seen_names |= seen_ordered_names
 
                     solr['response']['docs'] += final_names_list
 
@@ -344,7 +355,8 @@ class SolrQueries:
     def get_synonym_results(cls, solr_base_url, name, prox_search_strs, old_alg_search_strs, name_tokens, exact_phrase, start=0, rows=100):
 
         try:
-            connections = []
+            queries = []
+            titles = []
             if name == '':
                 name = '*'
                 prox_search_strs.append((['*'],'','',1))
@@ -367,10 +379,10 @@ class SolrQueries:
                             exact_phrase_clause=exact_phrase_clause,
                         )
                         current_app.logger.debug('Query: ' + query)
-                        connections.append((json.load(request.urlopen(query)),
-                                            '----' + prox_search_str.replace('\\', '').replace('*','').replace('@','')
-                                            + synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')
-                                            + ' - PROXIMITY SEARCH'))
+                        queries.append(query)
+                        titles.append('----' + prox_search_str.replace('\\', '').replace('*','').replace('@','')
+                                      + synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')
+                                      + ' - PROXIMITY SEARCH')
 
                 query = solr_base_url + SolrQueries.queries['oldsynconflicts'].format(
                     start=start,
@@ -381,11 +393,13 @@ class SolrQueries:
                     name_copy_clause=cls._get_name_copy_clause(name)
                 )
                 current_app.logger.debug('Query: ' + query)
-                connections.append((json.load(request.urlopen(query)), '----' +
-                                    old_alg_search_str.replace('\\', '').replace('%20', ' ').replace('**','*') +
-                                    synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ') +
-                                    ' - EXACT WORD ORDER'))
-            return connections
+                queries.append(query)
+                titles.append('----' +
+                              old_alg_search_str.replace('\\', '').replace('%20', ' ').replace('**','*') +
+                              synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ') +
+                              ' - EXACT WORD ORDER')
+
+            return list(zip(cls._get_all(queries), titles))
 
         except Exception as err:
             current_app.logger.error(err, query)
@@ -397,7 +411,8 @@ class SolrQueries:
             if search_strs == []:
                 connections = [({'response':{'numFound':0,'docs':[]},'responseHeader':{'params':{'q':'*'}}},'----*')]
             else:
-                connections = []
+                queries = []
+                titles = []
                 for str_tuple in search_strs:
                     synonyms_clause = cls._get_synonyms_clause(str_tuple[1], str_tuple[2], name_tokens)
                     for name in str_tuple[0]:
@@ -410,9 +425,11 @@ class SolrQueries:
                             exact_name='name_no_synonyms:\"' + start_str.replace(' ', '%20') + '\"~{}'.format(str_tuple[3]),
                         )
                         current_app.logger.debug('Query: ' + query)
-                        result = json.load(request.urlopen(query))
-                        connections.append((result, '----' + start_str.replace('*','').replace('@','') +
-                                            synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')))
+                        queries.append(query)
+                        titles.append('----' + start_str.replace('*','').replace('@','') +
+                                      synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', '))
+
+                connections = list(zip(cls._get_all(queries), titles))
             return connections
 
         except Exception as err:
@@ -425,7 +442,9 @@ class SolrQueries:
             if search_strs == []:
                 connections = [({'response':{'numFound':0,'docs':[]},'responseHeader':{'params':{'q':'*'}}},'----*')]
             else:
-                connections = []
+                queries = []
+                start_strs = []
+                titles = []
                 for str_tuple in search_strs:
                     synonyms_clause = cls._get_synonyms_clause(str_tuple[1], str_tuple[2], name_tokens)
                     start_str = str_tuple[0]
@@ -435,13 +454,19 @@ class SolrQueries:
                         start_str='\"' + parse.quote(start_str).replace('%2A', '') + '\"~{}'.format(str_tuple[3]),
                         synonyms_clause=synonyms_clause,
                         exact_name='name_no_synonyms:\"' + start_str.replace(' ', '%20') + '\"~{}'.format(str_tuple[3]),
+                        phonetic_key_clause=cls._get_phonetic_key_clause(start_str),
                     )
                     current_app.logger.debug('Query: ' + query)
-                    result = json.load(request.urlopen(query))
+                    queries.append(query)
+                    start_strs.append(start_str)
+                    titles.append('----' + start_str.replace('*','').replace('@','') +
+                                  synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', '))
+
+                connections = []
+                for result, start_str, title in zip(cls._get_all(queries), start_strs, titles):
                     docs = result['response']['docs']
                     result['response']['docs'] = cls.post_treatment(docs, start_str)
-                    connections.append((result, '----' + start_str.replace('*','').replace('@','') +
-                                        synonyms_clause.replace('&fq=name_with_', ' ').replace('%20', ', ')))
+                    connections.append((result, title))
             return connections
 
         except Exception as err:
@@ -472,13 +497,13 @@ class SolrQueries:
                 name_copy_clause=cls._get_name_copy_clause(name)
             )
             current_app.logger.debug('Query: ' + query)
-            connection = request.urlopen(query)
+            connection = cls._get(query)
         except Exception as err:
             current_app.logger.error(err, query)
             return None, 'Internal server error', 500
 
         try:
-            solr = json.load(connection)
+            solr = connection.json()
             results = {"response": {"numFound": solr['response']['numFound'],
                                     "start": solr['response']['start'],
                                     "rows": solr['responseHeader']['params']['rows'],
@@ -638,6 +663,101 @@ class SolrQueries:
 
         return multiples
 
+    # GET the url through the shared keep-alive session, error answers are raised like urlopen does.
+    @classmethod
+    def _get(cls, url):
+        connection = get_session().get(url)
+        connection.raise_for_status()
+        return connection
+
+    # Call the /analysis/field url, the answer is cached (see solr_lookup_cache) and must not be changed.
+    @classmethod
+    def _get_analysis(cls, query):
+        def lookup():
+            current_app.logger.debug('Query: ' + query)
+            return cls._get(query).json()
+
+        return solr_lookup_cache.get(('analysis', query), lookup)
+
+    # GET the urls in parallel, with at most SOLR_FANOUT_WORKERS requests in flight for the process. Raises the first
+    # error, or a TimeoutError when they are not all answered within SOLR_BUCKET_TIMEOUT seconds.
+    # With SOLR_BATCH_QUERIES the urls are sent SOLR_BATCH_SIZE at a time, see _get_batch.
+    # @:return The json answers, in the order of urls
+    @classmethod
+    def _get_all(cls, urls):
+        urls = list(urls)
+        if not current_app.config.get('SOLR_BATCH_QUERIES', False):
+            return cls._fan_out(lambda url: cls._get(url).json(), urls)
+
+        batch_size = max(1, current_app.config.get('SOLR_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+        batches = [urls[idx:idx + batch_size] for idx in range(0, len(urls), batch_size)]
+        return [result for results in cls._fan_out(cls._get_batch, batches) for result in results]
+
+    @classmethod
+    def _fan_out(cls, fetch, items):
+        timeout = current_app.config.get('SOLR_BUCKET_TIMEOUT', DEFAULT_BUCKET_TIMEOUT)
+        executor = _get_fanout_executor(current_app.config.get('SOLR_FANOUT_WORKERS', DEFAULT_FANOUT_WORKERS))
+
+        futures = [executor.submit(fetch, item) for item in items]
+        if not futures:
+            return []
+
+        done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+
+        for future in futures:
+            if future in done and future.exception() is not None:
+                raise future.exception()
+        if not_done:
+            raise TimeoutError('SOLR: {} of {} requests not answered within {}s'.format(len(not_done), len(futures),
+                                                                                       timeout))
+
+        return [future.result() for future in futures]
+
+    # Send the /select urls of one core in a single request: each url becomes a [subquery] field (Solr 6.1+) of the
+    # one document the main query returns. Sub-queries run on the same searcher with their own q, fq, sort, start, rows
+    # and fl, so they answer the same numFound, docs and scores; only the highlighting, unused by the conflict buckets,
+    # is dropped.
+    # @:return The json answers, in the order of urls, shaped like the ones of the urls
+    @classmethod
+    def _get_batch(cls, urls):
+        if len(urls) == 1:
+            return [cls._get(urls[0]).json()]
+
+        select_url = urls[0].split('?', 1)[0]
+        params = [('q', '*:*'), ('rows', '1'), ('wt', 'json')]
+        fields = []
+        stacks = []
+        for idx, url in enumerate(urls):
+            url_path, query_string = url.split('?', 1)
+            if url_path != select_url:
+                raise ValueError('SOLR: batched queries must go to the same core: {}, {}'.format(select_url, url_path))
+
+            field = '{}{}'.format(SUBQUERY_FIELD_PREFIX, idx)
+            stack_params = {}
+            for key, value in parse.parse_qsl(query_string, keep_blank_values=True):
+                if key in SUBQUERY_IGNORED_PARAMS or key.startswith('hl.'):
+                    continue
+                params.append((field + '.' + key, value))
+                stack_params.setdefault(key, []).append(value)
+
+            fields.append('{}:[subquery]'.format(field))
+            stacks.append((field, stack_params))
+        params.append(('fl', ','.join(fields)))
+
+        connection = get_session().post(select_url, data=params)
+        connection.raise_for_status()
+        docs = connection.json()['response']['docs']
+        if not docs:
+            # Nothing in the core to hang the sub-queries on, it has nothing for them either but ask them one by one
+            return [cls._get(url).json() for url in urls]
+
+        # Echo the parameters of each sub-query like Solr does, a list for the repeated ones
+        return [{'responseHeader': {'params': {key: values[0] if len(values) == 1 else values
+                                               for key, values in stack_params.items()}},
+                 'response': docs[0][field]} for field, stack_params in stacks]
+
 
     # Call the synonyms API for the given token.
     @classmethod
@@ -648,19 +768,20 @@ class SolrQueries:
 
         # If the web service call fails, the caller will catch and then return a 500 for us.
         query = solr_synonyms_api_url + '/synonyms/' + col + '/' + parse.quote(token)
-        current_app.logger.debug('Query: ' + query)
 
-        try:
-            connection = request.urlopen(query)
-        except HTTPError as http_error:
+        def lookup():
+            current_app.logger.debug('Query: ' + query)
+            connection = get_session().get(query)
             # Expected when the token does not have synonyms.
-            if http_error.code == 404:
+            if connection.status_code == 404:
                 return False
 
             # Not sure what it is, pass it up.
-            raise http_error
+            connection.raise_for_status()
 
-        return connection.status == 200
+            return connection.status_code == 200
+
+        return solr_lookup_cache.get(('synonyms_exist', query), lookup)
 
     # Call the synonyms API for list of synonyms matching the given token.
     @classmethod
@@ -671,24 +792,26 @@ class SolrQueries:
 
         # If the web service call fails, the caller will catch and then return a 500 for us.
         query = solr_synonyms_api_url + '/synonyms/' + 'stems_text' + '/' + parse.quote(token)
-        current_app.logger.debug('Query: ' + query)
-        try:
-            connection = request.urlopen(query)
-        except HTTPError as http_error:
+
+        def lookup():
+            current_app.logger.debug('Query: ' + query)
+            connection = get_session().get(query)
             # Expected when the token does not have synonyms.
-            if http_error.code == 404:
-                return []
+            if connection.status_code == 404:
+                return ()
 
             # Not sure what it is, pass it up.
-            raise http_error
+            connection.raise_for_status()
 
-        results = json.load(connection)
-        synonym_list = []
-        # in case a token is part of multiple synonym lists
-        for synonyms in results[1]:
-            synonym_list += synonyms.split(',')
+            results = connection.json()
+            synonym_list = []
+            # in case a token is part of multiple synonym lists
+            for synonyms in results[1]:
+                synonym_list += synonyms.split(',')
 
-        return synonym_list
+            return tuple(synonym_list)
+
+        return list(solr_lookup_cache.get(('synonym_list', query), lookup))
 
     # Look up each token in name, and if it is in the synonyms then we need to search for it separately.
     @classmethod
@@ -829,9 +952,7 @@ class SolrQueries:
         query = solr_base_url + \
                 '/solr/possible.conflicts/analysis/field?analysis.fieldvalue={name}&analysis.fieldname=name' \
                 '&wt=json&indent=true'.format(name=parse.quote(name.strip()).replace('%2A', ''))
-        current_app.logger.debug('Query: ' + query)
-
-        processed_words = json.load(request.urlopen(query))
+        processed_words = cls._get_analysis(query)
 
         count = 0
         for item in processed_words['analysis']['field_names']['name']['index']:
@@ -941,9 +1062,7 @@ class SolrQueries:
             query = solr_base_url + \
                     '/solr/possible.conflicts/analysis/field?analysis.fieldvalue={words}&analysis.fieldname=name' \
                     '&wt=json&indent=true'.format(words=parse.quote(words_to_process.strip()))
-            current_app.logger.debug('Query: ' + query)
-
-            processed_words = json.load(request.urlopen(query))
+            processed_words = cls._get_analysis(query)
 
             count = 0
 
@@ -993,29 +1112,9 @@ class SolrQueries:
     @classmethod
     def name_pre_processing(cls, name):
         processed_name = (' ' + name.lower() + ' ') \
-            .replace('!', '') \
-            .replace('@', '') \
-            .replace('#', '') \
-            .replace('%', '') \
-            .replace('&', '') \
-            .replace('\\', '') \
-            .replace('/', '') \
-            .replace('{', '') \
-            .replace('}', '') \
-            .replace('[', '') \
-            .replace(']', '') \
-            .replace(')', '') \
-            .replace('(', '') \
-            .replace('+', '') \
-            .replace('-', '') \
-            .replace('|', '') \
-            .replace('?', '') \
-            .replace('.', '') \
-            .replace(',', '') \
-            .replace('_', '') \
+            .translate(NAME_PUNCTUATION_TABLE) \
             .replace('\'n', '') \
-            .replace('\'', '') \
-            .replace('\"', '') \
+            .translate(NAME_QUOTES_TABLE) \
             .replace(' $ ', 'dollar') \
             .replace('$', 's') \
             .replace(' ¢ ', 'cent') \
@@ -1030,61 +1129,40 @@ class SolrQueries:
             .replace('british columbians', 'bc')
         return processed_name.strip()
 
+    # Keep the docs with a word of the sound of each word of query_name, designations aside.
     @classmethod
     def post_treatment(cls, docs, query_name):
-        query_name = query_name.upper()
+        qwords = query_name.upper().split()
+        # A designation in the query is never matched
+        if any(qword in DESIGNATIONS for qword in qwords):
+            return []
+        query_keys = {phonetic_key(qword) for qword in qwords}
+
         names = []
-        count = 0
         for candidate in docs:
-            count += 1
             candidate_name = candidate['name'].upper()
-            words = candidate_name.split()
-            qwords = query_name.split()
-
-            count = 0
-            for qword in qwords:
-                found = False
-                for word in words:
-                    if word not in designations() and qword not in designations():
-                        should_keep = cls.keep_phonetic_match(word, qword)
-                        if should_keep:
-                            if not found:
-                                count += 1
-                            found = True
-
-            if count == len(qwords):
+            word_keys = {phonetic_key(word) for word in candidate_name.split() if word not in DESIGNATIONS}
+            if query_keys <= word_keys:
                 cls.keep_candidate(candidate, candidate_name, names)
 
         return names
 
     @classmethod
     def keep_phonetic_match(cls, word, query):
-        word = replace_special_leading_sounds(word)
-        query = replace_special_leading_sounds(query)
-
-        word_has_leading_vowel = has_leading_vowel(word)
-        query_has_leading_vowel = has_leading_vowel(query)
+        return phonetic_key(word) == phonetic_key(query)
 
-        word_first_consonant = first_consonants(word)
-        query_first_consonant = first_consonants(query)
-
-        query_first_vowels = first_vowels(query, query_has_leading_vowel)
-        word_first_vowels = first_vowels(word, word_has_leading_vowel)
-
-        if query_has_leading_vowel:
-            query_sound = query_first_vowels + query_first_consonant
-        else:
-            query_sound = query_first_consonant + query_first_vowels
-
-        if word_has_leading_vowel:
-            word_sound = word_first_vowels + word_first_consonant
-        else:
-            word_sound = word_first_consonant + word_first_vowels
-
-        if word_sound == query_sound:
-                return True
-
-        return False
+    # Solr filters on the name_phonetic_key of the possible.conflicts core, it only returns the docs post_treatment can
+    # keep (so the rows aren't spent on the others). Needs a reindex of the core with the field, SOLR_PHONETIC_KEY_FILTER
+    # is off until then.
+    @classmethod
+    def _get_phonetic_key_clause(cls, start_str):
+        if not current_app.config.get('SOLR_PHONETIC_KEY_FILTER', False):
+            return ''
+
+        keys = {phonetic_key(qword).lower() for qword in start_str.upper().split() if qword not in DESIGNATIONS}
+        # Words of neither consonants nor vowels (eg. &) have an empty key, it isn't indexed
+        keys.discard('')
+        return ''.join('&fq=' + parse.quote('{!term f=name_phonetic_key}' + key) for key in sorted(keys))
 
     @classmethod
     def keep_candidate(cls, candidate, name, names):
@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, has_app_context
+
+from namex.utils.http_session import get_session
+
+'''
+Cache of the lookups SolrQueries makes to prepare a conflict bucket search: the /analysis/field calls to Solr
+(phrase -> stems, multi-word synonyms) and the synonyms API calls (token -> synonyms).
+One search repeats the same lookups (eg. _synonyms_exist for the same token once per stack) and examiners search the
+same words over and over, so they are kept:
+- for the request, in flask.g, whatever the TTL
+- across requests, for SOLR_LOOKUP_CACHE_TTL seconds, the SOLR_LOOKUP_CACHE_SIZE most recently used ones
+
+Every SOLR_CORE_RELOAD_CHECK_INTERVAL seconds:
+- the startTime of the possible.conflicts core is checked, the shared lookups are dropped when the core was reloaded
+- the version of the synonym table is read from the synonyms API, its lookups are dropped when the table changed (a
+  synonym edit doesn't reload the cores)
+'''
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300  # seconds
+DEFAULT_SIZE = 10000
+DEFAULT_RELOAD_CHECK_INTERVAL = 10  # seconds
+
+RELOAD_CHECK_CORE = 'possible.conflicts'
+
+# The lookups answered by the synonyms API, the first item of their keys
+SYNONYMS_API_LOOKUPS = ('synonyms_exist', 'synonym_list')
+
+
+class SolrLookupCache(object):
+    '''
+    The shared lookups are disabled when the TTL is 0, only the request ones are kept then.
+    Lookups that raise aren't cached.
+    '''
+
+    def __init__(self):
+        self._solr_base_url = None
+        self._synonyms_version_url = None
+        self._ttl = 0
+        self._size = DEFAULT_SIZE
+        self._reload_check_interval = DEFAULT_RELOAD_CHECK_INTERVAL
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+        self._core_start_time = None
+        self._synonyms_version = None
+        self._next_reload_check = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def init_app(self, app):
+        self._solr_base_url = app.config.get('SOLR_BASE_URL', None)
+        solr_synonyms_api_url = app.config.get('SOLR_SYNONYMS_API_URL', None)
+        self._synonyms_version_url = solr_synonyms_api_url + '/synonyms/version' if solr_synonyms_api_url else None
+        self._ttl = float(app.config.get('SOLR_LOOKUP_CACHE_TTL', DEFAULT_TTL))
+        self._size = int(app.config.get('SOLR_LOOKUP_CACHE_SIZE', DEFAULT_SIZE))
+        self._reload_check_interval = float(app.config.get('SOLR_CORE_RELOAD_CHECK_INTERVAL',
+                                                           DEFAULT_RELOAD_CHECK_INTERVAL))
+        self.invalidate()
+
+    def get(self, key, load):
+        '''
+        @:param key A hashable key of the lookup, eg. ('synonym_list', token)
+        @:param load Function returning the value of the lookup when it isn't cached
+        @:return The value, callers must not change it
+        '''
+        request_values = g.setdefault('solr_lookups', {}) if has_app_context() else None
+        if request_values is not None and key in request_values:
+            return request_values[key]
+
+        value = self._get_shared(key, load)
+        if request_values is not None:
+            request_values[key] = value
+        return value
+
+    def invalidate(self, lookups=None):
+        '''
+        @:param lookups The first items of the keys of the lookups to drop, all of them when None
+        '''
+        with self._lock:
+            if lookups is None:
+                self._values.clear()
+            else:
+                for key in [key for key in self._values if isinstance(key, tuple) and key[0] in lookups]:
+                    del self._values[key]
+            self._invalidations += 1
+
+    def get_metrics(self):
+        return {
+            'ttl': self._ttl,
+            'size': len(self._values),
+            'maxSize': self._size,
+            'hits': self._hits,
+            'misses': self._misses,
+            'invalidations': self._invalidations,
+            'coreStartTime': self._core_start_time,
+            'synonymsVersion': self._synonyms_version
+        }
+
+    def _get_shared(self, key, load):
+        if self._ttl <= 0:
+            return load()
+
+        self._check_reload()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and entry[0] > now:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        value = load()
+        with self._lock:
+            self._values[key] = (now + self._ttl, value)
+            self._values.move_to_end(key)
+            while len(self._values) > self._size:
+                self._values.popitem(last=False)
+        return value
+
+    def _check_reload(self):
+        now = time.monotonic()
+        if now < self._next_reload_check:
+            return
+        self._next_reload_check = now + self._reload_check_interval
+
+        if self._solr_base_url:
+            self._check_core_reload()
+        if self._synonyms_version_url:
+            self._check_synonyms_version()
+
+    def _check_core_reload(self):
+        try:
+            connection = get_session().get(self._solr_base_url + '/solr/admin/cores', params={
+                'action': 'STATUS', 'core': RELOAD_CHECK_CORE, 'indexInfo': 'false', 'wt': 'json'})
+            connection.raise_for_status()
+            start_time = connection.json()['status'][RELOAD_CHECK_CORE]['startTime']
+        except Exception as err:
+            logger.warning('Checking the %s core for a reload failed: %s', RELOAD_CHECK_CORE, repr(err))
+            return
+
+        if start_time != self._core_start_time:
+            if self._core_start_time is not None:
+                logger.info('The %s core was reloaded at %s, dropping the cached Solr lookups', RELOAD_CHECK_CORE,
+                            start_time)
+            self.invalidate()
+            self._core_start_time = start_time
+
+    def _check_synonyms_version(self):
+        try:
+            response = get_session().get(self._synonyms_version_url)
+            response.raise_for_status()
+            version = response.json().get('data')
+        except Exception as err:
+            logger.warning('Could not get the synonyms version from %s: %s', self._synonyms_version_url, repr(err))
+            return
+
+        if version != self._synonyms_version:
+            if self._synonyms_version is not None:
+                logger.info('The synonym table changed, version %s, dropping the cached synonyms API lookups', version)
+            self.invalidate(SYNONYMS_API_LOOKUPS)
+            self._synonyms_version = version
+
+
+solr_lookup_cache = SolrLookupCache()
@@ -17,6 +17,7 @@ from .event import Event
 from .nwpta import PartnerNameSystem, PartnerNameSystemSchema
 from .name import Name, NameSchema
 from .request import Request, RequestsSchema, RequestsHeaderSchema, RequestsSearchSchema
+from .conflict_name import ConflictName
 from .user import User, UserSchema
 
 from .decision_reason import DecisionReason
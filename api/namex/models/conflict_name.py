@@ -0,0 +1,70 @@
+"""ConflictName is a name the conflict search looks at, a row of the conflict_names materialized view
+"""
+import sqlalchemy
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, func
+from sqlalchemy.ext.declarative import declarative_base
+
+from .request import Request
+from ..criteria.request.query_criteria import RequestConditionCriteria
+
+# The view is refreshed by the ConflictCorpusService, keep it out of db.metadata so create_all / drop_all don't
+# treat it as a table
+Base = declarative_base()
+
+
+class ConflictName(Base):
+    __tablename__ = 'conflict_names'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(1024))
+    searchName = Column('search_name', String(1024))
+    consumptionDate = Column('consumption_date', DateTime(timezone=True))
+    submittedDate = Column('submitted_date', DateTime(timezone=True))
+    corpNum = Column('corp_num', String(10))
+    nrNum = Column('nr_num', String(10))
+    requestTypeCd = Column('request_type_cd', String(10))
+    expirationDate = Column('expiration_date', DateTime(timezone=True))
+    # Name of a queued (DRAFT, HOLD, INPROGRESS) request, otherwise an approved name of a completed one
+    queue = Column(Boolean)
+
+    '''
+    Same criteria as Request.get_general_query, on the view instead of the requests and names tables.
+    '''
+    @classmethod
+    def get_general_query(cls, change_filter=False, queue=False):
+        criteria = []
+        basic_filter = [
+            cls.requestTypeCd.in_(Request.get_conflict_request_types(change_filter))
+        ]
+
+        consumed_filter = [
+            cls.queue.is_(False),
+            cls.corpNum.isnot(None)
+        ]
+
+        not_consumed_filter = [
+            cls.queue.is_(False),
+            cls.expirationDate > func.current_Date(),
+            cls.corpNum.is_(None),
+            cls.consumptionDate.is_(None)
+        ]
+
+        if queue:
+            criteria.append(RequestConditionCriteria(
+                fields=[cls.name, sqlalchemy.null().label('consumptionDate'), cls.submittedDate,
+                        sqlalchemy.null().label('corpNum'), cls.nrNum],
+                filters=[basic_filter, [cls.queue.is_(True)]]
+            ))
+        else:
+            criteria.append(RequestConditionCriteria(
+                fields=[cls.name, cls.consumptionDate, sqlalchemy.null().label('submittedDate'), cls.corpNum,
+                        sqlalchemy.null().label('nrNum')],
+                filters=[basic_filter, consumed_filter]
+            ))
+            criteria.append(RequestConditionCriteria(
+                fields=[cls.name, sqlalchemy.null().label('consumptionDate'), cls.submittedDate,
+                        sqlalchemy.null().label('corpNum'), cls.nrNum],
+                filters=[basic_filter, not_consumed_filter]
+            ))
+
+        return criteria
@@ -2,6 +2,7 @@
 """
 from . import db, ma
 from marshmallow import fields
+from sqlalchemy import FetchedValue
 from sqlalchemy.orm import backref
 
 
@@ -16,6 +17,10 @@ class Name(db.Model):
     consumptionDate = db.Column('consumption_date', db.DateTime(timezone=True))
     corpNum = db.Column('corp_num', db.String(10), default=None)
     remoteNameId = db.Column('remote_name_id', db.BigInteger)
+    # The lower case name without punctuation, spaces or repeated characters, set by the names_search_name trigger
+    # (see Request.get_search_name_filter)
+    searchName = db.Column('search_name', db.String(1024), server_default=FetchedValue(),
+                           server_onupdate=FetchedValue())
 
     # Decision info
     conflict1 = db.Column(db.String(250), default='')  # optional conflict name
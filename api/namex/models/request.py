@@ -12,7 +12,7 @@ from namex.exceptions import BusinessException
 from sqlalchemy import event
 from sqlalchemy.orm import backref
 from sqlalchemy.dialects import postgresql
-from sqlalchemy import and_, func, Date
+from sqlalchemy import and_, or_, func, Date
 from marshmallow import Schema, fields, post_load, post_dump
 from .nwpta import PartnerNameSystem
 from .user import User, UserSchema
@@ -248,10 +248,12 @@ class Request(db.Model):
             return existing_nr, False
 
         # this will error if there's nothing in the queue - likelihood ~ 0
+        # Skip the rows other examiners have locked rather than queue up behind them on the head of the queue, the
+        # ix_requests_draft_queue partial index serves the filter and the order.
         r = db.session.query(Request). \
-            filter(Request.stateCd.in_([State.DRAFT])). \
+            filter(Request.stateCd == State.DRAFT). \
             order_by(Request.priorityCd.desc(), Request.submittedDate.asc()). \
-            with_for_update().first()
+            with_for_update(skip_locked=True).first()
         # this row is now locked
 
         if not r:
@@ -296,82 +298,89 @@ class Request(db.Model):
         return True
 
     # START NEW NAME_REQUEST SERVICE METHODS, WE WILL REFACTOR THESE SHORTLY
+    '''
+    The request types whose names the conflict search looks at, a shorter list when change_filter is set.
+    '''
+    @classmethod
+    def get_conflict_request_types(cls, change_filter=False):
+        return [
+            EntityTypes.PRIVATE_ACT.value,
+            EntityTypes.CORPORATION.value,
+            LegacyEntityTypes.CORPORATION.CCR.value,
+            LegacyEntityTypes.CORPORATION.CT.value,
+            LegacyEntityTypes.CORPORATION.RCR.value,
+            EntityTypes.COOPERATIVE.value,
+            LegacyEntityTypes.COOPERATIVE.CCP.value,
+            LegacyEntityTypes.COOPERATIVE.CTC.value,
+            LegacyEntityTypes.COOPERATIVE.RCP.value,
+            EntityTypes.FINANCIAL_INSTITUTION.value,
+            LegacyEntityTypes.FINANCIAL_INSTITUTION.CFI.value,
+            LegacyEntityTypes.FINANCIAL_INSTITUTION.RFI.value,
+            EntityTypes.SOCIETY.value,
+            LegacyEntityTypes.SOCIETY.ASO.value,
+            LegacyEntityTypes.SOCIETY.CSO.value,
+            LegacyEntityTypes.SOCIETY.CSSO.value,
+            LegacyEntityTypes.SOCIETY.CTSO.value,
+            LegacyEntityTypes.SOCIETY.RSO.value,
+            EntityTypes.UNLIMITED_LIABILITY_COMPANY.value,
+            LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.UC.value,
+            LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.CUL.value,
+            LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.ULCT.value,
+            LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.RUL.value,
+            EntityTypes.XPRO_SOCIETY.value,
+            LegacyEntityTypes.XPRO_SOCIETY.XASO.value,
+            LegacyEntityTypes.XPRO_SOCIETY.XCASO.value,
+            LegacyEntityTypes.XPRO_SOCIETY.XCSO.value,
+            LegacyEntityTypes.XPRO_SOCIETY.XRSO.value,
+            EntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.value,
+            LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CC.value,
+            LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CCV.value,
+            LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CCCT.value,
+            LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.RCC.value,
+            EntityTypes.PARISH.value,
+            EntityTypes.XPRO_CORPORATION.value,
+            LegacyEntityTypes.XPRO_CORPORATION.XCCR.value,
+            LegacyEntityTypes.XPRO_CORPORATION.XRCR.value,
+            LegacyEntityTypes.XPRO_CORPORATION.AS.value,
+            EntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.value,
+            LegacyEntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.UA.value,
+            LegacyEntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.XCUL.value,
+            LegacyEntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.XRUL.value,
+            EntityTypes.XPRO_COOPERATIVE.value,
+            LegacyEntityTypes.XPRO_COOPERATIVE.XCCP.value,
+            LegacyEntityTypes.XPRO_COOPERATIVE.XRCP.value,
+            EntityTypes.BENEFIT_COMPANY.value
+        ] if not change_filter else [
+            EntityTypes.PRIVATE_ACT.value,
+            EntityTypes.CORPORATION.value,
+            LegacyEntityTypes.CORPORATION.CCR.value,
+            LegacyEntityTypes.CORPORATION.RCR.value,
+            EntityTypes.COOPERATIVE.value,
+            LegacyEntityTypes.COOPERATIVE.CCP.value,
+            LegacyEntityTypes.COOPERATIVE.RCP.value,
+            EntityTypes.FINANCIAL_INSTITUTION.value,
+            LegacyEntityTypes.FINANCIAL_INSTITUTION.CFI.value,
+            LegacyEntityTypes.FINANCIAL_INSTITUTION.RFI.value,
+            LegacyEntityTypes.SOCIETY.ASO.value,
+            LegacyEntityTypes.SOCIETY.CSO.value,
+            LegacyEntityTypes.SOCIETY.RSO.value,
+            EntityTypes.UNLIMITED_LIABILITY_COMPANY.value,
+            LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.UC.value,
+            LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.CUL.value,
+            LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.RUL.value,
+            EntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.value,
+            LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CC.value,
+            LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.RCC.value,
+            EntityTypes.PARISH.value,
+            EntityTypes.BENEFIT_COMPANY.value
+        ]
+
     @classmethod
     def get_general_query(cls, change_filter=False, queue=False):
         criteria = []
         basic_filter = [
             cls.id == Name.nrId,
-            cls.requestTypeCd.in_([
-                                      EntityTypes.PRIVATE_ACT.value,
-                                      EntityTypes.CORPORATION.value,
-                                      LegacyEntityTypes.CORPORATION.CCR.value,
-                                      LegacyEntityTypes.CORPORATION.CT.value,
-                                      LegacyEntityTypes.CORPORATION.RCR.value,
-                                      EntityTypes.COOPERATIVE.value,
-                                      LegacyEntityTypes.COOPERATIVE.CCP.value,
-                                      LegacyEntityTypes.COOPERATIVE.CTC.value,
-                                      LegacyEntityTypes.COOPERATIVE.RCP.value,
-                                      EntityTypes.FINANCIAL_INSTITUTION.value,
-                                      LegacyEntityTypes.FINANCIAL_INSTITUTION.CFI.value,
-                                      LegacyEntityTypes.FINANCIAL_INSTITUTION.RFI.value,
-                                      EntityTypes.SOCIETY.value,
-                                      LegacyEntityTypes.SOCIETY.ASO.value,
-                                      LegacyEntityTypes.SOCIETY.CSO.value,
-                                      LegacyEntityTypes.SOCIETY.CSSO.value,
-                                      LegacyEntityTypes.SOCIETY.CTSO.value,
-                                      LegacyEntityTypes.SOCIETY.RSO.value,
-                                      EntityTypes.UNLIMITED_LIABILITY_COMPANY.value,
-                                      LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.UC.value,
-                                      LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.CUL.value,
-                                      LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.ULCT.value,
-                                      LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.RUL.value,
-                                      EntityTypes.XPRO_SOCIETY.value,
-                                      LegacyEntityTypes.XPRO_SOCIETY.XASO.value,
-                                      LegacyEntityTypes.XPRO_SOCIETY.XCASO.value,
-                                      LegacyEntityTypes.XPRO_SOCIETY.XCSO.value,
-                                      LegacyEntityTypes.XPRO_SOCIETY.XRSO.value,
-                                      EntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.value,
-                                      LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CC.value,
-                                      LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CCV.value,
-                                      LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CCCT.value,
-                                      LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.RCC.value,
-                                      EntityTypes.PARISH.value,
-                                      EntityTypes.XPRO_CORPORATION.value,
-                                      LegacyEntityTypes.XPRO_CORPORATION.XCCR.value,
-                                      LegacyEntityTypes.XPRO_CORPORATION.XRCR.value,
-                                      LegacyEntityTypes.XPRO_CORPORATION.AS.value,
-                                      EntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.value,
-                                      LegacyEntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.UA.value,
-                                      LegacyEntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.XCUL.value,
-                                      LegacyEntityTypes.XPRO_UNLIMITED_LIABILITY_COMPANY.XRUL.value,
-                                      EntityTypes.XPRO_COOPERATIVE.value,
-                                      LegacyEntityTypes.XPRO_COOPERATIVE.XCCP.value,
-                                      LegacyEntityTypes.XPRO_COOPERATIVE.XRCP.value,
-                                      EntityTypes.BENEFIT_COMPANY.value
-                                  ] if not change_filter else [
-                EntityTypes.PRIVATE_ACT.value,
-                EntityTypes.CORPORATION.value,
-                LegacyEntityTypes.CORPORATION.CCR.value,
-                LegacyEntityTypes.CORPORATION.RCR.value,
-                EntityTypes.COOPERATIVE.value,
-                LegacyEntityTypes.COOPERATIVE.CCP.value,
-                LegacyEntityTypes.COOPERATIVE.RCP.value,
-                EntityTypes.FINANCIAL_INSTITUTION.value,
-                LegacyEntityTypes.FINANCIAL_INSTITUTION.CFI.value,
-                LegacyEntityTypes.FINANCIAL_INSTITUTION.RFI.value,
-                LegacyEntityTypes.SOCIETY.ASO.value,
-                LegacyEntityTypes.SOCIETY.CSO.value,
-                LegacyEntityTypes.SOCIETY.RSO.value,
-                EntityTypes.UNLIMITED_LIABILITY_COMPANY.value,
-                LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.UC.value,
-                LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.CUL.value,
-                LegacyEntityTypes.UNLIMITED_LIABILITY_COMPANY.RUL.value,
-                EntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.value,
-                LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.CC.value,
-                LegacyEntityTypes.COMMUNITY_CONTRIBUTION_COMPANY.RCC.value,
-                EntityTypes.PARISH.value,
-                EntityTypes.BENEFIT_COMPANY.value
-            ]),
+            cls.requestTypeCd.in_(cls.get_conflict_request_types(change_filter)),
         ]
 
         queue_request_state_filter = [
@@ -465,6 +474,8 @@ class Request(db.Model):
             else:
                 raise Exception('Invalid classification for the word {0}. Cannot be included in exact match query.'.format(word))
 
+        for word in list_name:
+            criteria = cls.get_candidates_query(criteria, [word])
         criteria = cls.get_designations_in_name(criteria, name, any_designation_list, end_designation_list, stop_words)
 
         return criteria
@@ -502,16 +513,38 @@ class Request(db.Model):
 
         return dist_criteria
 
+    '''
+    The name pattern of a descriptive for each of the criteria, see find_by_name_criteria. As the criteria are filtered
+    in turn, each one adds the descriptive to the pattern again.
+    '''
     @classmethod
-    def get_descriptive_query(cls, desc, criteria, name_criteria):
+    def get_descriptive_criteria(cls, desc, name_criteria, criteria):
         special_characters_descriptive = Request.set_special_characters_descriptive(desc)
+        substitutions = ' ?| '.join(map(str, special_characters_descriptive)) + ' ?'
+        patterns = []
         for e in criteria:
-            substitutions = ' ?| '.join(map(str, special_characters_descriptive)) + ' ?'
             name_criteria += r'.*({})\y'.format(substitutions)
-            e.filters.insert(len(e.filters), [func.lower(Name.name).op('~')(name_criteria)])
+            patterns.append(name_criteria)
+
+        return patterns
+
+    @classmethod
+    def get_candidates_query(cls, criteria, words):
+        for e in criteria:
+            e.filters.insert(len(e.filters), [cls.get_search_name_filter(words)])
 
         return criteria
 
+    '''
+    Names containing any of the words, ignoring case, punctuation, spaces and repeated characters (names.search_name).
+    The name patterns are \\W*-interleaved characters (set_special_characters_distinctive / _descriptive) that no index
+    can serve, this filter is a superset of their matches that the trigram index on search_name can, so Postgres only
+    runs the patterns on these candidates instead of on every name.
+    '''
+    @classmethod
+    def get_search_name_filter(cls, words, names=Name):
+        return or_(*[names.searchName.contains(func.get_search_name(word)) for word in words])
+
     @classmethod
     def find_by_criteria_array(cls, criteria_arr=None, queue=False):
         queries = []
@@ -531,6 +564,48 @@ class Request(db.Model):
         print(query_all.statement)
         return query_all.all()
 
+    '''
+    Batched find_by_criteria_array for several name patterns: the names of the criteria matching any of the patterns
+    are fetched in one query, with a column per pattern telling which ones each name matches.
+    @:param name_criteria_list (word_lists, patterns) pairs, patterns has the pattern of each of the criteria (see
+                               get_descriptive_criteria), a name matching it contains one of the words of each list
+                               (see get_search_name_filter)
+    @:param names The model the criteria select the names from, Name or ConflictName
+    @:return The matches of each pattern, in the order of name_criteria_list
+    '''
+    @classmethod
+    def find_by_name_criteria(cls, criteria_arr, name_criteria_list, queue=False, names=Name):
+        if not name_criteria_list:
+            return []
+
+        queries = []
+        for criteria_idx, criteria in enumerate(criteria_arr):
+            RequestConditionCriteria.is_valid_criteria(criteria)
+            flags, conditions = [], []
+            for idx, (word_lists, patterns) in enumerate(name_criteria_list):
+                name_matches = func.lower(names.name).op('~')(patterns[criteria_idx])
+                flags.append(name_matches.label('name_criteria_{}'.format(idx)))
+                conditions.append(and_(*[cls.get_search_name_filter(words, names) for words in word_lists],
+                                       name_matches))
+
+            filters_all = []
+            for filter_group in criteria.filters:
+                for element in filter_group:
+                    filters_all.append(element)
+            filters_all.append(or_(*conditions))
+            queries.append(cls.query.with_entities(*criteria.fields, *flags).filter(and_(*filters_all)))
+
+        if queue:
+            query_all = queries[0]
+        else:
+            query_all = queries[0].union(queries[1])
+
+        rows = query_all.all()
+
+        # The flags are the last columns of the rows
+        first_flag = len(criteria_arr[0].fields)
+        return [[row for row in rows if row[first_flag + idx]] for idx in range(len(name_criteria_list))]
+
     @classmethod
     def find_by_criteria(cls, criteria=None, limit=10):
         RequestConditionCriteria.is_valid_criteria(criteria)
@@ -3,11 +3,15 @@ Virtual word classification classifies all words in a name approved by an examin
 """
 
 from . import db, ma
+from collections import namedtuple
 from datetime import datetime, date
 from sqlalchemy import func, or_
 from sqlalchemy.orm import backref
 
 
+ClassificationVersion = namedtuple('ClassificationVersion', ['count', 'max_id', 'last_updated', 'today'])
+
+
 class WordClassification(db.Model):
     __tablename__ = 'word_classification'
 
@@ -52,6 +56,70 @@ class WordClassification(db.Model):
         cls.close_session()
         return results
 
+    '''
+    Same as find_word_classification, for many words in one query.
+    @:return The (word, classification) rows matching any of the words, the caller maps them back to the words
+    '''
+    @classmethod
+    def find_words_classification(cls, words):
+        words = list(dict.fromkeys(word.lower() for word in words))
+        if not words:
+            return []
+
+        results = db.session.query(cls.word, cls.classification).distinct(cls.word, cls.classification) \
+            .filter(func.lower(cls.word).op('~')(r"(^({0})(''[a-zA-Z])?\y)".format('|'.join(words)))) \
+            .filter(cls.end_dt.is_(None)) \
+            .filter(cls.start_dt <= date.today()) \
+            .filter(cls.approved_dt <= date.today()).all()
+        cls.close_session()
+        return results
+
+    @classmethod
+    def find_all_word_classifications(cls):
+        results = db.session.query(cls.word, cls.classification).distinct(cls.word, cls.classification) \
+            .filter(cls.end_dt.is_(None)) \
+            .filter(cls.start_dt <= date.today()) \
+            .filter(cls.approved_dt <= date.today()).all()
+        cls.close_session()
+        return results
+
+    '''
+    The active (word, classification) rows of the words, compared exactly (lower case).
+    '''
+    @classmethod
+    def find_words_classification_exact(cls, words):
+        words = [word.lower() for word in words]
+        if not words:
+            return []
+
+        results = db.session.query(cls.word, cls.classification).distinct(cls.word, cls.classification) \
+            .filter(func.lower(cls.word).in_(words)) \
+            .filter(cls.end_dt.is_(None)) \
+            .filter(cls.start_dt <= date.today()) \
+            .filter(cls.approved_dt <= date.today()).all()
+        cls.close_session()
+        return results
+
+    '''
+    @:return The (id, lower case word) of the rows written since the date, whether they are active or not
+    '''
+    @classmethod
+    def find_updated_words(cls, since):
+        results = db.session.query(cls.id, func.lower(cls.word)) \
+            .filter(cls.last_updated_dt >= since).all()
+        cls.close_session()
+        return [(row_id, word) for row_id, word in results]
+
+    '''
+    Changes whenever a row is added, updated or deleted, or rows may have become active (the day changed).
+    '''
+    @classmethod
+    def get_classification_version(cls):
+        count, max_id, last_updated = db.session.query(
+            func.count(cls.id), func.max(cls.id), func.max(cls.last_updated_dt)).one()
+        cls.close_session()
+        return ClassificationVersion(count, max_id, last_updated, date.today())
+
     @classmethod
     def find_word_by_classification(cls, word, classification):
         results = db.session.query(cls) \
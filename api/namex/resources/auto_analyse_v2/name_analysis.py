@@ -18,7 +18,6 @@ from http import HTTPStatus
 
 from flask import current_app, request
 from flask_restx import Resource, cors, fields
-import requests  # noqa: I001; grouping out of order to make both pylint & isort happy
 from requests import exceptions  # noqa: I001; grouping out of order to make both pylint & isort happy
 
 from namex.constants import (BCProtectedNameEntityTypes,
@@ -26,6 +25,7 @@ from namex.constants import (BCProtectedNameEntityTypes,
                              XproUnprotectedNameEntityTypes)
 from namex.services.name_request.auto_analyse import AnalysisRequestActions
 from namex.utils.auth import cors_preflight
+from namex.utils.http_session import get_session
 
 from .api_namespace import api as name_analysis_api
 
@@ -118,10 +118,10 @@ class NameAnalysisResource(Resource):
         auto_analyze_svc_url = current_app.config.get('AUTO_ANALYZE_URL')
         try:
             headers = {'Content-Type': 'application/json'}
-            rv = requests.post(url=auto_analyze_svc_url,
-                               json=json_input,
-                               headers=headers,
-                               timeout=20.0)
+            rv = get_session().post(url=auto_analyze_svc_url,
+                                    json=json_input,
+                                    headers=headers,
+                                    timeout=20.0)
             return rv.json(), rv.status_code
         except (exceptions.ConnectionError, exceptions.Timeout):
             return {'message': 'Unable to create name analyze request.'}, HTTPStatus.SERVICE_UNAVAILABLE
@@ -135,7 +135,7 @@ class NameAnalysisResource(Resource):
         try:
             auto_analyze_svc_url = '{}/{}'.format(current_app.config.get('AUTO_ANALYZE_URL'), identifier)
             headers = {}
-            rv = requests.get(url=auto_analyze_svc_url, headers=headers, timeout=20.0)
+            rv = get_session().get(url=auto_analyze_svc_url, headers=headers, timeout=20.0)
             return rv.json(), rv.status_code
 
         except (exceptions.ConnectionError, exceptions.Timeout) as err:
@@ -153,7 +153,7 @@ class NameAnalysisResource(Resource):
         try:
             auto_analyze_svc_url = '{}/{}'.format(current_app.config.get('AUTO_ANALYZE_URL'), identifier)
             headers = {}
-            rv = requests.delete(url=auto_analyze_svc_url, headers=headers, timeout=20.0)
+            rv = get_session().delete(url=auto_analyze_svc_url, headers=headers, timeout=20.0)
             return rv.json(), rv.status_code
 
         except (exceptions.ConnectionError, exceptions.Timeout) as err:
@@ -1,14 +1,10 @@
-import os
 from flask import jsonify, request
 from flask_restx import Resource, Namespace, cors
 from namex.utils.auth import cors_preflight
-import json
 from namex import jwt
-import urllib
-from flask import current_app
+from namex.services.exact_match.exact_match import exact_match_service
 
 api = Namespace('exactMatchMeta', description='Exact Match System - Metadata')
-SOLR_URL = os.getenv('SOLR_BASE_URL')
 
 
 @cors_preflight("GET")
@@ -20,17 +16,6 @@ class ExactMatch(Resource):
     @jwt.requires_auth
     def get():
         query = request.args.get('query')
-        query = query.lower().replace('*', '')
-        url = SOLR_URL + '/solr/possible.conflicts' + \
-            '/select?' + \
-            'sow=false' + \
-            '&df=name_exact_match' + \
-            '&wt=json' + \
-            '&q=' + urllib.parse.quote(query)
-        current_app.logger.debug('Exact-match query: ' + url)
-        connection = urllib.request.urlopen(url)
-        answer = json.loads(connection.read())
-        docs = answer['response']['docs']
-        names = [{'name': doc['name'], 'id':doc['id'], 'source':doc['source'], 'start_date':doc['start_date'], 'jurisdiction':doc['jurisdiction']} for doc in docs]
+        names = exact_match_service.lookup(query)
 
         return jsonify({'names': names})
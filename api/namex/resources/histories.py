@@ -2,10 +2,10 @@ import os
 from flask import jsonify, request
 from flask_restx import Resource, Namespace, cors
 from namex.utils.auth import cors_preflight
-import json
 from namex import jwt
 import urllib
 from flask import current_app
+from namex.utils.http_session import get_session
 
 api = Namespace('historiesMeta', description='Histories Match - Metadata')
 SOLR_URL = os.getenv('SOLR_BASE_URL')
@@ -30,8 +30,9 @@ class Histories(Resource):
             '&rows=' + MAX_RESULTS + \
             '&q=' + urllib.parse.quote(query)
         current_app.logger.debug('Histories match query: ' + url)
-        connection = urllib.request.urlopen(url)
-        answer = json.loads(connection.read())
+        connection = get_session().get(url)
+        connection.raise_for_status()
+        answer = connection.json()
 
         docs = answer['response']['docs']
 
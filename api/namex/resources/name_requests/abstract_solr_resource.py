@@ -7,6 +7,7 @@ from namex.utils.logging import setup_logging
 from namex.models import State
 
 from namex.services.name_request.exceptions import SolrUpdateError
+from namex.services.exact_match.exact_match import exact_match_service
 from namex.resources.configuration import SOLR_CORE, SOLR_API_URL
 
 setup_logging()  # Important to do this first
@@ -43,6 +44,10 @@ class AbstractSolrResource(Resource):
             result = solr.add(solr_docs, commit=True)
         except Exception as err:
             raise SolrUpdateError(err)
+        finally:
+            # Which lookups a new name matches is up to the name_exact_match analysis of Solr, drop them all
+            if solr_core == SOLR_CORE:
+                exact_match_service.invalidate()
 
         return result
 
@@ -54,6 +59,9 @@ class AbstractSolrResource(Resource):
 
         except Exception as err:
             raise SolrUpdateError(err)
+        finally:
+            if solr_core == SOLR_CORE:
+                exact_match_service.invalidate_doc(doc_id)
 
         return result
 
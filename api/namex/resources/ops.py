@@ -2,6 +2,10 @@ from flask import jsonify
 from flask_restx import Resource, Namespace
 from sqlalchemy import text, exc
 from namex.models import db
+from namex.services.conflict_corpus.conflict_corpus import conflict_corpus_service
+from namex.utils.http_session import http_session_service
+from namex.analytics.solr_lookup_cache import solr_lookup_cache
+from namex.services.exact_match.exact_match import exact_match_service
 
 api = Namespace('namexRequestOPS', description='Namex - OPS checks')
 
@@ -29,3 +33,39 @@ class Readyz(Resource):
     def get():
         # TODO: add a poll to the DB when called
         return {"message": "api is ready"}, 200
+
+
+@api.route("/conflict-corpus")
+class ConflictCorpus(Resource):
+
+    @staticmethod
+    def get():
+        # Refresh cadence and staleness of the conflict_names view
+        return conflict_corpus_service.get_metrics(), 200
+
+
+@api.route("/http-metrics")
+class HttpMetrics(Resource):
+
+    @staticmethod
+    def get():
+        # Latency of the calls to the other services, by target host, for the process answering
+        return http_session_service.get_metrics(), 200
+
+
+@api.route("/solr-lookup-cache")
+class SolrLookupCache(Resource):
+
+    @staticmethod
+    def get():
+        # Hits, size and last core reload seen of the Solr lookup cache of the process answering
+        return solr_lookup_cache.get_metrics(), 200
+
+
+@api.route("/exact-match-cache")
+class ExactMatchCache(Resource):
+
+    @staticmethod
+    def get():
+        # Hits, coalesced lookups and invalidations of the exact-match cache of the process answering
+        return exact_match_service.get_metrics(), 200
@@ -25,6 +25,7 @@ from namex.services import ServicesError, MessageServices, EventRecorder
 from namex.services.name_request.utils import check_ownership, get_or_create_user_by_jwt, valid_state_transition
 
 from namex.utils.common import convert_to_ascii
+from namex.utils.sql_alchemy import decode_cursor, encode_cursor, get_keyset_filter, submit_count
 from namex.utils.auth import cors_preflight
 from namex.analytics import SolrQueries, RestrictedWords, VALID_ANALYSIS as ANALYTICS_VALID_ANALYSIS
 from namex.services.nro import NROServicesError
@@ -143,6 +144,8 @@ class Requests(Resource):
 
     START = 0
     ROWS = 10
+    COUNT = 'exact'
+    COUNT_MODES = ['exact', 'estimate']
 
     # search_request_schemas = RequestsSchema(many=True)
     # ,exclude=['id'
@@ -165,6 +168,21 @@ class Requests(Resource):
             current_app.logger.info('start or rows not an int, err: {}'.format(err))
             return jsonify({'message': 'paging parameters were not integers'}), 406
 
+        # cursor is the nextCursor of the previous page, it replaces start
+        cursor = request.args.get('cursor', None)
+        cursor_values = None
+        if cursor:
+            try:
+                cursor_values = decode_cursor(cursor)
+            except ValueError as err:
+                current_app.logger.info('cursor not valid, err: {}'.format(err))
+                return jsonify({'message': 'cursor is not valid'}), 406
+
+        # count is 'exact' or 'estimate', the planner estimate of the rows, cheaper on broad searches
+        count_mode = request.args.get('count', Requests.COUNT)
+        if count_mode not in Requests.COUNT_MODES:
+            return jsonify({'message': '\'{}\' is not a valid count'.format(count_mode)}), 406
+
         # queue must be a list of states
         queue = request.args.get('queue', None)
         if queue:
@@ -185,6 +203,8 @@ class Requests(Resource):
         col_keys = cols.keys()
         sort_by = ''
         order_list = ''
+        order_keys = []
+        order_by = []
         for k, v in ((x.split(":")) for x in order.split(',')):
             vl = v.lower()
             if (k in col_keys) and (vl == 'asc' or vl == 'desc'):
@@ -193,6 +213,15 @@ class Requests(Resource):
                     order_list = order_list + ', '
                 sort_by = sort_by + '{columns} {direction} NULLS LAST'.format(columns=cols[k], direction=vl)
                 order_list = order_list + '{attribute} {direction} NULLS LAST'.format(attribute=k, direction=vl)
+                order_keys.append(k)
+                order_by.append((cols[k], vl))
+        # break the ties on the id, so the pages don't overlap and a cursor points to one row
+        sort_by = sort_by + (', ' if sort_by else '') + '{columns} asc'.format(columns=cols['id'])
+        order_keys.append('id')
+        order_by.append((cols['id'], 'asc'))
+
+        if cursor_values is not None and len(cursor_values) != len(order_by):
+            return jsonify({'message': 'cursor is not valid for this order'}), 406
 
         # Assemble the query
         nrNum = request.args.get('nrNum', None)
@@ -216,11 +245,9 @@ class Requests(Resource):
         if activeUser:
             q = q.join(RequestDAO.activeUser).filter(User.username.ilike('%' + activeUser + '%'))
 
-        # TODO: fix count on search by compName -- returns count of all names that match
-        # -- want it to be all NRs (nrs can have multiple names that match)
-        # ---- right now count is adjusted on the frontend in method 'populateTable'
+        # EXISTS rather than a join, an NR with several matching names is one row (for the count and the page)
         if compName:
-            q = q.join(RequestDAO.names).filter(Name.name.ilike('%' + compName + '%'))
+            q = q.filter(RequestDAO.names.any(Name.name.ilike('%' + compName + '%')))
 
         if priority == 'Standard':
             q = q.filter(RequestDAO.priorityCd != 'Y')
@@ -273,25 +300,38 @@ class Requests(Resource):
 
         q = q.order_by(text(sort_by))
 
-        # get a count of the full set size, this ignore the offset & limit settings
-        count_q = q.statement.with_only_columns([func.count()]).order_by(None)
-        count = db.session.execute(count_q).scalar()
+        # get a count of the full set size while the page is fetched, this ignore the paging settings
+        count_future = submit_count(db.session.get_bind(), q.statement, estimate=count_mode == 'estimate')
 
-        # Add the paging
-        q = q.offset(start)
-        q = q.limit(rows)
+        # Add the paging, the rows after the cursor or from the start offset
+        if cursor_values is not None:
+            q = q.filter(get_keyset_filter(order_by, cursor_values))
+        else:
+            q = q.offset(start)
+        # one more row than the page tells if there is a next one
+        q = q.limit(rows + 1)
+        name_requests = q.all()
+
+        next_cursor = None
+        if len(name_requests) > rows:
+            name_requests = name_requests[:rows]
+            next_cursor = encode_cursor([getattr(name_requests[-1], k) for k in order_keys])
 
         # create the response
-        rep = {'response': {'start': start,
-                            'rows': rows,
-                            'numFound': count,
+        rep = {'response': {'rows': rows,
+                            'numFound': count_future.result(),
+                            'count': count_mode,
+                            'nextCursor': next_cursor,
                             'numPriorities': 0,
                             'numUpdatedToday': 0,
                             'queue': queue,
                             'order': order_list
                             },
-               'nameRequests': request_search_schemas.dump(q.all())
+               'nameRequests': request_search_schemas.dump(name_requests)
                }
+        # start doesn't apply to a page after a cursor
+        if cursor_values is None:
+            rep['response']['start'] = start
 
         return jsonify(rep), 200
 
@@ -0,0 +1,142 @@
+import logging
+import time
+
+from sqlalchemy import text
+
+from namex.models import db
+from namex.utils.refresh import RefreshService
+
+'''
+The conflict corpus is the conflict_names materialized view: the names the conflict search looks at (see
+ConflictName), with only the columns it needs, so conflict queries don't join and filter requests and names each time.
+
+ConflictCorpusService refreshes the view every CONFLICT_CORPUS_REFRESH_INTERVAL seconds. Refreshes are shared by all
+the API processes: the refresh time is kept in the conflict_names_refresh table and a transaction lock lets only one of
+them refresh at a time. The conflict search falls back to the tables when the view is older than
+CONFLICT_CORPUS_MAX_STALENESS seconds.
+'''
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 60  # seconds
+DEFAULT_MAX_STALENESS = 300  # seconds
+
+REFRESH_LOCK_ID = 7311301  # pg_try_advisory_xact_lock key of the refresh
+
+refresh_status_sql = text('SELECT refreshed_at, duration, extract(epoch FROM now() - refreshed_at) AS age '
+                          'FROM conflict_names_refresh WHERE id = 1')
+refresh_lock_sql = text('SELECT pg_try_advisory_xact_lock(:lock_id)')
+refresh_sql = text('REFRESH MATERIALIZED VIEW CONCURRENTLY conflict_names')
+refresh_done_sql = text('UPDATE conflict_names_refresh SET refreshed_at = now(), duration = :duration WHERE id = 1')
+
+
+class ConflictCorpusService(RefreshService):
+    '''
+    The corpus is disabled when the refresh interval is 0, conflict searches then always query the tables.
+    '''
+
+    refresh_name = 'conflict-corpus-refresh'
+    refresh_description = 'conflict corpus'
+
+    def __init__(self):
+        super().__init__()
+        self._app = None
+        self._max_staleness = DEFAULT_MAX_STALENESS
+
+        # Last refresh status read from the database, and the time.monotonic() it was read at
+        self._refreshed_at = None
+        self._refresh_duration = None
+        self._age = None
+        self._checked_at = None
+
+        # Refreshes done by this process
+        self._refresh_count = 0
+        self._failure_count = 0
+        self._last_error = None
+
+    def init_app(self, app):
+        self._app = app
+        self._refresh_interval = int(app.config.get('CONFLICT_CORPUS_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+        self._max_staleness = int(app.config.get('CONFLICT_CORPUS_MAX_STALENESS', DEFAULT_MAX_STALENESS))
+
+        if self._refresh_interval > 0:
+            self.start_refresh()
+
+    def get_staleness(self):
+        '''
+        @:return The seconds since the view was last refreshed, None if unknown
+        '''
+        if self._age is None:
+            return None
+        return self._age + time.monotonic() - self._checked_at
+
+    def is_available(self):
+        '''
+        @:return True if the conflict search can use the view
+        '''
+        if self._refresh_interval <= 0:
+            return False
+
+        self._check_refresh()
+
+        staleness = self.get_staleness()
+        return staleness is not None and staleness <= self._max_staleness
+
+    def get_metrics(self):
+        staleness = self.get_staleness()
+        return {
+            'enabled': self._refresh_interval > 0,
+            'available': self.is_available(),
+            'refreshInterval': self._refresh_interval,
+            'maxStaleness': self._max_staleness,
+            'refreshedAt': self._refreshed_at.isoformat() if self._refreshed_at else None,
+            'stalenessSeconds': round(staleness, 3) if staleness is not None else None,
+            'lastRefreshDurationSeconds': self._refresh_duration,
+            'processRefreshCount': self._refresh_count,
+            'processRefreshFailureCount': self._failure_count,
+            'processLastError': self._last_error
+        }
+
+    def refresh(self, force=False):
+        '''
+        Refresh the view if it is older than the refresh interval and no other process is refreshing it.
+        @:return True if this process refreshed it
+        '''
+        refreshed = False
+        with self._app.app_context():
+            # Check the age again once the lock is held, another process may just have refreshed the view
+            if force or self._is_stale() and \
+                    db.session.execute(refresh_lock_sql, {'lock_id': REFRESH_LOCK_ID}).scalar() and self._is_stale():
+                start = time.monotonic()
+                db.session.execute(refresh_sql)
+                duration = round(time.monotonic() - start, 3)
+                db.session.execute(refresh_done_sql, {'duration': duration})
+                db.session.commit()
+                refreshed = True
+                logger.info('Refreshed the conflict corpus in %.3f seconds', duration)
+            else:
+                db.session.rollback()
+
+            self._read_status()
+
+        if refreshed:
+            self._refresh_count += 1
+        return refreshed
+
+    def _refresh_failed(self, err):
+        self._failure_count += 1
+        self._last_error = repr(err)
+        super()._refresh_failed(err)
+
+    def _is_stale(self):
+        age = db.session.execute(refresh_status_sql).first().age
+        return age is None or age >= self._refresh_interval
+
+    def _read_status(self):
+        status = db.session.execute(refresh_status_sql).first()
+        self._refreshed_at, self._refresh_duration = status.refreshed_at, status.duration
+        self._age = float(status.age) if status.age is not None else None
+        self._checked_at = time.monotonic()
+
+
+conflict_corpus_service = ConflictCorpusService()
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib import parse
+
+from namex.utils.http_session import get_session
+
+'''
+Exact-match lookups of the examiner UI, which asks for one at every keystroke of the name being typed.
+ExactMatchService answers them from a short-lived cache keyed on the normalized query, and identical lookups arriving
+while one is in flight wait for its answer instead of asking Solr again.
+
+The names added to or deleted from possible.conflicts by this process (AbstractSolrResource.add_solr_doc and
+delete_solr_doc) drop the lookups they affect. The other writers (the solr-feeder, the data imports) and the other
+processes aren't seen, EXACT_MATCH_CACHE_TTL bounds how stale an answer can get.
+'''
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 10  # seconds
+DEFAULT_SIZE = 1000
+DEFAULT_TIMEOUT = 5  # seconds
+
+SOLR_CORE = 'possible.conflicts'
+
+
+def normalize_query(query):
+    return query.lower().replace('*', '')
+
+
+def get_exact_match_url(solr_base_url, query):
+    return solr_base_url + '/solr/' + SOLR_CORE + \
+        '/select?' + \
+        'sow=false' + \
+        '&df=name_exact_match' + \
+        '&wt=json' + \
+        '&q=' + parse.quote(query)
+
+
+class ExactMatchService(object):
+    '''
+    The cache is disabled when the TTL is 0, every lookup goes to Solr then.
+    Lookups that raise aren't cached, the ones waiting on them get the error too.
+    '''
+
+    def __init__(self):
+        self._solr_base_url = None
+        self._ttl = 0
+        self._size = DEFAULT_SIZE
+        self._timeout = DEFAULT_TIMEOUT
+        # normalized query -> (expiry, names), least recently used first
+        self._values = OrderedDict()
+        # normalized query -> Future of the lookup sent to Solr
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, the answer of a lookup sent before one isn't cached
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._invalidations = 0
+
+    def init_app(self, app):
+        self._solr_base_url = app.config.get('SOLR_BASE_URL', None)
+        self._ttl = float(app.config.get('EXACT_MATCH_CACHE_TTL', DEFAULT_TTL))
+        self._size = int(app.config.get('EXACT_MATCH_CACHE_SIZE', DEFAULT_SIZE))
+        self._timeout = float(app.config.get('EXACT_MATCH_TIMEOUT', DEFAULT_TIMEOUT))
+        self.invalidate()
+
+    def lookup(self, query):
+        '''
+        @:param query The name typed by the examiner, * wildcards are ignored
+        @:return The {'name', 'id', 'source', 'start_date', 'jurisdiction'} of the exact matches, callers must not change
+        them
+        '''
+        key = normalize_query(query)
+        if self._ttl <= 0:
+            return self._search(key)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and entry[0] > now:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                future = self._in_flight[key] = Future()
+                generation = self._generation
+                self._misses += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+        return self._search_for(key, future, generation, now)
+
+    def invalidate(self):
+        with self._lock:
+            self._values.clear()
+            self._generation += 1
+            self._invalidations += 1
+
+    def invalidate_doc(self, doc_id):
+        '''
+        Drop the lookups that answered the doc, after it was deleted.
+        '''
+        with self._lock:
+            keys = [key for key, (_, names) in self._values.items() if any(name['id'] == doc_id for name in names)]
+            for key in keys:
+                del self._values[key]
+            self._generation += 1
+            self._invalidations += 1
+
+    def get_metrics(self):
+        return {
+            'ttl': self._ttl,
+            'size': len(self._values),
+            'maxSize': self._size,
+            'inFlight': len(self._in_flight),
+            'hits': self._hits,
+            'misses': self._misses,
+            'coalesced': self._coalesced,
+            'invalidations': self._invalidations
+        }
+
+    def _search_for(self, key, future, generation, start):
+        try:
+            names = self._search(key)
+        except BaseException as err:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(err)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            # A doc added or deleted while Solr was answering may be missing from the answer
+            if generation == self._generation:
+                self._values[key] = (start + self._ttl, names)
+                self._values.move_to_end(key)
+                while len(self._values) > self._size:
+                    self._values.popitem(last=False)
+        future.set_result(names)
+        return names
+
+    def _search(self, query):
+        url = get_exact_match_url(self._solr_base_url, query)
+        logger.debug('Exact-match query: %s', url)
+        connection = get_session().get(url, timeout=self._timeout)
+        connection.raise_for_status()
+        docs = connection.json()['response']['docs']
+
+        return [{'name': doc['name'], 'id': doc['id'], 'source': doc['source'], 'start_date': doc['start_date'],
+                 'jurisdiction': doc['jurisdiction']} for doc in docs]
+
+
+exact_match_service = ExactMatchService()
@@ -0,0 +1,68 @@
+import re
+import threading
+from collections import OrderedDict
+
+from namex.utils.keyword_matcher import KeywordMatcher
+
+from .text_transform import TextTransform
+from ..name_request.auto_analyse.name_analysis_utils import get_remove_french_regex, get_stop_words_regex
+
+'''
+Compiled regular expressions of the name cleaning pipeline.
+They are built from the full stop word, designation and prefix lists, which only change with the reference data, so
+they are compiled once per reference data snapshot and shared instead of being rebuilt for every name.
+'''
+
+MAX_CACHED_PATTERNS = 4
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_exception_stop_words_designation(stop_words, all_designations):
+    '''
+    Designations containing a stop word, eg. "limited liability company", which must not lose their stop words.
+    @:return The designations, longest first, or ['null'] if there are none
+    '''
+    matcher = KeywordMatcher(stop_words)
+    exceptions = [designation for designation in dict.fromkeys(all_designations) if matcher.contains_word(designation)]
+    exceptions.sort(key=len, reverse=True)
+
+    return exceptions if exceptions else ['null']
+
+
+class NamePatterns(object):
+    def __init__(self, stop_words, designations, prefixes=()):
+        self.designation_all = sorted(designations, key=len, reverse=True)
+        self.designation_alternators = '|'.join(map(re.escape, self.designation_all))
+
+        self.exception_stop_words_designation = get_exception_stop_words_designation(stop_words, self.designation_all)
+
+        self.stop_words_rx = get_stop_words_regex(stop_words, self.exception_stop_words_designation)
+        self.remove_french_rx = get_remove_french_regex(self.designation_alternators)
+        self.tokenize_rx = re.compile(r'(?<!\w)({}|[a-z-A-Z0-9]+)(?!\w)'.format(self.designation_alternators))
+
+        self.text_transform = TextTransform(self.designation_all, prefixes)
+
+
+def get_name_patterns(stop_words, designations, prefixes=(), version=None):
+    '''
+    @:param version The reference data version the lists come from, the lists themselves are the key if it is None
+    @:return The NamePatterns of the lists, built on first use
+    '''
+    key = version if version is not None else (tuple(stop_words), tuple(designations), tuple(prefixes))
+
+    with _cache_lock:
+        patterns = _cache.get(key)
+        if patterns is not None:
+            _cache.move_to_end(key)
+            return patterns
+
+    patterns = NamePatterns(stop_words, designations, prefixes)
+
+    with _cache_lock:
+        _cache[key] = patterns
+        while len(_cache) > MAX_CACHED_PATTERNS:
+            _cache.popitem(last=False)
+
+    return patterns
@@ -1,7 +1,9 @@
 import re
 import warnings
+from urllib.parse import unquote_plus
 
-from . import LanguageCodes
+from .name_patterns import get_name_patterns, get_exception_stop_words_designation
+from .reference_data import load_reference_data
 from ..name_request.auto_analyse.mixins.get_designations_lists import GetDesignationsListsMixin
 from ..name_request.auto_analyse.name_analysis_utils import remove_french, remove_stop_words, check_numbers_beginning
 from namex.services.word_classification.word_classification import WordClassificationService
@@ -9,6 +11,7 @@ from namex.services.word_classification.word_classification import WordClassific
 from .mixins.get_synonym_lists import GetSynonymListsMixin
 
 from swagger_client import SynonymsApi as SynonymService
+from namex.utils.http_session import http_session_service
 
 from ..virtual_word_condition.virtual_word_condition import VirtualWordConditionService
 
@@ -118,7 +121,7 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
         self._virtual_word_condition_service = svc
 
     def __init__(self):
-        self.synonym_service = SynonymService()
+        self.synonym_service = SynonymService(http_session_service.get_api_client())
         self.word_classification_service = WordClassificationService()
         self.virtual_word_condition_service = VirtualWordConditionService()
         self.name_as_submitted = None
@@ -142,52 +145,36 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
         self._process_name(np_svc_prep_data)
 
     def set_name_tokenized(self, name):
-        all_designations = self._designated_all_words
-        all_designations.sort(key=len, reverse=True)
-        designation_alternators = '|'.join(map(re.escape, all_designations))
-        regex = re.compile(r'(?<!\w)({}|[a-z-A-Z0-9]+)(?!\w)'.format(designation_alternators))
-        self.name_as_submitted_tokenized = regex.findall(name.lower())
+        patterns = get_name_patterns(self._stop_words, self._designated_all_words, self._prefixes)
+        self.name_as_submitted_tokenized = patterns.tokenize_rx.findall(name.lower())
 
-    def _clean_name_words(self, name, stop_words=[], designation_all=[], prefix_list=[], number_list=[]):
+    def _clean_name_words(self, name, stop_words=[], designation_all=[], prefix_list=[], number_list=[], version=None):
         if not name or not stop_words or not designation_all or not prefix_list or not number_list:
             warnings.warn("Parameters in clean_name_words function are not set.", Warning)
 
-        syn_svc = self.synonym_service
         # vwc_svc = self.virtual_word_condition_service
-        designation_all.sort(key=len, reverse=True)
-        designation_alternators = '|'.join(map(re.escape, designation_all))
+        # Regexes built from the whole reference lists are compiled once per reference data version
+        patterns = get_name_patterns(stop_words, designation_all, prefix_list, version)
+        text_transform = patterns.text_transform
 
         exception_designation = self.exception_designation(name)
-        exception_stop_words_designation = list(set(self.exception_designation_stop_word(stop_words, designation_all)))
-        exception_stop_words_designation.sort(key=len, reverse=True)
 
         name_original_tokens = [x for x in [x.strip() for x in re.split('([ &/-])', name.lower())] if x]
         self.name_original_tokens = name_original_tokens
 
-        name = remove_stop_words(name, stop_words, exception_stop_words_designation)
+        name = remove_stop_words(name, stop_words, patterns.exception_stop_words_designation, patterns.stop_words_rx)
 
-        prefixes = '|'.join(prefix_list)
-        words = syn_svc.get_regex_prefixes(
-            text=name,
-            prefixes_str=prefixes,
-            exception_designation=exception_designation
-        ).data
+        # The synonyms API used to run the text transformations, and decoded the text once more after the query string.
+        # unquote_plus keeps the names coming out the same.
+        words = text_transform.regex_prefixes(unquote_plus(name), exception_designation)
 
-        name = remove_french(words, designation_alternators)
+        name = remove_french(words, patterns.designation_alternators, patterns.remove_french_rx)
         self.name_first_part = name
 
         # exceptions_ws = syn_svc.get_exception_regex(text=name).data
         # exceptions_ws.extend(self.exception_virtual_word_condition(name, vwc_svc))
 
-        tokens = syn_svc.get_transform_text(
-            text=name,
-            designation_all=designation_all,
-            prefix_list=prefix_list,
-            number_list=number_list,
-            exceptions_ws=[]
-        ).data
-
-        tokens = tokens.split()
+        tokens = text_transform.transform(unquote_plus(name)).split()
 
         return [x.lower() for x in tokens if x]
 
@@ -215,39 +202,35 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
         return exceptions_designation
 
     def exception_designation_stop_word(self, stop_words, all_designations):
-        exception_stopword_designation= []
-        for word in stop_words:
-            for designation in all_designations:
-                if bool(re.search(r'\b{0}\b'.format(word), designation)):
-                    exception_stopword_designation.append(designation)
-
-        if not exception_stopword_designation:
-            exception_stopword_designation.append('null')
-
-        return exception_stopword_designation
+        return get_exception_stop_words_designation(stop_words, all_designations)
 
     def prepare_data(self):
-        syn_svc = self.synonym_service
-
         # Query database for word designations
         # These properties are mixed in via GetSynonymListsMixin
         # See the class constructor
-        self._stop_words = syn_svc.get_stop_words().data
-        self._prefixes = syn_svc.get_prefixes().data
-        self._number_words = syn_svc.get_number_words().data
-        self._stand_alone_words = syn_svc.get_stand_alone().data
+        self.use_reference_data(load_reference_data(self.synonym_service))
+
+    '''
+    Set the reference lists (stop words, prefixes, designations...) from a ReferenceData snapshot instead of
+    querying the synonyms API, see reference_data.reference_data_service.
+    '''
+
+    def use_reference_data(self, reference_data):
+        self._stop_words = reference_data.get_stop_words()
+        self._prefixes = reference_data.get_prefixes()
+        self._number_words = reference_data.get_number_words()
+        self._stand_alone_words = reference_data.get_stand_alone_words()
 
-        self._eng_designated_end_words = syn_svc.get_designated_end_all_words(lang=LanguageCodes.ENG.value).data
-        self._eng_designated_any_words = syn_svc.get_designated_any_all_words(lang=LanguageCodes.ENG.value).data
+        self._eng_designated_end_words = reference_data.get_eng_designated_end_words()
+        self._eng_designated_any_words = reference_data.get_eng_designated_any_words()
 
-        self._fr_designated_end_words = syn_svc.get_designated_end_all_words(lang=LanguageCodes.FR.value).data
-        self._fr_designated_any_words = syn_svc.get_designated_any_all_words(lang=LanguageCodes.FR.value).data
+        self._fr_designated_end_words = reference_data.get_fr_designated_end_words()
+        self._fr_designated_any_words = reference_data.get_fr_designated_any_words()
 
-        self._designated_end_words = self._eng_designated_end_words + self._fr_designated_end_words
-        self._designated_any_words = self._eng_designated_any_words + self._fr_designated_any_words
+        self._designated_end_words = reference_data.get_designated_end_words()
+        self._designated_any_words = reference_data.get_designated_any_words()
 
-        self._designated_all_words = list(set(self._designated_any_words + self._designated_end_words))
-        self._designated_all_words.sort(key=len, reverse=True)
+        self._designated_all_words = reference_data.get_designated_all_words()
 
     '''
     Split a name string into classifiable tokens. Called whenever set_name is invoked.
@@ -264,7 +247,8 @@ class NameProcessingService(GetSynonymListsMixin, GetDesignationsListsMixin):
                 np_svc_prep_data.get_stop_words(),
                 np_svc_prep_data.get_designated_all_words(),
                 np_svc_prep_data.get_prefixes(),
-                np_svc_prep_data.get_number_words()
+                np_svc_prep_data.get_number_words(),
+                getattr(np_svc_prep_data, 'version', None)
             )
 
             # Store clean, processed name to instance
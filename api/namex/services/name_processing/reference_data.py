@@ -0,0 +1,183 @@
+import logging
+import threading
+from datetime import datetime
+
+from swagger_client import SynonymsApi as SynonymService
+
+from namex.utils.http_session import http_session_service
+from namex.utils.refresh import RefreshService
+
+from . import LanguageCodes
+
+'''
+Process-wide snapshot of the synonym-table reference data used to pre-process a name:
+stop words, prefixes, number words, stand-alone words and the English / French <end> and <any> designations.
+
+Loading it takes eight synonyms API round trips, so callers that analyse many names (eg. the auto-analyze service)
+load it once, share it across requests, and let ReferenceDataService swap in a new snapshot in the background when
+the synonyms API reports a new version of the synonym table.
+'''
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 300  # seconds
+VERSION_REQUEST_TIMEOUT = 5  # seconds
+
+
+class ReferenceData(object):
+    '''
+    Immutable, versioned snapshot of the reference lists.
+    The getters mirror GetSynonymListsMixin / GetDesignationsListsMixin, so a snapshot can be passed anywhere a
+    prepared NameProcessingService (np_svc_prep_data) is expected. Getters return copies, callers may sort them in place.
+    '''
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def loaded_at(self):
+        return self._loaded_at
+
+    def __init__(self, version, stop_words, prefixes, number_words, stand_alone_words,
+                 eng_designated_end_words, eng_designated_any_words, fr_designated_end_words, fr_designated_any_words):
+        self._version = version
+        self._loaded_at = datetime.utcnow()
+
+        self._stop_words = tuple(stop_words)
+        self._prefixes = tuple(prefixes)
+        self._number_words = tuple(number_words)
+        self._stand_alone_words = tuple(stand_alone_words)
+
+        self._eng_designated_end_words = tuple(eng_designated_end_words)
+        self._eng_designated_any_words = tuple(eng_designated_any_words)
+        self._fr_designated_end_words = tuple(fr_designated_end_words)
+        self._fr_designated_any_words = tuple(fr_designated_any_words)
+
+        self._designated_end_words = self._eng_designated_end_words + self._fr_designated_end_words
+        self._designated_any_words = self._eng_designated_any_words + self._fr_designated_any_words
+        self._designated_all_words = tuple(
+            sorted(set(self._designated_any_words + self._designated_end_words), key=len, reverse=True))
+
+    def get_stop_words(self):
+        return list(self._stop_words)
+
+    def get_prefixes(self):
+        return list(self._prefixes)
+
+    def get_number_words(self):
+        return list(self._number_words)
+
+    def get_stand_alone_words(self):
+        return list(self._stand_alone_words)
+
+    def get_eng_designated_end_words(self):
+        return list(self._eng_designated_end_words)
+
+    def get_eng_designated_any_words(self):
+        return list(self._eng_designated_any_words)
+
+    def get_fr_designated_end_words(self):
+        return list(self._fr_designated_end_words)
+
+    def get_fr_designated_any_words(self):
+        return list(self._fr_designated_any_words)
+
+    def get_designated_end_words(self):
+        return list(self._designated_end_words)
+
+    def get_designated_any_words(self):
+        return list(self._designated_any_words)
+
+    def get_designated_all_words(self):
+        return list(self._designated_all_words)
+
+
+def load_reference_data(syn_svc, version=None):
+    return ReferenceData(
+        version=version,
+        stop_words=syn_svc.get_stop_words().data,
+        prefixes=syn_svc.get_prefixes().data,
+        number_words=syn_svc.get_number_words().data,
+        stand_alone_words=syn_svc.get_stand_alone().data,
+        eng_designated_end_words=syn_svc.get_designated_end_all_words(lang=LanguageCodes.ENG.value).data,
+        eng_designated_any_words=syn_svc.get_designated_any_all_words(lang=LanguageCodes.ENG.value).data,
+        fr_designated_end_words=syn_svc.get_designated_end_all_words(lang=LanguageCodes.FR.value).data,
+        fr_designated_any_words=syn_svc.get_designated_any_all_words(lang=LanguageCodes.FR.value).data
+    )
+
+
+class ReferenceDataService(RefreshService):
+    '''
+    Holds the current ReferenceData snapshot for the process, refreshed in the background (see namex.utils.refresh).
+    '''
+
+    refresh_name = 'reference-data-refresh'
+    refresh_description = 'name processing reference data'
+
+    @property
+    def version(self):
+        return self._reference_data.version if self._reference_data else None
+
+    def __init__(self):
+        super().__init__()
+        self._reference_data = None
+        self._version_url = None
+        self._refresh_interval = DEFAULT_REFRESH_INTERVAL
+        self._load_lock = threading.Lock()
+
+    def init_app(self, app):
+        solr_synonyms_api_url = app.config.get('SOLR_SYNONYMS_API_URL', None)
+        self._version_url = solr_synonyms_api_url + '/synonyms/version' if solr_synonyms_api_url else None
+        self._refresh_interval = int(app.config.get('REFERENCE_DATA_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+
+        if self._refresh_interval > 0:
+            self.start_refresh()
+
+    def get(self):
+        reference_data = self._reference_data
+        if reference_data is None:
+            with self._load_lock:
+                if self._reference_data is None:
+                    self._reference_data = self._load(self.fetch_version())
+                reference_data = self._reference_data
+
+        return reference_data
+
+    def fetch_version(self):
+        if not self._version_url:
+            return None
+
+        try:
+            response = http_session_service.get_session().get(self._version_url, timeout=VERSION_REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return response.json().get('data')
+        except Exception as err:
+            logger.warning('Could not get the synonyms version from %s: %s', self._version_url, repr(err))
+            return None
+
+    def refresh(self):
+        '''
+        Load the snapshot, or reload it if the synonym table changed since it was loaded.
+        @:return True if a new snapshot was swapped in
+        '''
+        if self._reference_data is None:
+            self.get()
+            return True
+
+        version = self.fetch_version()
+        if version is None or (self._reference_data is not None and version == self._reference_data.version):
+            return False
+
+        reference_data = self._load(version)
+        with self._load_lock:
+            self._reference_data = reference_data
+
+        logger.info('Loaded name processing reference data, synonyms version %s', version)
+        return True
+
+    def _load(self, version):
+        return load_reference_data(SynonymService(http_session_service.get_api_client()), version)
+
+
+reference_data_service = ReferenceDataService()
@@ -0,0 +1,95 @@
+import re
+import string
+from functools import lru_cache
+
+'''
+In-process version of the synonyms API text transformations used to clean a name:
+SynonymService.regex_prefixes (GET /synonyms/regex-prefixes) and SynonymService.regex_transform (GET /synonyms/transform-text).
+The rules and their order are the same as in the synonyms API, see the comments on regex_transform there.
+The patterns that don't depend on the reference data are compiled at import, the others when a TextTransform is built
+from a reference data snapshot (see name_patterns.get_name_patterns).
+'''
+
+# TODO: Implement a true shared lib for stuff like this!
+#  These rules are duplicated from the synonyms api project (synonyms.services.synonyms.synonym), keep them in sync
+
+ORDINAL_SUFFIXES = 'ST|[RN]D|TH'
+INTERNET_DOMAINS = '.COM|.ORG|.NET|.EDU'
+
+_numbers_lot_rx = re.compile(r'(?<=[a-zA-Z\.])\'[Ss]|\(.*\d+.*\)|\(?No.?\s*\d+\)?|\(?lot.?\s*\d+[-]?\d*\)?', re.I)
+_repeated_strings_rx = re.compile(r'\b(\w{2,})(\b\W+\b\1\b)*', re.I)
+_separated_ordinals_rx = re.compile(r'\b(\d+({}))(\w+)\b'.format(ORDINAL_SUFFIXES), re.I)
+_punctuation_rx = re.compile(rf"[{string.punctuation}]")
+_together_one_letter_rx = re.compile(r'(\b[A-Za-z]{1,2}\b)\s+(?=[a-zA-Z]{1,2}\b)|\s+$', re.I)
+_extra_spaces_rx = re.compile(r'\s+', re.I)
+
+
+def _normalize_spaces(text):
+    return " ".join(text.split())
+
+
+def regex_numbers_lot(text):
+    return _normalize_spaces(_numbers_lot_rx.sub('', text))
+
+
+def regex_repeated_strings(text):
+    return _normalize_spaces(_repeated_strings_rx.sub(r'\1', text))
+
+
+def regex_separated_ordinals(text):
+    return _normalize_spaces(_separated_ordinals_rx.sub(r'\1 \3', text))
+
+
+def regex_punctuation(text):
+    return _normalize_spaces(_punctuation_rx.sub(' ', text))
+
+
+def regex_together_one_letter(text):
+    return _normalize_spaces(_together_one_letter_rx.sub(r'\1', text))
+
+
+def regex_remove_extra_spaces(text):
+    return _normalize_spaces(_extra_spaces_rx.sub(' ', text))
+
+
+class TextTransform(object):
+    '''
+    The designation and prefix patterns of one reference data snapshot, compiled once.
+    As in the synonyms API, designations and prefixes are joined into the patterns unescaped.
+    '''
+
+    def __init__(self, designation_all, prefix_list):
+        self._designations_rx = re.compile(
+            r'\b({0})\b|(?<=\d),(?=\d)|(?<!\w)({1})(?![A-Za-z0-9_.])(?=.*$)'.format(INTERNET_DOMAINS,
+                                                                                    '|'.join(designation_all)),
+            re.I)
+        self._prefixes = '|'.join(prefix_list)
+        self._prefixes_rx = lru_cache(maxsize=64)(self._compile_prefixes_rx)
+
+    def _compile_prefixes_rx(self, exception_designation):
+        exception_designation_rx = '|'.join(map(re.escape, exception_designation))
+        ws_generic_rx = r'(?<![a-zA-Z0-9_.])({0})\s*([ &/.-])\s*([A-Za-z]+)'.format(self._prefixes)
+        return re.compile(r'({0})|{1}'.format(exception_designation_rx, ws_generic_rx), re.I)
+
+    def regex_remove_designations(self, text):
+        return _normalize_spaces(self._designations_rx.sub('', text))
+
+    '''
+    Set prefixes followed by punctuation and a word together (re/max), except in the exception designations.
+    '''
+    def regex_prefixes(self, text, exception_designation):
+        designation_rx = self._prefixes_rx(tuple(exception_designation))
+        text = designation_rx.sub(lambda x: x.group(1) or (x.group(2) + x.group(4)), text)
+
+        return _normalize_spaces(text)
+
+    def transform(self, text):
+        text = self.regex_remove_designations(text)
+        text = regex_numbers_lot(text)
+        text = regex_repeated_strings(text)
+        text = regex_separated_ordinals(text)
+        text = regex_punctuation(text)
+        text = regex_together_one_letter(text)
+        text = regex_remove_extra_spaces(text)
+
+        return text
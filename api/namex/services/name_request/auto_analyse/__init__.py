@@ -1,9 +1,7 @@
 from enum import Enum
-from nltk.stem import PorterStemmer
 
 from namex.constants import EntityTypes, DesignationPositionCodes
-
-porter = PorterStemmer()
+from namex.utils.stemming import porter
 
 # Limit number of words to analyse
 # TODO: We can set this to three later (in PROD), but this is way easier to test with a higher max limit
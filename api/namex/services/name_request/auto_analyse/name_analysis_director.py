@@ -23,6 +23,7 @@ from namex.services.virtual_word_condition.virtual_word_condition \
     import VirtualWordConditionService
 
 from swagger_client import SynonymsApi as SynonymService
+from namex.utils.http_session import http_session_service
 
 '''
 This is the director for AutoAnalyseService.
@@ -168,7 +169,7 @@ class NameAnalysisDirector(GetSynonymsListsMixin, GetDesignationsListsMixin, Get
         return self.name_as_submitted_tokenized
 
     def __init__(self):
-        self.synonym_service = SynonymService()
+        self.synonym_service = SynonymService(http_session_service.get_api_client())
         self.word_classification_service = WordClassificationService()
         self.word_condition_service = VirtualWordConditionService()
         self.name_processing_service = NameProcessingService()
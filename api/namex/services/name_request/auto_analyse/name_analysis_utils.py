@@ -31,20 +31,26 @@ def get_flat_list(lst):
     return [x.strip() for x in subs_list]
 
 
-def remove_french(text, all_designations_alternators):
-    text = re.sub(r'^([^-/]*?\b({0})(?!\w)[^-/\n]*)(?:[-/]\s*(.*))?$'.format(all_designations_alternators),
-                  r'\1 ',
-                  text,
-                  0,
-                  re.IGNORECASE)
+def get_remove_french_regex(all_designations_alternators):
+    return re.compile(r'^([^-/]*?\b({0})(?!\w)[^-/\n]*)(?:[-/]\s*(.*))?$'.format(all_designations_alternators),
+                      re.IGNORECASE)
+
+
+def remove_french(text, all_designations_alternators, remove_french_rx=None):
+    remove_french_rx = remove_french_rx or get_remove_french_regex(all_designations_alternators)
+    text = remove_french_rx.sub(r'\1 ', text)
     return " ".join(text.lower().split())
 
 
-def remove_stop_words(name, stop_words, exception_stop_word_designation):
+def get_stop_words_regex(stop_words, exception_stop_word_designation):
     exception_designation_rx = '|'.join(map(re.escape, exception_stop_word_designation))
     stop_words_rx = '|'.join(map(re.escape, stop_words))
     ws_generic_rx = r'\b({0})\b'.format(stop_words_rx)
-    ws_rx = re.compile(r'({0})|{1}'.format(exception_designation_rx, ws_generic_rx), re.I)
+    return re.compile(r'({0})|{1}'.format(exception_designation_rx, ws_generic_rx), re.I)
+
+
+def remove_stop_words(name, stop_words, exception_stop_word_designation, stop_words_rx=None):
+    ws_rx = stop_words_rx or get_stop_words_regex(stop_words, exception_stop_word_designation)
 
     text = ws_rx.sub(lambda x: x.group(1) or "", name)
 
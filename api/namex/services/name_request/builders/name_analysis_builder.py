@@ -1,10 +1,10 @@
 from flask import current_app
 import re
 import itertools
+import json
 from collections import ChainMap
 import warnings
 
-import requests
 from . import EXACT_MATCH, HIGH_CONFLICT_RECORDS, HIGH_SIMILARITY, CURRENT_YEAR, LOWER_LIMIT_TIME, \
     UPPER_LIMIT_TIME, EXCEPTION_YEARS, CURRENT_MONTH, CURRENT_DAY
 from ..auto_analyse.abstract_name_analysis_builder import AbstractNameAnalysisBuilder, ProcedureResult
@@ -12,9 +12,12 @@ from ..auto_analyse import AnalysisIssueCodes, MAX_LIMIT, MAX_MATCHES_LIMIT, por
 from ..auto_analyse.name_analysis_utils import get_conflicts_same_classification, \
     get_all_dict_substitutions, subsequences, remove_double_letters, remove_double_letters_list_dist_words
 
+from namex.models.conflict_name import ConflictName
 from namex.models.request import Request
+from namex.services.conflict_corpus.conflict_corpus import conflict_corpus_service
 
 from namex.utils.common import parse_dict_of_lists, get_plural_singular_name
+from namex.utils.http_session import get_session
 from namex.services.name_request.auto_analyse import DataFrameFields
 
 WORD = re.compile(r"\w+")
@@ -191,26 +194,16 @@ class NameAnalysisBuilder(AbstractNameAnalysisBuilder):
         w_dist, list_name, dist_substitution_dict = remove_double_letters_list_dist_words(w_dist, list_name,
                                                                                           dist_substitution_dict)
 
-        list_conflict_details = list()
-
         change_filter = True if self.director.skip_search_conflicts else False
-        list_details, forced = self.get_conflicts_db(dist_substitution_dict, desc_synonym_criteria_dict,
-                                                     desc_synonym_dict,
-                                                     dict_highest_counter, change_filter, list_name,
-                                                     check_name_is_well_formed, queue)
-        list_conflict_details.extend(list_details)
+        searches = [
+            (None, dist_substitution_dict, desc_synonym_criteria_dict, desc_synonym_dict),
+            ("Search for conflicts considering compound-distinctive words.",
+             self.get_compound_distinctives(dist_substitution_dict), desc_synonym_criteria_dict, desc_synonym_dict)
+        ]
+        list_conflict_details, forced = self.get_conflicts_db(searches, dict_highest_counter, change_filter, list_name,
+                                                              check_name_is_well_formed, queue)
 
         if not forced:
-            print("Search for conflicts considering compound-distinctive words.")
-            dist_compound_dict = self.get_compound_distinctives(dist_substitution_dict)
-            list_details, forced = self.get_conflicts_db(dist_compound_dict, desc_synonym_criteria_dict,
-                                                         desc_synonym_dict,
-                                                         dict_highest_counter,
-                                                         change_filter, list_name, check_name_is_well_formed, queue)
-            list_conflict_details.extend(list_details)
-
-        if not forced:
-            print("Search for conflicts considering compound-distinctive words taking one simple descriptive")
             dist_compound_dict, desc_synonym_dict_new = self.get_compound_distinctive_hybrid(dist_substitution_dict,
                                                                                              desc_synonym_dict,
                                                                                              list_name)
@@ -218,17 +211,25 @@ class NameAnalysisBuilder(AbstractNameAnalysisBuilder):
             desc_synonym_dict = desc_synonym_dict_new
             desc_synonym_criteria_dict = self.remove_key(diff_keys, desc_synonym_criteria_dict)
 
-            list_details, forced = self.get_conflicts_db(dist_compound_dict, desc_synonym_criteria_dict,
-                                                         desc_synonym_dict,
-                                                         dict_highest_counter,
-                                                         change_filter, list_name, check_name_is_well_formed, queue)
+            searches = [
+                ("Search for conflicts considering compound-distinctive words taking one simple descriptive",
+                 dist_compound_dict, desc_synonym_criteria_dict, desc_synonym_dict)
+            ]
+            list_details, forced = self.get_conflicts_db(searches, dict_highest_counter, change_filter, list_name,
+                                                         check_name_is_well_formed, queue)
             list_conflict_details.extend(list_details)
 
         return list_conflict_details, forced
 
-    def get_conflicts_db(self, dist_substitution_dict, desc_synonym_criteria_dict, desc_synonym_dict,
-                         dict_highest_counter, change_filter,
-                         list_name, check_name_is_well_formed, queue):
+    '''
+    Run the conflict searches in order until one of them forces the result.
+    The candidate names of every dist x desc combination of the searches are fetched in a single query. The filters of
+    the descriptives of a distinctive add up, a combination only matches the names its previous descriptives matched.
+    @:param searches (message, dist_substitution_dict, desc_synonym_criteria_dict, desc_synonym_dict) tuples
+    '''
+
+    def get_conflicts_db(self, searches, dict_highest_counter, change_filter, list_name, check_name_is_well_formed,
+                         queue):
         stop_word_list = self.name_processing_service.get_stop_words()
         stop_words = '|'.join(stop_word_list)
         list_details = []
@@ -241,22 +242,45 @@ class NameAnalysisBuilder(AbstractNameAnalysisBuilder):
         else:
             print("Search conflicts for APPROVED, CONDITIONAL, COND_RESERVED, RESERVED")
 
-        for key_dist, value_dist in dist_substitution_dict.items():
+        use_corpus = conflict_corpus_service.is_available()
+        if use_corpus:
+            criteria = ConflictName.get_general_query(change_filter, queue)
+        else:
             criteria = Request.get_general_query(change_filter, queue)
-            name_criteria = Request.get_distinctive_query(value_dist, stop_words, check_name_is_well_formed)
-            for key_desc, value_desc in desc_synonym_criteria_dict.items():
-                print(key_dist, ":DIST ", key_desc, ":DESC")
-                criteria = Request.get_descriptive_query(value_desc, criteria, name_criteria)
-                matches = Request.find_by_criteria_array(criteria, queue)
-                matches = self.skip_name_matches_processed(matches)
-                list_conflicts_details, forced = self.get_most_similar_names(
-                    dict_highest_counter,
-                    set(matches), dist_substitution_dict,
-                    desc_synonym_dict, list_name)
-                list_details.extend(list_conflicts_details)
 
-                if forced:
-                    return list_details, forced
+        name_criteria_list = []
+        for _, dist_substitution_dict, desc_synonym_criteria_dict, _ in searches:
+            for key_dist, value_dist in dist_substitution_dict.items():
+                name_criteria = Request.get_distinctive_query(value_dist, stop_words, check_name_is_well_formed)
+                for key_desc, value_desc in desc_synonym_criteria_dict.items():
+                    name_criteria_list.append(([value_dist, value_desc],
+                                               Request.get_descriptive_criteria(value_desc, name_criteria, criteria)))
+
+        if use_corpus:
+            all_matches = iter(Request.find_by_name_criteria(criteria, name_criteria_list, queue, ConflictName))
+        else:
+            all_matches = iter(Request.find_by_name_criteria(criteria, name_criteria_list, queue))
+
+        for message, dist_substitution_dict, desc_synonym_criteria_dict, desc_synonym_dict in searches:
+            if message:
+                print(message)
+            for key_dist in dist_substitution_dict:
+                dist_matches = None
+                for key_desc in desc_synonym_criteria_dict:
+                    print(key_dist, ":DIST ", key_desc, ":DESC")
+                    desc_matches = next(all_matches)
+                    dist_matches = set(desc_matches) if dist_matches is None else \
+                        dist_matches.intersection(desc_matches)
+                    matches = self.skip_name_matches_processed(
+                        [match for match in desc_matches if match in dist_matches])
+                    list_conflicts_details, forced = self.get_most_similar_names(
+                        dict_highest_counter,
+                        set(matches), dist_substitution_dict,
+                        desc_synonym_dict, list_name)
+                    list_details.extend(list_conflicts_details)
+
+                    if forced:
+                        return list_details, forced
 
         return list_details, forced
 
@@ -494,12 +518,16 @@ class NameAnalysisBuilder(AbstractNameAnalysisBuilder):
                             'dict_substitution': dist_substitution_dict,
                             'dict_synonyms': desc_synonym_dict
                             }
-            conflict_response = requests.post(url=''.join([auto_analyze_url]),
-                                              json=json_analyze)
-            if not conflict_response:
-                warnings.warn("Quart Service did not return a result", Warning)
-            conflicts = conflict_response.json()
-            dict_matches_counter = dict(ChainMap(*conflicts.get('result')))
+            auto_analyze_timeout = current_app.config.get('AUTO_ANALYZE_TIMEOUT', None)
+            if current_app.config.get('AUTO_ANALYZE_STREAM', False):
+                conflicts_result = self.get_conflicts_stream(auto_analyze_url, json_analyze, auto_analyze_timeout)
+            else:
+                conflict_response = get_session().post(url=''.join([auto_analyze_url]),
+                                                       json=json_analyze, timeout=auto_analyze_timeout)
+                if not conflict_response:
+                    warnings.warn("Quart Service did not return a result", Warning)
+                conflicts_result = conflict_response.json().get('result')
+            dict_matches_counter = dict(ChainMap(*conflicts_result))
 
             selected_matches = [match for match in db_matches if match.name in dict_matches_counter.keys()]
 
@@ -514,6 +542,34 @@ class NameAnalysisBuilder(AbstractNameAnalysisBuilder):
 
         return list_details, forced
 
+    '''
+    Score the names with the streaming endpoint of the auto-analyze service, which sends the scores back as NDJSON one
+    chunk of names at a time. Reading stops at the first exact match, the search is forced then and the remaining
+    names don't need a score; closing the connection stops the service from scoring them.
+    The names are sent in alphabetical order: nothing scores above an exact match and get_most_similar_names breaks
+    ties on the name, so no name of a later chunk could have been picked over the exact matches read.
+    @return The auto-analyze result of the names scored
+    '''
+
+    def get_conflicts_stream(self, auto_analyze_url, json_analyze, timeout=None):
+        conflicts_result = []
+        json_analyze = dict(json_analyze, names=sorted(json_analyze['names']))
+        with get_session().post(url=auto_analyze_url.rstrip('/') + '/stream', json=json_analyze, stream=True,
+                                timeout=timeout) as response:
+            if not response:
+                warnings.warn("Quart Service did not return a result", Warning)
+                return conflicts_result
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk_result = json.loads(line).get('result')
+                conflicts_result.extend(chunk_result)
+                if any(EXACT_MATCH in result.values() for result in chunk_result):
+                    break
+
+        return conflicts_result
+
     def prepare_response(self, most_similar_names, queue, list_name, list_dist_words, list_desc_words):
         conflict_name = {}
         result = ProcedureResult()
@@ -0,0 +1,170 @@
+import logging
+
+from sqlalchemy import text
+
+from namex.models import db
+from namex.utils.keyword_matcher import KeywordMatcher
+from namex.utils.refresh import RefreshService
+
+'''
+Process-wide, read-only index of the restricted words and their conditions.
+The restricted_words analysis used to read the whole restricted_word table and scan it for every name, then query the
+conditions of each word found, one at a time. RestrictedWordIndex holds the words in a KeywordMatcher (Aho-Corasick)
+with their conditions attached, so a name is checked in one pass over it without a database round trip.
+
+The tables are edited with the admin app; RestrictedWordIndexService polls a checksum of the three of them every
+RESTRICTED_WORD_REFRESH_INTERVAL seconds and rebuilds the index when it changed.
+'''
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 30  # seconds
+
+# The cnd_info of a word with a condition missing from restricted_condition, as RestrictedWords.find_cnd_info answers
+CONDITION_NOT_AVAILABLE = 'Not Available'
+
+version_sql = text(
+    "SELECT (SELECT md5(coalesce(string_agg(w::text, ',' ORDER BY w.word_id), '')) FROM restricted_word w) || "
+    "(SELECT md5(coalesce(string_agg(wc::text, ',' ORDER BY wc.word_id, wc.cnd_id), '')) "
+    "FROM restricted_word_condition wc) || "
+    "(SELECT md5(coalesce(string_agg(c::text, ',' ORDER BY c.cnd_id), '')) FROM restricted_condition c)")
+words_sql = text('SELECT word_id, word_phrase FROM restricted_word ORDER BY word_id')
+word_conditions_sql = text('SELECT word_id, cnd_id FROM restricted_word_condition ORDER BY word_id, cnd_id')
+conditions_sql = text('SELECT cnd_id, cnd_text, allow_use, consent_required, consenting_body, instructions '
+                      'FROM restricted_condition')
+
+
+def get_condition_info(row):
+    cnd_id, cnd_text, allow_use, consent_required, consenting_body, instructions = row
+    return {'id': cnd_id,
+            'text': cnd_text,
+            'allow_use': allow_use,
+            'consent_required': consent_required,
+            'consenting_body': consenting_body,
+            'instructions': instructions}
+
+
+class RestrictedWordIndex(object):
+    '''
+    Immutable snapshot of the restricted word tables.
+    '''
+
+    @property
+    def version(self):
+        return self._version
+
+    def __init__(self, version, words, word_conditions, conditions):
+        '''
+        @:param words The (word_id, word_phrase) rows, in word_id order
+        @:param word_conditions The (word_id, cnd_id) rows, in cnd_id order
+        @:param conditions The (cnd_id, cnd_text, allow_use, consent_required, consenting_body, instructions) rows
+        '''
+        self._version = version
+
+        condition_infos = {row[0]: get_condition_info(row) for row in conditions}
+        word_cnd_ids = {}
+        for word_id, cnd_id in word_conditions:
+            word_cnd_ids.setdefault(word_id, []).append(cnd_id)
+
+        # (word_info, cnd_info) of each word, and the words of each ' PHRASE ' keyword
+        self._words = []
+        self._keyword_words = {}
+        for word_id, phrase in words:
+            if phrase is None:
+                continue
+
+            cnd_ids = word_cnd_ids.get(word_id, [])
+            if all(cnd_id in condition_infos for cnd_id in cnd_ids):
+                cnd_info = tuple(condition_infos[cnd_id] for cnd_id in cnd_ids)
+            else:
+                cnd_info = CONDITION_NOT_AVAILABLE
+
+            self._keyword_words.setdefault(' ' + phrase.upper().strip() + ' ', []).append(len(self._words))
+            self._words.append(({'id': word_id, 'phrase': phrase.upper()}, cnd_info))
+
+        self._matcher = KeywordMatcher(self._keyword_words)
+
+    def __len__(self):
+        return len(self._words)
+
+    '''
+    @:param content A name stripped by RestrictedWords.strip_content, ie. upper case and between spaces
+    @:return The {'word_info', 'cnd_info'} of the restricted words in content, in word_id order
+    '''
+    def find(self, content):
+        matched = {keyword for _, keyword in self._matcher.iter_matches(content)}
+        word_idxs = sorted(idx for keyword in matched for idx in self._keyword_words[keyword])
+
+        restricted_words_conditions = []
+        for idx in word_idxs:
+            word_info, cnd_info = self._words[idx]
+            restricted_words_conditions.append({
+                'word_info': dict(word_info),
+                'cnd_info': cnd_info if cnd_info == CONDITION_NOT_AVAILABLE else [dict(info) for info in cnd_info]
+            })
+        return restricted_words_conditions
+
+
+class RestrictedWordIndexService(RefreshService):
+    '''
+    Holds the current RestrictedWordIndex of the process, refreshed in the background (see namex.utils.refresh).
+    The index is only used once it is loaded, until then (or when the refresh is disabled) lookups go to the database.
+    '''
+
+    refresh_name = 'restricted-word-refresh'
+    refresh_description = 'restricted word index'
+
+    @property
+    def version(self):
+        return self._index.version if self._index else None
+
+    def __init__(self):
+        super().__init__()
+        self._app = None
+        self._index = None
+
+    def init_app(self, app):
+        self._app = app
+        self._refresh_interval = int(app.config.get('RESTRICTED_WORD_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+
+        if self._refresh_interval > 0:
+            self.start_refresh()
+
+    def get(self):
+        if self._refresh_interval <= 0:
+            return None
+
+        self._check_refresh()
+
+        return self._index
+
+    def refresh(self):
+        '''
+        Rebuild the index if the restricted word tables changed since it was loaded.
+        @:return True if a new index was swapped in
+        '''
+        with self._app.app_context():
+            version = db.engine.execute(version_sql).scalar()
+        if self._index is not None and version == self._index.version:
+            return False
+
+        index = self._load()
+        with self._lock:
+            self._index = index
+
+        logger.info('Loaded the restricted word index, %d words, version %s', len(index), index.version)
+        return True
+
+    def _load(self):
+        # One snapshot of the three tables, the version is of the rows read
+        with self._app.app_context(), db.engine.connect() as connection, connection.begin():
+            connection.execute(text('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ'))
+            version = connection.execute(version_sql).scalar()
+            words = connection.execute(words_sql).fetchall()
+            word_conditions = connection.execute(word_conditions_sql).fetchall()
+            conditions = connection.execute(conditions_sql).fetchall()
+
+        return RestrictedWordIndex(version, words, word_conditions, conditions)
+
+
+restricted_word_index_service = RestrictedWordIndexService()
@@ -1,9 +1,5 @@
-import pandas as pd
-
 from enum import Enum
 
-from ..name_request.auto_analyse.name_analysis_utils import data_frame_to_list
-
 
 class DataFrameFields(Enum):
     FIELD_SYNONYMS = 'synonyms_text'
@@ -103,32 +99,39 @@ class TokenClassifier:
 
         return list_dist, list_desc
 
+    '''
+    Classify all the tokens with a single word classification lookup.
+    A token is in every list of its classifications, in token order, and in the unclassified list if it has none.
+    @return list_dist, list_desc, list_none
+    '''
+    def classify_many(self, word_tokens):
+        classifications = self.word_classification_service.find_many(word_tokens)
+
+        lists = {
+            DataFrameFields.DISTINCTIVE.value: [],
+            DataFrameFields.DESCRIPTIVE.value: [],
+            DataFrameFields.UNCLASSIFIED.value: []
+        }
+
+        for word in word_tokens:
+            word_classification = classifications.get(word)
+            if not word_classification:
+                print('No word classification found for: ' + word)
+                lists[DataFrameFields.UNCLASSIFIED.value].append(word.lower().strip())
+            else:
+                for row in word_classification:
+                    words = lists.get(row.classification.strip())
+                    if words is not None:
+                        words.append(word.lower().strip())
+
+        return lists[DataFrameFields.DISTINCTIVE.value], \
+            lists[DataFrameFields.DESCRIPTIVE.value], \
+            lists[DataFrameFields.UNCLASSIFIED.value]
+
     def _classify_tokens(self, word_tokens):
         try:
-            cf = pd.DataFrame(columns=['word', 'word_classification'])
-
-            wc_svc = self.word_classification_service
-
-            # Get the word classification for each word in the supplied name name
-            for word in word_tokens:
-                word_classification = wc_svc.find_one(word)
-                new_row = []
-                if not word_classification:
-                    print('No word classification found for: ' + word)
-                    new_row.append({
-                        'word': word.lower().strip(),
-                        'word_classification': DataFrameFields.UNCLASSIFIED.value
-                    })
-                else:
-                    for row in word_classification:
-                        new_row.append({
-                            'word': word.lower().strip(),
-                            'word_classification': row.classification.strip()
-                        })
-
-                cf = cf.append(new_row, ignore_index=True)
-
-            self.distinctive_word_tokens, self.descriptive_word_tokens, self.unclassified_word_tokens = data_frame_to_list(cf)
+            self.distinctive_word_tokens, self.descriptive_word_tokens, self.unclassified_word_tokens = \
+                self.classify_many(word_tokens)
 
         except Exception as error:
             print('Token classification failed! ' + repr(error))
@@ -1,10 +1,13 @@
-from namex.models import WordClassification
+import re
 from datetime import datetime
 
+from namex.models import WordClassification
+
 from namex.models import User
 # from namex.services.name_request.utils import get_or_create_user_by_jwt
 
 from .token_classifier import TokenClassifier
+from .word_classification_index import word_classification_index_service
 
 
 class WordClassificationService:
@@ -12,8 +15,35 @@ class WordClassificationService:
         pass
 
     def find_one(self, word=None):
+        index = word_classification_index_service.get()
+        if index is not None:
+            return index.find(word)
+
         return WordClassification.find_word_classification(word)
 
+    '''
+    Look up the classifications of many words with a single query.
+    @:return A dict of word to its classification rows, like find_one(word) returns them; words without any are missing
+    '''
+    def find_many(self, words):
+        words = list(dict.fromkeys(words))
+
+        index = word_classification_index_service.get()
+        if index is not None:
+            return index.find_many(words)
+
+        results = WordClassification.find_words_classification(words)
+
+        classifications = {}
+        for word in words:
+            # Same match as the per word query (see WordClassification.find_word_classification), \y is \b in python
+            word_rx = re.compile(r"(^{0}(''[a-zA-Z])?\b)".format(word.lower()))
+            rows = [row for row in results if word_rx.search(row.word.lower())]
+            if rows:
+                classifications[word] = rows
+
+        return classifications
+
     def find_one_by_class(word=None, classification=None):
         return WordClassification.find_word_by_classification(word, classification)
 
@@ -31,6 +61,8 @@ class WordClassificationService:
         entity.last_updated_by = user_id
 
         entity.save_to_db()
+        # Updates only change the usage columns, a new word / classification is the only change the index needs now
+        word_classification_index_service.invalidate([word_classification['word']])
 
         return entity
 
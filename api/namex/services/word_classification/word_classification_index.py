@@ -0,0 +1,223 @@
+import logging
+import re
+import sys
+from collections import namedtuple
+from contextlib import nullcontext
+
+from namex.models import WordClassification, db
+from namex.utils.refresh import RefreshService
+
+'''
+Process-wide, read-only index of the approved word classifications.
+Token classification runs for the submitted name and for every conflict candidate, so instead of querying the
+word_classification table for each of them the rows are loaded once and looked up with a dict probe.
+
+WordClassificationIndexService polls a version counter of the table (WordClassification.get_classification_version)
+and patches the index with the words written since the last check, so edits from any process show up within
+WORD_CLASSIFICATION_REFRESH_INTERVAL seconds; writes through WordClassificationService are applied immediately.
+'''
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 10  # seconds
+
+WordClassificationRow = namedtuple('WordClassificationRow', ['word', 'classification'])
+
+_word_char = re.compile(r'\w')
+
+
+def _is_word_char(text, idx):
+    return 0 <= idx < len(text) and bool(_word_char.match(text[idx]))
+
+
+def _is_boundary(text, idx):
+    return _is_word_char(text, idx - 1) != _is_word_char(text, idx)
+
+
+def get_match_keys(word):
+    '''
+    The tokens matching word in WordClassification.find_word_classification, ie. the t for which
+    r"^{t}(''[a-zA-Z])?\\y" matches word: every prefix of word that ends at a word boundary, or that is followed by
+    '' and a letter ending at a word boundary.
+    @:param word The lower case word
+    '''
+    keys = []
+    for idx in range(1, len(word) + 1):
+        if _is_boundary(word, idx) or (word.startswith("''", idx) and idx + 2 < len(word) and
+                                       word[idx + 2].isascii() and word[idx + 2].isalpha() and
+                                       _is_boundary(word, idx + 3)):
+            keys.append(word[:idx])
+    return keys
+
+
+def _to_rows(results):
+    rows = {}
+    for result in results:
+        row = WordClassificationRow(result.word, sys.intern(result.classification))
+        word_rows = rows.setdefault(result.word.lower(), [])
+        if row not in word_rows:
+            word_rows.append(row)
+    return {word: tuple(word_rows) for word, word_rows in rows.items()}
+
+
+class WordClassificationIndex(object):
+    '''
+    Immutable snapshot of the active word classifications.
+    Rows are keyed by their lower case word; the few words that also match shorter tokens (eg. "real estate" for
+    "real") are listed under those tokens in a second, much smaller dict.
+    '''
+
+    @property
+    def version(self):
+        return self._version
+
+    def __init__(self, version, rows):
+        '''
+        @:param rows A dict of lower case word to its WordClassificationRow tuple
+        '''
+        self._version = version
+        self._rows = rows
+
+        prefixes = {}
+        for word in rows:
+            for key in get_match_keys(word):
+                if key != word:
+                    prefixes.setdefault(key, []).append(word)
+        self._prefixes = {key: tuple(sorted(words)) for key, words in prefixes.items()}
+
+    def __len__(self):
+        return len(self._rows)
+
+    '''
+    @:return The classification rows of word, like WordClassification.find_word_classification(word)
+    '''
+    def find(self, word):
+        word = word.lower()
+        # A word only matches itself if it ends at a word boundary, see get_match_keys
+        rows = list(self._rows.get(word, ())) if _is_boundary(word, len(word)) else []
+        for prefixed_word in self._prefixes.get(word, ()):
+            rows.extend(self._rows[prefixed_word])
+        return rows
+
+    def find_many(self, words):
+        classifications = {}
+        for word in words:
+            rows = self.find(word)
+            if rows:
+                classifications[word] = rows
+        return classifications
+
+    def patch(self, rows, version=None):
+        '''
+        @:param rows A dict of lower case word to its current WordClassificationRow tuple, empty if it has none
+        @:return A new index with the rows of those words replaced
+        '''
+        patched_rows = dict(self._rows)
+        for word, word_rows in rows.items():
+            if word_rows:
+                patched_rows[word] = tuple(word_rows)
+            else:
+                patched_rows.pop(word, None)
+
+        return WordClassificationIndex(version if version is not None else self._version, patched_rows)
+
+
+class WordClassificationIndexService(RefreshService):
+    '''
+    Holds the current WordClassificationIndex of the process, see the module docstring and namex.utils.refresh.
+    The index is only used once it is loaded, until then (or when the refresh is disabled) lookups go to the database.
+    '''
+
+    refresh_name = 'word-classification-refresh'
+    refresh_description = 'word classification index'
+
+    @property
+    def version(self):
+        return self._index.version if self._index else None
+
+    def __init__(self):
+        super().__init__()
+        self._app = None
+        self._index = None
+
+    def init_app(self, app):
+        self._app = app
+        self._refresh_interval = int(app.config.get('WORD_CLASSIFICATION_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+
+        if self._refresh_interval > 0:
+            self.start_refresh()
+
+    def get(self):
+        if self._refresh_interval <= 0:
+            return None
+
+        self._check_refresh()
+
+        return self._index
+
+    def load(self):
+        with self._app_context():
+            version = WordClassification.get_classification_version()
+            index = WordClassificationIndex(version, _to_rows(WordClassification.find_all_word_classifications()))
+
+        with self._lock:
+            self._index = index
+
+        logger.info('Loaded %d word classifications, version %s', len(index), version)
+        return index
+
+    def refresh(self):
+        '''
+        Bring the index up to date with the word_classification table.
+        Words written since the last check are re-read; it is reloaded in full when rows were deleted or the day changed,
+        as rows may have become active or inactive without being written.
+        @:return True if the index changed
+        '''
+        index = self._index
+        if index is None:
+            self.load()
+            return True
+
+        with self._app_context():
+            version = WordClassification.get_classification_version()
+            if version == index.version:
+                return False
+
+            count, max_id, last_updated, today = index.version
+            if version.today != today or last_updated is None:
+                self.load()
+                return True
+
+            updated = WordClassification.find_updated_words(last_updated)
+            inserted = len([updated_id for updated_id, _ in updated if updated_id > (max_id or 0)])
+            if version.count != count + inserted:
+                self.load()
+                return True
+
+            self._patch({word for _, word in updated}, version)
+
+        return True
+
+    def invalidate(self, words):
+        '''
+        Re-read the classifications of words after writing them, so this process doesn't wait for the next refresh.
+        '''
+        if self._index is None:
+            return
+
+        with self._app_context():
+            self._patch({word.lower() for word in words})
+
+    def _patch(self, words, version=None):
+        rows = dict.fromkeys(words, ())
+        rows.update(_to_rows(WordClassification.find_words_classification_exact(words)))
+
+        with self._lock:
+            self._index = self._index.patch(rows, version)
+
+    def _app_context(self):
+        # Quart app contexts are async, the auto-analyze service binds the db to its app instead (db.app)
+        return nullcontext() if db.app is not None else self._app.app_context()
+
+
+word_classification_index_service = WordClassificationIndexService()
@@ -0,0 +1,234 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Timeout
+from urllib3.util.retry import Retry
+
+'''
+Shared, keep-alive HTTP connections for the calls to the other services: auto-analyze, the synonyms API (requests and
+the generated swagger_client) and Solr.
+A name analysis makes dozens of these calls; module level requests.get / post and a new SynonymsApi() open a new
+connection for each of them. HttpSessionService holds one session per process instead, with a connection pool per host,
+default timeouts, retries with a jittered backoff and a latency histogram per target host (see get_metrics).
+'''
+
+DEFAULT_CONNECT_TIMEOUT = 3.05  # seconds
+DEFAULT_READ_TIMEOUT = 30  # seconds
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.2  # seconds, doubled on each retry
+DEFAULT_POOL_SIZE = 10  # connections kept per host
+
+# Upper bounds, in seconds, of the latency histogram buckets, the last bucket counts the slower calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class JitterRetry(Retry):
+    '''
+    Retry with "full jitter", a random wait up to the exponential backoff, so clients failing together don't retry
+    together.
+    '''
+
+    def get_backoff_time(self):
+        backoff = super(JitterRetry, self).get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+class LatencyHistogram(object):
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._errors = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, seconds, error=False):
+        idx = 0
+        while idx < len(self._buckets) and seconds > self._buckets[idx]:
+            idx += 1
+        self._counts[idx] += 1
+        self._count += 1
+        self._errors += 1 if error else 0
+        self._sum += seconds
+        self._max = max(self._max, seconds)
+
+    def as_dict(self):
+        buckets = {'le_{}'.format(bucket): count for bucket, count in zip(self._buckets, self._counts)}
+        buckets['le_inf'] = self._counts[-1]
+        return {
+            'count': self._count,
+            'errors': self._errors,
+            'sumSeconds': round(self._sum, 3),
+            'maxSeconds': round(self._max, 3),
+            'buckets': buckets
+        }
+
+
+class HttpMetrics(object):
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, target, seconds, error=False):
+        with self._lock:
+            histogram = self._histograms.get(target)
+            if histogram is None:
+                histogram = self._histograms[target] = LatencyHistogram()
+            histogram.observe(seconds, error)
+
+    def as_dict(self):
+        with self._lock:
+            return {target: histogram.as_dict() for target, histogram in self._histograms.items()}
+
+
+def get_target(url):
+    return urlparse(url).netloc
+
+
+class HttpSession(requests.Session):
+    '''
+    A requests session with a connection pool per host, default timeouts and retries, that times every call.
+    Connection errors are retried for every method; read errors and 502, 503, 504 answers only for idempotent ones.
+    '''
+
+    def __init__(self, timeout, retry, pool_size, metrics):
+        super(HttpSession, self).__init__()
+        self._timeout = timeout
+        self._metrics = metrics
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self._timeout
+
+        start = time.monotonic()
+        error = True
+        try:
+            response = super(HttpSession, self).request(method, url, *args, **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            self._metrics.observe(get_target(url), time.monotonic() - start, error)
+
+
+class HttpSessionService(object):
+    '''
+    Holds the HttpSession and the swagger_client ApiClient of the process.
+    Connections can't be shared with forked processes (eg. the gunicorn or auto-analyze workers), each process creates
+    its own on first use.
+    '''
+
+    def __init__(self):
+        self._connect_timeout = DEFAULT_CONNECT_TIMEOUT
+        self._read_timeout = DEFAULT_READ_TIMEOUT
+        self._retries = DEFAULT_RETRIES
+        self._retry_backoff = DEFAULT_RETRY_BACKOFF
+        self._pool_size = DEFAULT_POOL_SIZE
+        self._metrics = HttpMetrics()
+        self._lock = threading.Lock()
+        self._session = None
+        self._api_client = None
+        self._pid = None
+
+    def init_app(self, app):
+        self._connect_timeout = float(app.config.get('HTTP_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT))
+        self._read_timeout = float(app.config.get('HTTP_READ_TIMEOUT', DEFAULT_READ_TIMEOUT))
+        self._retries = int(app.config.get('HTTP_RETRIES', DEFAULT_RETRIES))
+        self._retry_backoff = float(app.config.get('HTTP_RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF))
+        self._pool_size = int(app.config.get('HTTP_POOL_SIZE', DEFAULT_POOL_SIZE))
+
+        with self._lock:
+            self._session = None
+            self._api_client = None
+
+    def get_session(self):
+        self._check_pid()
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = HttpSession((self._connect_timeout, self._read_timeout), self._get_retry(),
+                                                self._pool_size, self._metrics)
+                session = self._session
+        return session
+
+    def get_api_client(self):
+        '''
+        @:return The ApiClient to create the swagger_client APIs with, eg. SynonymsApi(api_client)
+        '''
+        self._check_pid()
+        api_client = self._api_client
+        if api_client is None:
+            with self._lock:
+                if self._api_client is None:
+                    self._api_client = self._create_api_client()
+                api_client = self._api_client
+        return api_client
+
+    def get_metrics(self):
+        return {
+            'connectTimeout': self._connect_timeout,
+            'readTimeout': self._read_timeout,
+            'retries': self._retries,
+            'retryBackoff': self._retry_backoff,
+            'poolSize': self._pool_size,
+            'targets': self._metrics.as_dict()
+        }
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._session = None
+                    self._api_client = None
+                    self._metrics = HttpMetrics()
+
+    def _get_retry(self):
+        return JitterRetry(total=self._retries, connect=self._retries, read=self._retries, status=self._retries,
+                           backoff_factor=self._retry_backoff, status_forcelist=(502, 503, 504),
+                           raise_on_status=False)
+
+    def _create_api_client(self):
+        from swagger_client.api_client import ApiClient
+
+        api_client = ApiClient()
+        target = get_target(api_client.configuration.host)
+        pool_manager = api_client.rest_client.pool_manager
+        urlopen = pool_manager.urlopen
+        retry = self._get_retry()
+        timeout = Timeout(connect=self._connect_timeout, read=self._read_timeout)
+        metrics = self._metrics
+
+        # The generated client doesn't take retries nor a default timeout, set them on each call of its pool
+        def timed_urlopen(method, url, *args, **kwargs):
+            kwargs.setdefault('retries', retry)
+            if kwargs.get('timeout') is None:
+                kwargs['timeout'] = timeout
+
+            start = time.monotonic()
+            error = True
+            try:
+                response = urlopen(method, url, *args, **kwargs)
+                error = response.status >= 500
+                return response
+            finally:
+                metrics.observe(target, time.monotonic() - start, error)
+
+        pool_manager.urlopen = timed_urlopen
+        return api_client
+
+
+http_session_service = HttpSessionService()
+
+
+def get_session():
+    return http_session_service.get_session()
@@ -0,0 +1,78 @@
+import re
+from collections import deque
+
+'''
+Aho-Corasick multi-keyword matcher.
+Finds every occurrence of any of the keywords in a single pass over the text, instead of running one regex per keyword.
+Build it once per keyword list and reuse it, building the automaton is the expensive part.
+'''
+
+_word_char = re.compile(r'\w')
+
+
+def _is_word_char(text, idx):
+    return 0 <= idx < len(text) and bool(_word_char.match(text[idx]))
+
+
+class KeywordMatcher(object):
+    def __init__(self, keywords):
+        self._keywords = [keyword for keyword in dict.fromkeys(keywords) if keyword]
+
+        # goto[state] maps a character to the next state, output[state] lists the keywords ending in that state
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for keyword in self._keywords:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(keyword)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @property
+    def keywords(self):
+        return list(self._keywords)
+
+    '''
+    Yield (start, keyword) for every occurrence of a keyword in text, overlapping occurrences included.
+    '''
+    def iter_matches(self, text):
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for idx, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                yield idx - len(keyword) + 1, keyword
+
+    '''
+    Yield (start, keyword) for the occurrences that are a whole word, ie. where r'\b{keyword}\b' would match.
+    '''
+    def iter_word_matches(self, text):
+        for start, keyword in self.iter_matches(text):
+            end = start + len(keyword)
+            if _is_word_char(text, start - 1) != _is_word_char(text, start) and \
+                    _is_word_char(text, end - 1) != _is_word_char(text, end):
+                yield start, keyword
+
+    def contains_word(self, text):
+        return next(self.iter_word_matches(text), None) is not None
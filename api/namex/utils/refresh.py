@@ -0,0 +1,68 @@
+import abc
+import logging
+import os
+import threading
+
+'''
+Background refresh of the in-process indexes and snapshots (restricted words, word classifications, name processing
+reference data, the conflict corpus).
+Each service calls refresh() from a daemon thread every refresh interval seconds. The data they hold is never mutated;
+a refresh builds a new copy and swaps the reference, so readers never need a lock.
+'''
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshService(abc.ABC):
+    '''
+    Base of the services refreshed in the background, subclasses implement refresh().
+    The thread is started by start_refresh, a refresh interval of 0 disables it.
+    '''
+
+    # Name of the refresh thread and what the failures are logged as
+    refresh_name = 'refresh'
+    refresh_description = 'data'
+
+    def __init__(self):
+        self._refresh_interval = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+        self._pid = None
+
+    @abc.abstractmethod
+    def refresh(self):
+        return None
+
+    def start_refresh(self):
+        with self._lock:
+            if self._pid == os.getpid() and self._refresh_thread and self._refresh_thread.is_alive():
+                return
+
+            self._pid = os.getpid()
+            self._stop_event = threading.Event()
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, args=(self._stop_event,),
+                                                    name=self.refresh_name, daemon=True)
+            self._refresh_thread.start()
+
+    def stop_refresh(self):
+        self._stop_event.set()
+
+    def _check_refresh(self):
+        # The refresh thread doesn't survive a fork (the gunicorn workers, the auto-analyze scoring workers),
+        # restart it in the child
+        if self._pid != os.getpid():
+            self.start_refresh()
+
+    def _refresh_failed(self, err):
+        logger.error('Refreshing the %s failed: %s', self.refresh_description, repr(err))
+
+    def _refresh_loop(self, stop_event):
+        while True:
+            try:
+                self.refresh()
+            except Exception as err:
+                self._refresh_failed(err)
+
+            if stop_event.wait(self._refresh_interval):
+                break
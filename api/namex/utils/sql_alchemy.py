@@ -1,6 +1,22 @@
 """
 SQL Alchemy utils.
 """
+import base64
+import binascii
+import datetime
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from sqlalchemy import and_, false, func, or_
+from sqlalchemy.engine import Engine
+
+COUNT_WORKERS = 4
+
+_count_executor = None
+_count_pid = None
+_count_lock = threading.Lock()
 
 
 def query_result_to_dict(key, values):
@@ -9,3 +25,88 @@ def query_result_to_dict(key, values):
     :return:
     """
     return dict(zip(key, values))
+
+
+def encode_cursor(values):
+    """
+    Opaque keyset pagination cursor, the values of the order by columns of the last row of a page
+    :return: a url safe string
+    """
+    def default(value):
+        return value.isoformat() if isinstance(value, (datetime.date, datetime.time)) else str(value)
+
+    return base64.urlsafe_b64encode(json.dumps(values, default=default).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    :return: the values encoded by encode_cursor
+    :raises ValueError: if cursor wasn't made by encode_cursor
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (TypeError, UnicodeError, binascii.Error, json.JSONDecodeError) as err:
+        raise ValueError('not a valid cursor: {}'.format(err))
+    if not isinstance(values, list):
+        raise ValueError('not a valid cursor')
+    return values
+
+
+def get_keyset_filter(order_by, values):
+    """
+    Filter on the rows after the row of values, in an ORDER BY of columns NULLS LAST
+    :param order_by: the (column, 'asc' or 'desc') of the ORDER BY, the last ones have to make it unique
+    :param values: the values of the columns of the last row of the previous page
+    :return: a filter for Query.filter
+    """
+    after = []
+    for idx, ((column, direction), value) in enumerate(zip(order_by, values)):
+        # NULLS LAST, nothing comes after a null but the other nulls
+        if value is None:
+            continue
+        after_value = column > value if direction == 'asc' else column < value
+        equal_before = [prev_column.is_(None) if prev_value is None else prev_column == prev_value
+                        for (prev_column, _), prev_value in zip(order_by[:idx], values[:idx])]
+        after.append(and_(*equal_before, or_(after_value, column.is_(None))))
+
+    return or_(*after) if after else false()
+
+
+def count_rows(bind, statement, estimate=False):
+    """
+    Count the rows of a select
+    :param bind: the engine or connection of the session
+    :param estimate: use the planner estimate of the rows, EXPLAIN doesn't run the query
+    :return: the number of rows
+    """
+    with bind.connect() as connection:
+        if not estimate:
+            return connection.execute(statement.with_only_columns([func.count()]).order_by(None)).scalar()
+
+        compiled = statement.order_by(None).compile(dialect=connection.dialect)
+        plan = connection.execute('EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+def submit_count(bind, statement, estimate=False):
+    """
+    Start count_rows on a thread of the process and a connection of its own, so it runs next to the query of the rows.
+    A session bound to a connection (eg. the transaction of a test) is counted right away, its rows may not be seen
+    from another connection and a connection can't be shared with another thread.
+    :return: a Future of the number of rows
+    """
+    global _count_executor, _count_pid
+
+    if not isinstance(bind, Engine):
+        future = Future()
+        future.set_result(count_rows(bind, statement, estimate))
+        return future
+
+    # threads don't survive a fork (eg. the gunicorn workers)
+    with _count_lock:
+        if _count_executor is None or _count_pid != os.getpid():
+            _count_executor = ThreadPoolExecutor(max_workers=COUNT_WORKERS, thread_name_prefix='sql-count')
+            _count_pid = os.getpid()
+        executor = _count_executor
+
+    return executor.submit(count_rows, bind, statement, estimate)
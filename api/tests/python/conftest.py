@@ -74,7 +74,10 @@ def db(app, request):
     Drops all existing tables - Meta follows Postgres FKs
     """
     with app.app_context():
-        # Clear out any existing tables
+        # Clear out any existing tables, and the materialized views depending on them
+        for (view,) in _db.engine.execute(text("SELECT matviewname FROM pg_matviews WHERE schemaname='public'")).fetchall():
+            _db.engine.execute(text('DROP MATERIALIZED VIEW IF EXISTS public.%s CASCADE' % view))
+
         metadata = MetaData(_db.engine)
         metadata.reflect()
         for table in metadata.tables.values():
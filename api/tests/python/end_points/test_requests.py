@@ -399,3 +399,88 @@ def test_comment_where_no_comment(client, jwt, app):
     new_comment= None
     rv = client.post('/api/v1/requests/NR%200000002/comments', data=json.dumps(new_comment), headers=headers)
     assert 400 == rv.status_code
+
+
+def test_search_pages_with_a_cursor(client, jwt, app):
+    from namex.models import Request as RequestDAO, State
+    for i in range(1, 6):
+        nr = RequestDAO()
+        nr.nrNum = 'NR {0:07d}'.format(i)
+        nr.stateCd = State.DRAFT
+        nr._source = 'NRO'
+        nr.save_to_db()
+
+    token = jwt.create_jwt(claims, token_header)
+    headers = {'Authorization': 'Bearer ' + token}
+
+    nr_nums = []
+    cursor = ''
+    for _ in range(3):
+        rv = client.get('/api/v1/requests?queue=DRAFT&rows=2&order=nrNum:asc&cursor=' + cursor, headers=headers)
+        assert 200 == rv.status_code
+        data = json.loads(rv.data)
+        assert 5 == data['response']['numFound']
+        nr_nums.extend(nr['nrNum'] for nr in data['nameRequests'])
+        cursor = data['response']['nextCursor'] or ''
+
+    assert ['NR {0:07d}'.format(i) for i in range(1, 6)] == nr_nums
+    assert '' == cursor
+
+
+def test_search_pages_by_comp_name_with_a_cursor(client, jwt, app):
+    from namex.models import Request as RequestDAO, Name as NameDAO, State
+    for i in range(1, 6):
+        nr = RequestDAO()
+        nr.nrNum = 'NR {0:07d}'.format(i)
+        nr.stateCd = State.DRAFT
+        nr._source = 'NRO'
+        names = []
+        # the first NR matches on two of its names
+        for choice in range(1, 3 if i == 1 else 2):
+            name = NameDAO()
+            name.choice = choice
+            name.name = 'ACME {} {} LTD.'.format(i, choice)
+            names.append(name)
+        nr.names = names
+        nr.save_to_db()
+
+    token = jwt.create_jwt(claims, token_header)
+    headers = {'Authorization': 'Bearer ' + token}
+
+    rv = client.get('/api/v1/requests?queue=DRAFT&compName=acme&rows=2&order=nrNum:asc', headers=headers)
+    assert 200 == rv.status_code
+    data = json.loads(rv.data)
+    assert 0 == data['response']['start']
+    assert 5 == data['response']['numFound']
+    pages = [[nr['nrNum'] for nr in data['nameRequests']]]
+    cursor = data['response']['nextCursor']
+    while cursor:
+        rv = client.get('/api/v1/requests?queue=DRAFT&compName=acme&rows=2&order=nrNum:asc&cursor=' + cursor,
+                        headers=headers)
+        assert 200 == rv.status_code
+        data = json.loads(rv.data)
+        assert 'start' not in data['response']
+        pages.append([nr['nrNum'] for nr in data['nameRequests']])
+        cursor = data['response']['nextCursor']
+
+    assert [['NR 0000001', 'NR 0000002'], ['NR 0000003', 'NR 0000004'], ['NR 0000005']] == pages
+
+
+def test_search_estimated_count(client, jwt, app):
+    token = jwt.create_jwt(claims, token_header)
+    headers = {'Authorization': 'Bearer ' + token}
+
+    rv = client.get('/api/v1/requests?queue=DRAFT&count=estimate', headers=headers)
+    assert 200 == rv.status_code
+    assert 'estimate' == json.loads(rv.data)['response']['count']
+
+    rv = client.get('/api/v1/requests?queue=DRAFT&count=approximately', headers=headers)
+    assert 406 == rv.status_code
+
+
+def test_search_cursor_not_valid(client, jwt, app):
+    token = jwt.create_jwt(claims, token_header)
+    headers = {'Authorization': 'Bearer ' + token}
+
+    rv = client.get('/api/v1/requests?cursor=not-a-cursor', headers=headers)
+    assert 406 == rv.status_code
@@ -120,3 +120,32 @@ def test_name_update_via_save_to_db_method(session):
     assert name.conflict2_num == "A123456" # corp number conflicts should be unchanged
     assert name.conflict3_num in ("", None)
 
+
+
+def test_name_search_name(session):
+    """The search name is kept up to date by the database on insert and update."""
+
+    name = Name(name="G.O.O.L.D  Mountain-View Ltd.")
+    session.add(name)
+    session.commit()
+
+    assert name.searchName == "goldmountainviewltd"
+
+    name.name = "COFFEE & CO"
+    session.add(name)
+    session.commit()
+
+    assert name.searchName == "cofeco"
+
+
+def test_name_search_name_filter(session):
+    """The search name filter finds the names the interleaved word patterns find."""
+    from namex.models import Request
+
+    for test_name in ("G.O.O.L.D MINE LTD.", "MARIGOLD MINING INC.", "GO-LD MINES", "SILVER MINE LTD."):
+        session.add(Name(name=test_name))
+    session.commit()
+
+    names = Name.query.filter(Request.get_search_name_filter(['gold'])).order_by(Name.name).all()
+
+    assert [name.name for name in names] == ["G.O.O.L.D MINE LTD.", "GO-LD MINES", "MARIGOLD MINING INC."]
@@ -46,6 +46,53 @@ def test_get_queued_oldest_multirow(client, app):
     assert nr_first.nrNum == nr_oldest.nrNum
 
 
+def test_get_queued_oldest_skips_locked_requests(client, app):
+
+    # SETUP #####
+    # add NRs to database, committed: another connection can't see (or lock) the uncommitted rows of the test session
+    from datetime import datetime
+    from sqlalchemy import text
+    from namex.models import db, Request as RequestDAO, State, User
+
+    nr_nums = ['NR 0000001', 'NR 0000002']
+    test_session = db.session
+    db.session = db.create_scoped_session(options=dict(bind=db.engine, binds={}))
+    examiner = db.engine.connect()
+    try:
+        for day, nr_num in enumerate(nr_nums, start=1):
+            nr = RequestDAO()
+            nr.nrNum = nr_num
+            nr.stateCd = State.DRAFT
+            nr.submittedDate = datetime(2001, 8, day)
+            nr.save_to_db()
+
+        user = User(username='testUser', firstname='first', lastname='last', sub='idir/funcmunk', iss='keycloak')
+        user.save_to_db()
+
+        # another examiner holds the oldest NR
+        examiner_txn = examiner.begin()
+        examiner.execute(text('SELECT id FROM requests WHERE nr_num = :nr_num FOR UPDATE'), nr_num=nr_nums[0])
+
+        nr_oldest, new_req = RequestDAO.get_queued_oldest(user)
+
+        # Tests ####
+        assert nr_nums[1] == nr_oldest.nrNum
+        assert new_req
+        assert State.DRAFT == examiner.execute(text('SELECT state_cd FROM requests WHERE nr_num = :nr_num'),
+                                               nr_num=nr_nums[0]).scalar()
+        examiner_txn.rollback()
+
+    finally:
+        # Cleanup, the rows outlive the test transaction
+        examiner.close()
+        db.session.rollback()
+        db.session.query(RequestDAO).filter(RequestDAO.nrNum.in_(nr_nums)).delete(synchronize_session=False)
+        db.session.query(User).filter(User.username == 'testUser').delete(synchronize_session=False)
+        db.session.commit()
+        db.session.remove()
+        db.session = test_session
+
+
 def test_get_queued_empty_queue(client, app):
 
     # SETUP #####
@@ -58,3 +105,65 @@ def test_get_queued_empty_queue(client, app):
 
     with pytest.raises(BusinessException) as e_info:
         nr_oldest, new_req = RequestDAO.get_queued_oldest(user)
+
+
+def test_find_by_name_criteria(client, app):
+
+    # SETUP #####
+    # add NRs to the queue
+    from namex.constants import EntityTypes
+    from namex.models import Request as RequestDAO, Name, State
+    for idx, test_name in enumerate(['MOUNTAIN VIEW GROWERS LTD.', 'MOUNTAIN VIEW FOOD INC.', 'VALLEY FOOD INC.'],
+                                    start=1):
+        nr = RequestDAO()
+        nr.nrNum = 'NR {0:07d}'.format(idx)
+        nr.stateCd = State.DRAFT
+        nr.requestTypeCd = EntityTypes.CORPORATION.value
+        nr.names.append(Name(name=test_name, choice=1))
+        nr.save_to_db()
+
+    criteria = RequestDAO.get_general_query(queue=True)
+    name_criteria_list = []
+    for dist, desc in [(['mountain'], ['food']), (['mountain'], ['growers', 'grower']), (['lake'], ['food'])]:
+        name_criteria = RequestDAO.get_distinctive_query(dist, 'the', False)
+        name_criteria_list.append(([dist, desc], RequestDAO.get_descriptive_criteria(desc, name_criteria, criteria)))
+
+    matches = RequestDAO.find_by_name_criteria(criteria, name_criteria_list, queue=True)
+
+    # Tests ####
+    assert [[match.name for match in pattern_matches] for pattern_matches in matches] == \
+        [['MOUNTAIN VIEW FOOD INC.'], ['MOUNTAIN VIEW GROWERS LTD.'], []]
+
+
+def test_find_by_name_criteria_conflict_names(client, app, session):
+
+    # SETUP #####
+    # add NRs to the queue and refresh the conflict corpus
+    from sqlalchemy import text
+    from namex.constants import EntityTypes
+    from namex.models import Request as RequestDAO, ConflictName, Name, State
+    for idx, test_name in enumerate(['MOUNTAIN VIEW GROWERS LTD.', 'MOUNTAIN VIEW FOOD INC.'], start=1):
+        nr = RequestDAO()
+        nr.nrNum = 'NR {0:07d}'.format(idx)
+        nr.stateCd = State.DRAFT
+        nr.requestTypeCd = EntityTypes.CORPORATION.value
+        nr.names.append(Name(name=test_name, choice=1))
+        nr.save_to_db()
+
+    session.execute(text('REFRESH MATERIALIZED VIEW conflict_names'))
+
+    name_criteria = RequestDAO.get_distinctive_query(['mountain'], 'the', False)
+    criteria = ConflictName.get_general_query(queue=True)
+    name_criteria_list = [([['mountain'], ['food']],
+                           RequestDAO.get_descriptive_criteria(['food'], name_criteria, criteria))]
+    matches = RequestDAO.find_by_name_criteria(criteria, name_criteria_list, queue=True, names=ConflictName)
+
+    criteria = ConflictName.get_general_query()
+    name_criteria_list = [([['mountain'], ['food']],
+                           RequestDAO.get_descriptive_criteria(['food'], name_criteria, criteria))]
+    not_queued_matches = RequestDAO.find_by_name_criteria(criteria, name_criteria_list, names=ConflictName)
+
+    # Tests ####
+    assert [match.name for match in matches[0]] == ['MOUNTAIN VIEW FOOD INC.']
+    assert matches[0][0].nrNum == 'NR 0000002'
+    assert not_queued_matches == [[]]
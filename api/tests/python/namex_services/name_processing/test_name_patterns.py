@@ -0,0 +1,36 @@
+import re
+
+from namex.services.name_processing.name_patterns import get_exception_stop_words_designation, get_name_patterns
+
+
+def exception_designation_stop_word(stop_words, all_designations):
+    # The nested re.search scan that get_exception_stop_words_designation replaces
+    exceptions = [designation for word in stop_words for designation in all_designations
+                  if re.search(r'\b{0}\b'.format(word), designation)]
+    return exceptions if exceptions else ['null']
+
+
+def test_exception_stop_words_designation():
+    stop_words = ['and', 'the', 'of', 'et', 'co']
+    designations = ['limited liability company', 'ltd', 'co-op', 'cooperative', 'and company', 'société en nom et co']
+
+    exceptions = get_exception_stop_words_designation(stop_words, designations)
+
+    assert sorted(exceptions) == sorted(set(exception_designation_stop_word(stop_words, designations)))
+    assert exceptions == ['société en nom et co', 'and company', 'co-op']
+
+
+def test_exception_stop_words_designation_none():
+    assert get_exception_stop_words_designation(['and'], ['ltd', 'inc.']) == ['null']
+
+
+def test_name_patterns_are_cached_per_version():
+    stop_words = ['and', 'the']
+    designations = ['ltd', 'limited liability company']
+
+    patterns = get_name_patterns(stop_words, designations, version='v1')
+
+    assert get_name_patterns(stop_words, designations, version='v1') is patterns
+    assert get_name_patterns(stop_words, designations, version='v2') is not patterns
+    assert patterns.designation_all == ['limited liability company', 'ltd']
+    assert patterns.tokenize_rx.findall('acme limited liability company') == ['acme', 'limited liability company']
@@ -0,0 +1,56 @@
+from namex.services.name_processing.name_processing import NameProcessingService
+from namex.services.name_processing.reference_data import ReferenceData, ReferenceDataService
+
+
+def build_reference_data(version='v1'):
+    return ReferenceData(
+        version=version,
+        stop_words=['the', 'of'],
+        prefixes=['re', 'pre'],
+        number_words=['one', 'two'],
+        stand_alone_words=['holdings', 'ventures'],
+        eng_designated_end_words=['ltd', 'limited'],
+        eng_designated_any_words=['co-op'],
+        fr_designated_end_words=['ltee'],
+        fr_designated_any_words=['cooperative', 'co-op']
+    )
+
+
+def test_reference_data_getters_return_copies():
+    reference_data = build_reference_data()
+
+    stop_words = reference_data.get_stop_words()
+    stop_words.append('and')
+
+    assert reference_data.get_stop_words() == ['the', 'of']
+    assert reference_data.get_designated_end_words() == ['ltd', 'limited', 'ltee']
+    assert reference_data.get_designated_any_words() == ['co-op', 'cooperative', 'co-op']
+    assert reference_data.get_designated_all_words()[0] == 'cooperative'
+    assert sorted(reference_data.get_designated_all_words()) == ['co-op', 'cooperative', 'limited', 'ltd', 'ltee']
+
+
+def test_use_reference_data():
+    np_svc = NameProcessingService()
+    np_svc.use_reference_data(build_reference_data())
+
+    assert np_svc.get_stop_words() == ['the', 'of']
+    assert np_svc.get_prefixes() == ['re', 'pre']
+    assert np_svc.get_stand_alone_words() == ['holdings', 'ventures']
+    assert np_svc.get_designated_all_words() == build_reference_data().get_designated_all_words()
+
+
+def test_refresh_swaps_snapshot_on_new_version(monkeypatch):
+    svc = ReferenceDataService()
+    versions = iter(['v1', 'v1', 'v2'])
+
+    monkeypatch.setattr(svc, 'fetch_version', lambda: next(versions))
+    monkeypatch.setattr(svc, '_load', build_reference_data)
+
+    first = svc.get()
+    assert first.version == 'v1'
+
+    assert not svc.refresh()
+    assert svc.get() is first
+
+    assert svc.refresh()
+    assert svc.get().version == 'v2'
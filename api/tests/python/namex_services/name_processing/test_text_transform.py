@@ -0,0 +1,47 @@
+import pytest
+
+from namex.services.name_processing.text_transform import TextTransform
+
+all_designations = ['community contribution company', 'limited liability partnership',
+                    'unlimited liability company', 'limited liability company', 'limited liability co.',
+                    'limited partnership', 'co-operative', 'incorporated', 'corporation', 'cooperative',
+                    'liability', 'company', 'limited', 'l.l.c.', 'co-op', 'corp.', 'l.l.c', 'corp', 'ltd.', 'coop',
+                    'ulc.', 'inc.', 'ccc', 'co.', 'llc', 'ulc', 'ltd', 'inc', 'llp', 'co']
+prefix_list = ['un', 're', 'in', 'dis', 'en', 'non', 'in', 'over', 'mis', 'sub', 'pre', 'inter', 'fore', 'de',
+               'trans', 'super', 'semi', 'anti', 'mid', 'under', 'ante', 'bene', 'circum', 'co', 'com', 'con',
+               'col', 'dia', 'ex', 'homo', 'hyper', 'mal', 'micro', 'multi', 'para', 'poly', 'post', 'pro', 'retro',
+               'tele', 'therm', 'trans', 'uni']
+
+text_transform = TextTransform(all_designations, prefix_list)
+
+
+@pytest.mark.parametrize("name, expected",
+                         [
+                             ("TOBI.COM CANADA OPERATIONS LTD.", "TOBI CANADA OPERATIONS"),
+                             ("ONE AND 1,000 NIGHTS GROUP", "ONE AND 1000 NIGHTS GROUP"),
+                             ("MOUNTAIN VIEW INC. FOOD", "MOUNTAIN VIEW FOOD")
+                         ])
+def test_regex_remove_designations(name, expected):
+    assert text_transform.regex_remove_designations(name) == expected
+
+
+@pytest.mark.parametrize("name, exception_designation, expected",
+                         [
+                             ("MONTESSORI PRE-SCHOOL LTD.", ['null'], "MONTESSORI PRESCHOOL LTD."),
+                             ("HOME STAGING & RE-DESIGN INC.", ['null'], "HOME STAGING & REDESIGN INC."),
+                             ("DIS-DRESS BEAD & GIFT STORE LTD", ['null'], "DISDRESS BEAD & GIFT STORE LTD"),
+                             ("MOUNTAIN CO-OP", ['co-op'], "MOUNTAIN CO-OP")
+                         ])
+def test_regex_prefixes(name, exception_designation, expected):
+    assert text_transform.regex_prefixes(name, exception_designation) == expected
+
+
+@pytest.mark.parametrize("name, expected",
+                         [
+                             ("REYNOLD'S HAIR SALON LTD.", "REYNOLD HAIR SALON"),
+                             ("STONEWATER VENTURES (NO. 133) LTD.", "STONEWATER VENTURES"),
+                             ("4THGEN A.B.C. HOLDINGS INC.", "4TH GEN ABC HOLDINGS"),
+                             ("BLUE - BLUE SKY & SEA", "BLUE SKY SEA")
+                         ])
+def test_transform(name, expected):
+    assert text_transform.transform(name) == expected
@@ -0,0 +1,104 @@
+import json
+from collections import namedtuple
+from types import SimpleNamespace
+
+from namex.models import Request
+from namex.services.name_request.builders import name_analysis_builder
+from namex.services.name_request.builders.name_analysis_builder import NameAnalysisBuilder
+
+Match = namedtuple('Match', ['name', 'consumptionDate', 'submittedDate', 'corpNum', 'nrNum'])
+
+CHUNK_SIZE = 2
+
+
+class StreamResponse(object):
+    '''
+    The /stream response of auto-analyze for the names posted, in chunks of CHUNK_SIZE names in the order they were
+    posted. The server stops after the first chunk with an exact match.
+    '''
+
+    def __init__(self, names, scores):
+        self._names = names
+        self._scores = scores
+        self.chunks_read = 0
+
+    def __bool__(self):
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def iter_lines(self):
+        for start in range(0, len(self._names), CHUNK_SIZE):
+            chunk = [{name: self._scores[name]} for name in self._names[start:start + CHUNK_SIZE]]
+            self.chunks_read += 1
+            yield json.dumps({'result': chunk}).encode()
+            if any(score == 1.0 for result in chunk for score in result.values()):
+                break
+
+
+class StreamSession(object):
+    def __init__(self, scores):
+        self._scores = scores
+        self.response = None
+
+    def post(self, url, json, **kwargs):
+        self.response = StreamResponse(json['names'], self._scores)
+        return self.response
+
+
+def test_most_similar_names_stream_keeps_the_exact_match_tie_break(app, monkeypatch):
+    # Two exact matches, the one first in the request comes after the other one alphabetically
+    scores = {'ZEBRA HOLDINGS': 1.0, 'ACME HOLDINGS': 0.5, 'BETA HOLDINGS': 0.2, 'ALPHA HOLDINGS': 1.0,
+              'OMEGA HOLDINGS': 0.9, 'DELTA HOLDINGS': 0.1}
+    db_matches = [Match(name, None, None, None, 'NR {0:07d}'.format(i)) for i, name in enumerate(scores, start=1)]
+
+    session = StreamSession(scores)
+    monkeypatch.setattr(name_analysis_builder, 'get_session', lambda: session)
+    monkeypatch.setitem(app.config, 'AUTO_ANALYZE_URL', 'http://auto-analyze')
+    monkeypatch.setitem(app.config, 'AUTO_ANALYZE_STREAM', True)
+
+    director = SimpleNamespace(name_processing_service=None, word_classification_service=None,
+                               word_condition_service=None, synonym_service=None)
+    builder = NameAnalysisBuilder(director)
+    with app.app_context():
+        list_details, forced = builder.get_most_similar_names({}, db_matches, {}, {}, ['ALPHA', 'HOLDINGS'])
+
+    # The same winner as scoring every name and sorting them by (-score, name)
+    assert ['ALPHA HOLDINGS'] == [details['name'] for details in list_details]
+    assert forced
+    assert 1 == session.response.chunks_read
+
+
+def test_conflicts_db_descriptive_filters_add_up(app, monkeypatch):
+    food, growers, view = Match('MOUNTAIN FOOD GROWERS LTD.', None, None, None, 'NR 0000001'), \
+        Match('MOUNTAIN GROWERS LTD.', None, None, None, 'NR 0000002'), \
+        Match('MOUNTAIN VIEW LTD.', None, None, None, 'NR 0000003')
+    # The names matching each dist x desc combination on its own, in the order of the combinations
+    monkeypatch.setattr(Request, 'find_by_name_criteria',
+                        lambda criteria, name_criteria_list, queue=False, names=None: [[food, view], [food, growers]])
+
+    scored = []
+
+    def get_most_similar_names(dict_highest_counter, db_matches, dist_substitution_dict, desc_synonym_dict, list_name):
+        scored.append(sorted(match.name for match in db_matches))
+        return [], False
+
+    director = SimpleNamespace(name_processing_service=SimpleNamespace(get_stop_words=lambda: ['the']),
+                               word_classification_service=None, word_condition_service=None, synonym_service=None)
+    builder = NameAnalysisBuilder(director)
+    builder._list_processed_names = []
+    monkeypatch.setattr(builder, 'get_most_similar_names', get_most_similar_names)
+
+    searches = [(None, {'mountain': ['mountain']}, {'food': ['food'], 'growers': ['growers']}, {})]
+    with app.app_context():
+        list_details, forced = builder.get_conflicts_db(searches, {}, False, ['mountain', 'food', 'growers'], False,
+                                                        True)
+
+    # The growers combination also has the filter of food, and its name was scored with food already
+    assert [['MOUNTAIN FOOD GROWERS LTD.', 'MOUNTAIN VIEW LTD.'], []] == scored
+    assert not forced
+
@@ -1,4 +1,6 @@
-import urllib
+import json
+import os
+import time
 
 import pytest
 
@@ -60,11 +62,11 @@ def test_get_results_query_to_solr(mocker, monkeypatch, name, compresed_name, es
     # ACTUAL TEST
     #
 
-    # mock the urlopen call so that we can catch what is passed to it
+    # mock the session call so that we can catch what is passed to it
     # in the SolrQueries get_results method
-    mocker.patch('urllib.request.urlopen')
+    get_session = mocker.patch('namex.analytics.solr.get_session')
     response = SolrQueries.get_results(SolrQueries.CONFLICTS, name)
-    urllib.request.urlopen.assert_called_once_with(query)
+    get_session.return_value.get.assert_called_once_with(query)
 
 
 solr_get_synonym_test_data = [
@@ -84,3 +86,101 @@ def test_solr__get_synonyms_clause(monkeypatch, name, expected):
     print(syn)
 
     assert (SYNONYMS_PREFIX+'(' + expected + ')').upper() == syn.upper()
+
+
+def test_solr__get_all_keeps_the_query_order(app, monkeypatch):
+    class Connection:
+        def __init__(self, url):
+            self.url = url
+
+        def json(self):
+            return {'url': self.url}
+
+    def mock_solr__get(url):
+        # answer the first queries last
+        time.sleep(0.05 * (3 - int(url)))
+        return Connection(url)
+    monkeypatch.setattr(SolrQueries, '_get', mock_solr__get)
+
+    assert SolrQueries._get_all(['0', '1', '2', '3']) == [{'url': '0'}, {'url': '1'}, {'url': '2'}, {'url': '3'}]
+
+
+def test_solr__get_all_deadline(app, monkeypatch):
+    def mock_solr__get(url):
+        time.sleep(0.5)
+    monkeypatch.setattr(SolrQueries, '_get', mock_solr__get)
+    monkeypatch.setitem(app.config, 'SOLR_BUCKET_TIMEOUT', 0.1)
+
+    with pytest.raises(TimeoutError):
+        SolrQueries._get_all(['0', '1'])
+
+
+def test_solr__get_all_batched(app, mocker, monkeypatch):
+    monkeypatch.setitem(app.config, 'SOLR_BATCH_QUERIES', True)
+    monkeypatch.setitem(app.config, 'SOLR_BATCH_SIZE', 2)
+    select_url = 'http://solr/solr/possible.conflicts/select'
+
+    def mock_post(url, data):
+        stacks = [value for key, value in data if key == 'fl'][0].split(',')
+        doc = {}
+        for stack in stacks:
+            field = stack.split(':')[0]
+            doc[field] = {'numFound': 1, 'start': 0, 'docs': [{'name': dict(data)[field + '.q']}]}
+        connection = mocker.Mock()
+        connection.json.return_value = {'response': {'numFound': 1, 'docs': [doc]}}
+        return connection
+    get_session = mocker.patch('namex.analytics.solr.get_session')
+    get_session.return_value.post.side_effect = mock_post
+    get_session.return_value.get.return_value.json.return_value = {'response': {'docs': [{'name': 'name:"THREE"~1'}]}}
+
+    urls = [select_url + '?&q=name:%22{}%22~1&wt=json&hl=on&fq=a&fq=b'.format(name) for name in ['ONE', 'TWO', 'THREE']]
+    results = SolrQueries._get_all(urls)
+
+    assert [result['response']['docs'][0]['name'] for result in results] == ['name:"ONE"~1', 'name:"TWO"~1',
+                                                                            'name:"THREE"~1']
+    assert results[0]['responseHeader']['params'] == {'q': 'name:"ONE"~1', 'fq': ['a', 'b']}
+    # ONE and TWO are batched, THREE is sent alone
+    assert get_session.return_value.post.call_count == 1
+    assert get_session.return_value.get.call_count == 1
+
+
+# Solr answers of the stacks of a few searches (in the shape get_synonym_results & co. return them), with the output of
+# stack_conflict_results before it was rewritten to use sets
+with open(os.path.join(os.path.dirname(__file__), 'data', 'stacked_conflict_results.json')) as stacked_results_file:
+    stacked_results_test_data = json.load(stacked_results_file)
+
+
+@pytest.mark.parametrize("case", stacked_results_test_data)
+def test_solr_stack_conflict_results(app, case):
+    results = SolrQueries.stack_conflict_results(case['connections'], case['bucket'], case['list_name_split'],
+                                                 case['stemmed_words'], case['synonyms_for_word'])
+
+    assert json.loads(json.dumps(results)) == case['expected']
+
+
+def test_solr_post_treatment_keeps_the_phonetic_matches():
+    docs = [{'id': '1', 'source': 'CORP', 'name': 'Goldstream Electrical Ltd'},
+            {'id': '2', 'source': 'CORP', 'name': 'GOLDSTREAM HOLDINGS LTD'},
+            {'id': '1', 'source': 'CORP', 'name': 'Goldstream Electrical Ltd'},
+            {'id': '3', 'source': 'NR', 'name': 'COLDSTREAM ELECTRIC INC.'}]
+
+    names = SolrQueries.post_treatment(docs, 'goldsmiths electric')
+
+    assert names == [{'name': 'GOLDSTREAM ELECTRICAL LTD', 'id': '1', 'source': 'CORP', 'jurisdiction': '',
+                      'start_date': ''}]
+    assert SolrQueries.post_treatment(docs, 'GOLDSMITHS LTD') == []
+
+
+@pytest.mark.parametrize("start_str, expected", [
+    ('GOLDSMITHS', '&fq=%7B%21term%20f%3Dname_phonetic_key%7Dgo'),
+    ('QUEEN & ARMSTRONG LTD', '&fq=%7B%21term%20f%3Dname_phonetic_key%7Darmstr'
+                              '&fq=%7B%21term%20f%3Dname_phonetic_key%7Dkwee'),
+])
+def test_solr__get_phonetic_key_clause(app, monkeypatch, start_str, expected):
+    monkeypatch.setitem(app.config, 'SOLR_PHONETIC_KEY_FILTER', True)
+
+    assert SolrQueries._get_phonetic_key_clause(start_str) == expected
+
+    monkeypatch.setitem(app.config, 'SOLR_PHONETIC_KEY_FILTER', False)
+
+    assert SolrQueries._get_phonetic_key_clause(start_str) == ''
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from namex.services.exact_match.exact_match import ExactMatchService
+
+
+def get_service(ttl=10, size=10):
+    app = Flask(__name__)
+    app.config.update(SOLR_BASE_URL='http://solr', EXACT_MATCH_CACHE_TTL=ttl, EXACT_MATCH_CACHE_SIZE=size,
+                      EXACT_MATCH_TIMEOUT=5)
+    service = ExactMatchService()
+    service.init_app(app)
+    return service
+
+
+def get_doc(name, id='1'):
+    return {'name': name, 'id': id, 'source': 'CORP', 'start_date': '2020-12-01T00:00:00Z', 'jurisdiction': 'BC'}
+
+
+@pytest.fixture
+def solr(mocker):
+    get_session = mocker.patch('namex.services.exact_match.exact_match.get_session')
+    get = get_session.return_value.get
+    get.return_value.json.return_value = {'response': {'docs': [get_doc('BLUE HERON LTD')]}}
+    return get
+
+
+def test_lookups_of_the_same_normalized_query_are_cached(solr):
+    service = get_service()
+
+    names = service.lookup('Blue Heron*')
+
+    assert names == [get_doc('BLUE HERON LTD')]
+    assert service.lookup('BLUE HERON') is names
+    solr.assert_called_once_with('http://solr/solr/possible.conflicts/select?sow=false&df=name_exact_match&wt=json'
+                                 '&q=blue%20heron', timeout=5)
+
+
+def test_lookups_go_to_solr_without_ttl(solr):
+    service = get_service(ttl=0)
+
+    service.lookup('BLUE HERON')
+    service.lookup('BLUE HERON')
+
+    assert solr.call_count == 2
+
+
+def test_identical_lookups_in_flight_share_one_solr_call(solr):
+    service = get_service()
+    answered = threading.Event()
+    calls = []
+
+    def get(url, timeout):
+        calls.append(url)
+        answered.wait(5)
+        return solr.return_value
+
+    solr.side_effect = get
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.lookup('BLUE HERON'))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while service.get_metrics()['coalesced'] < 3:
+        time.sleep(0.01)
+    answered.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [[get_doc('BLUE HERON LTD')]] * 4
+
+
+def test_errors_are_not_cached(solr):
+    service = get_service()
+    solr.return_value.raise_for_status.side_effect = [Exception('Solr is down'), None]
+
+    with pytest.raises(Exception):
+        service.lookup('BLUE HERON')
+
+    assert service.lookup('BLUE HERON') == [get_doc('BLUE HERON LTD')]
+
+
+def test_deleted_docs_drop_the_lookups_that_answered_them(solr):
+    service = get_service()
+    service.lookup('BLUE HERON')
+    solr.return_value.json.return_value = {'response': {'docs': [get_doc('RED HERON LTD', id='2')]}}
+    service.lookup('RED HERON')
+
+    service.invalidate_doc('1')
+    solr.return_value.json.return_value = {'response': {'docs': []}}
+
+    assert service.lookup('BLUE HERON') == []
+    assert service.lookup('RED HERON') == [get_doc('RED HERON LTD', id='2')]
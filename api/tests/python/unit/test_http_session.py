@@ -0,0 +1,46 @@
+from urllib3.util.retry import Retry
+
+from namex.utils.http_session import HttpMetrics, HttpSessionService, JitterRetry, LatencyHistogram
+
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram(buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(0.5, error=True)
+    histogram.observe(2)
+
+    metrics = histogram.as_dict()
+    assert metrics['count'] == 4
+    assert metrics['errors'] == 1
+    assert metrics['maxSeconds'] == 2
+    assert metrics['buckets'] == {'le_0.1': 2, 'le_1': 1, 'le_inf': 1}
+
+
+def test_http_metrics_per_target():
+    metrics = HttpMetrics()
+    metrics.observe('solr:8983', 0.2)
+    metrics.observe('solr:8983', 0.3)
+    metrics.observe('synonyms-api', 0.1, error=True)
+
+    assert metrics.as_dict()['solr:8983']['count'] == 2
+    assert metrics.as_dict()['synonyms-api']['errors'] == 1
+
+
+def test_jitter_retry_backoff_is_bounded():
+    retry = JitterRetry(total=5, backoff_factor=0.5)
+    for _ in range(3):
+        retry = retry.increment(method='GET', url='/')
+
+    backoff = Retry.get_backoff_time(retry)
+    assert backoff > 0
+    for _ in range(100):
+        assert 0 <= retry.get_backoff_time() <= backoff
+
+
+def test_session_is_shared():
+    service = HttpSessionService()
+
+    session = service.get_session()
+    assert service.get_session() is session
+    assert session.adapters['https://'].max_retries.total == service.get_metrics()['retries']
@@ -0,0 +1,15 @@
+from namex.utils.keyword_matcher import KeywordMatcher
+
+
+def test_iter_matches_finds_overlapping_keywords():
+    matcher = KeywordMatcher(['he', 'she', 'his', 'hers'])
+
+    assert sorted(matcher.iter_matches('ushers')) == [(1, 'she'), (2, 'he'), (2, 'hers')]
+
+
+def test_iter_word_matches_uses_word_boundaries():
+    matcher = KeywordMatcher(['and', '&', 'co'])
+
+    assert list(matcher.iter_word_matches('sandy and co-op')) == [(6, 'and'), (10, 'co')]
+    assert list(matcher.iter_word_matches('a&w')) == [(1, '&')]
+    assert not matcher.contains_word('candor')
@@ -0,0 +1,21 @@
+import pytest
+
+from namex.analytics.phonetic import phonetic_key
+
+
+@pytest.mark.parametrize("word, expected", [
+    ('GOLDSMITHS', 'GO'),
+    ('COLDSTREAM', 'KO'),
+    ('ARMSTRONG', 'ARMSTR'),
+    ('QUEEN', 'KWEE'),
+    ('EXCEL', 'XKE'),
+    ('MACDONALD', 'MKDO'),
+    ('PHONE', 'FO'),
+    ('KNIGHT', 'NI'),
+    ('LIBERTY', 'LI'),
+    ('OYSTER', 'OIST'),
+    ('GAY', 'GA'),
+    ('&', ''),
+])
+def test_phonetic_key(word, expected):
+    assert phonetic_key(word) == expected
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from namex.utils.refresh import RefreshService
+
+
+class CountingRefreshService(RefreshService):
+    refresh_name = 'counting-refresh'
+
+    def __init__(self, refreshes):
+        super().__init__()
+        self._refresh_interval = 0.01
+        self.refreshes = refreshes
+        self.count = 0
+        self.failures = []
+        self.done = threading.Event()
+
+    def refresh(self):
+        self.count += 1
+        if self.count == self.refreshes:
+            self.done.set()
+        if self.count == 1:
+            raise ValueError('first refresh fails')
+        return True
+
+    def _refresh_failed(self, err):
+        self.failures.append(err)
+        super()._refresh_failed(err)
+
+
+def test_refresh_is_abstract():
+    with pytest.raises(TypeError):
+        RefreshService()
+
+
+def test_refresh_loop_keeps_going_after_a_failure():
+    svc = CountingRefreshService(refreshes=3)
+    svc.start_refresh()
+    try:
+        assert svc.done.wait(5)
+    finally:
+        svc.stop_refresh()
+
+    svc._refresh_thread.join(5)
+    assert not svc._refresh_thread.is_alive()
+    assert svc._refresh_thread.name == 'counting-refresh'
+    assert [str(err) for err in svc.failures] == ['first refresh fails']
+
+
+def test_start_refresh_restarts_the_thread_after_a_fork():
+    svc = CountingRefreshService(refreshes=1)
+    svc.start_refresh()
+    thread, stop_event = svc._refresh_thread, svc._stop_event
+
+    svc.start_refresh()
+    assert svc._refresh_thread is thread
+
+    # As seen from a forked child, the pid differs from the one the thread was started in
+    svc._pid = -1
+    svc._check_refresh()
+    try:
+        assert svc._refresh_thread is not thread
+    finally:
+        stop_event.set()
+        svc.stop_refresh()
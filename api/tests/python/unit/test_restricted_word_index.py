@@ -0,0 +1,44 @@
+from namex.services.restricted_words.restricted_word_index import RestrictedWordIndex, CONDITION_NOT_AVAILABLE
+
+
+def get_index():
+    words = [(1, 'dr'), (2, 'royal'), (3, 'bc royal'), (4, 'Doctor '), (5, 'royal')]
+    word_conditions = [(1, 10), (2, 20), (3, 20), (3, 30), (5, 40)]
+    conditions = [(10, 'Doctor', 'Y', 'Y', 'College of Physicians', 'Consent'),
+                  (20, 'Royal', 'N', 'N', None, 'Not allowed'),
+                  (30, 'BC', 'Y', 'N', None, None)]
+    return RestrictedWordIndex('v1', words, word_conditions, conditions)
+
+
+def test_find_whole_phrases_in_word_id_order():
+    index = get_index()
+
+    found = index.find(' BC ROYAL DR SERVICES ')
+
+    assert [word['word_info'] for word in found] == [
+        {'id': 1, 'phrase': 'DR'}, {'id': 2, 'phrase': 'ROYAL'}, {'id': 3, 'phrase': 'BC ROYAL'},
+        {'id': 5, 'phrase': 'ROYAL'}]
+    assert [cnd['id'] for cnd in found[2]['cnd_info']] == [20, 30]
+    assert found[0]['cnd_info'][0] == {'id': 10, 'text': 'Doctor', 'allow_use': 'Y', 'consent_required': 'Y',
+                                       'consenting_body': 'College of Physicians', 'instructions': 'Consent'}
+
+
+def test_find_ignores_partial_words():
+    index = get_index()
+
+    assert index.find(' DRY ROYALTY DOCTOR ') == [{'word_info': {'id': 4, 'phrase': 'DOCTOR '}, 'cnd_info': []}]
+    assert index.find('  ') == []
+
+
+def test_missing_condition_is_not_available():
+    index = get_index()
+
+    assert index.find(' ROYAL ')[1] == {'word_info': {'id': 5, 'phrase': 'ROYAL'}, 'cnd_info': CONDITION_NOT_AVAILABLE}
+
+
+def test_find_returns_copies():
+    index = get_index()
+
+    index.find(' DR ')[0]['cnd_info'][0]['text'] = 'changed'
+
+    assert index.find(' DR ')[0]['cnd_info'][0]['text'] == 'Doctor'
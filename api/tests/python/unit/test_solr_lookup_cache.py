@@ -0,0 +1,77 @@
+from flask import Flask
+
+from namex.analytics.solr_lookup_cache import SolrLookupCache
+
+
+def get_cache(ttl=300, size=10, solr_base_url=None, solr_synonyms_api_url=None):
+    app = Flask(__name__)
+    app.config.update(SOLR_BASE_URL=solr_base_url, SOLR_SYNONYMS_API_URL=solr_synonyms_api_url,
+                      SOLR_LOOKUP_CACHE_TTL=ttl, SOLR_LOOKUP_CACHE_SIZE=size, SOLR_CORE_RELOAD_CHECK_INTERVAL=0)
+    cache = SolrLookupCache()
+    cache.init_app(app)
+    return app, cache
+
+
+def test_lookups_are_shared_across_requests():
+    app, cache = get_cache()
+    loads = []
+
+    for _ in range(2):
+        with app.app_context():
+            assert cache.get(('synonym_list', 'gold'), lambda: loads.append('gold') or ('gold', 'golden')) == \
+                ('gold', 'golden')
+
+    assert loads == ['gold']
+
+
+def test_lookups_are_kept_for_the_request_only_without_ttl():
+    app, cache = get_cache(ttl=0)
+    loads = []
+
+    for _ in range(2):
+        with app.app_context():
+            cache.get(('synonyms_exist', 'gold'), lambda: loads.append('gold') or True)
+            cache.get(('synonyms_exist', 'gold'), lambda: loads.append('gold') or True)
+
+    assert loads == ['gold', 'gold']
+
+
+def test_least_recently_used_lookups_are_dropped():
+    _, cache = get_cache(size=2)
+
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: 10)
+    cache.get('c', lambda: 3)
+
+    assert cache.get('a', lambda: 10) == 1
+    assert cache.get('b', lambda: 20) == 20
+
+
+def test_lookups_are_dropped_when_the_core_is_reloaded(mocker):
+    _, cache = get_cache(solr_base_url='http://solr')
+    get_session = mocker.patch('namex.analytics.solr_lookup_cache.get_session')
+    status = get_session.return_value.get.return_value.json
+    status.return_value = {'status': {'possible.conflicts': {'startTime': '2020-12-01T00:00:00Z'}}}
+
+    assert cache.get('a', lambda: 1) == 1
+    assert cache.get('a', lambda: 2) == 1
+
+    status.return_value = {'status': {'possible.conflicts': {'startTime': '2020-12-02T00:00:00Z'}}}
+    assert cache.get('a', lambda: 3) == 3
+
+
+def test_synonyms_api_lookups_are_dropped_when_the_synonyms_change(mocker):
+    _, cache = get_cache(solr_synonyms_api_url='http://synonyms-api/api/v1')
+    get_session = mocker.patch('namex.analytics.solr_lookup_cache.get_session')
+    version = get_session.return_value.get.return_value.json
+    version.return_value = {'data': 'v1'}
+
+    assert cache.get(('synonym_list', 'gold'), lambda: ('gold',)) == ('gold',)
+    assert cache.get(('analysis', 'gold'), lambda: 1) == 1
+    assert cache.get(('synonym_list', 'gold'), lambda: ('gold', 'golden')) == ('gold',)
+    get_session.return_value.get.assert_called_with('http://synonyms-api/api/v1/synonyms/version')
+
+    version.return_value = {'data': 'v2'}
+    assert cache.get(('synonym_list', 'gold'), lambda: ('gold', 'golden')) == ('gold', 'golden')
+    assert cache.get(('analysis', 'gold'), lambda: 2) == 1
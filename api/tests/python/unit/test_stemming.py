@@ -0,0 +1,24 @@
+from nltk.stem import PorterStemmer
+
+from namex.utils.stemming import CachedStemmer
+
+
+def test_cached_stemmer_matches_porter_stemmer():
+    words = ['plumbing', 'plumbers', 'holdings', 'ventures', 'engineering', 'plumbing']
+    stemmer = CachedStemmer(maxsize=16)
+
+    assert stemmer.stem_many(words) == [PorterStemmer().stem(word) for word in words]
+
+    info = stemmer.cache_info()
+    assert info.misses == 5
+    assert info.hits == 1
+
+
+def test_cached_stemmer_is_bounded():
+    stemmer = CachedStemmer(maxsize=2)
+
+    assert stemmer.warm_up(['plumbing', 'holdings', 'ventures']) == 3
+    assert stemmer.cache_info().currsize == 2
+
+    stemmer.cache_clear()
+    assert stemmer.cache_info().currsize == 0
@@ -0,0 +1,31 @@
+from collections import namedtuple
+
+from namex.services.word_classification.token_classifier import TokenClassifier
+
+Row = namedtuple('Row', ['word', 'classification'])
+
+
+class FakeWordClassificationService(object):
+    def __init__(self, classifications):
+        self.classifications = classifications
+        self.calls = 0
+
+    def find_many(self, words):
+        self.calls += 1
+        return {word: self.classifications[word] for word in words if word in self.classifications}
+
+
+def test_classify_many_builds_the_lists_in_token_order():
+    svc = FakeWordClassificationService({
+        'KINGS': [Row('KINGS', 'DIST')],
+        'CONSTRUCTION': [Row('CONSTRUCTION', 'DESC ')],
+        'GOLD': [Row('GOLD', 'DESC'), Row('GOLD', 'DIST')]
+    })
+    token_classifier = TokenClassifier(svc)
+
+    token_classifier.name_tokens = ['GOLD', 'KINGS', 'ZZYZX', 'CONSTRUCTION']
+
+    assert svc.calls == 1
+    assert token_classifier.distinctive_word_tokens == ['gold', 'kings']
+    assert token_classifier.descriptive_word_tokens == ['gold', 'construction']
+    assert token_classifier.unclassified_word_tokens == ['zzyzx']
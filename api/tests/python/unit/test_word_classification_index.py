@@ -0,0 +1,47 @@
+from namex.services.word_classification.word_classification_index import WordClassificationIndex, \
+    WordClassificationRow, get_match_keys
+
+
+def get_index(*rows):
+    index_rows = {}
+    for word, classification in rows:
+        index_rows.setdefault(word.lower(), []).append(WordClassificationRow(word, classification))
+    return WordClassificationIndex('v1', {word: tuple(word_rows) for word, word_rows in index_rows.items()})
+
+
+def test_get_match_keys():
+    assert get_match_keys('gold') == ['gold']
+    assert get_match_keys('real estate') == ['real', 'real ', 'real estate']
+    assert get_match_keys("king''s") == ['king', "king''", "king''s"]
+    assert get_match_keys('co.') == ['co']
+
+
+def test_find_matches_like_the_word_classification_query():
+    index = get_index(('GOLD', 'DIST'), ('GOLD', 'DESC'), ('GOLDEN', 'DIST'), ('REAL ESTATE', 'DESC'), ('CO.', 'DESC'))
+
+    assert index.find('Gold') == [('GOLD', 'DIST'), ('GOLD', 'DESC')]
+    assert index.find('real') == [('REAL ESTATE', 'DESC')]
+    assert index.find('co') == [('CO.', 'DESC')]
+    assert index.find('co.') == []
+    assert index.find('gol') == []
+
+
+def test_find_many_leaves_out_unclassified_words():
+    index = get_index(('GOLD', 'DIST'), ('MINING', 'DESC'))
+
+    assert index.find_many(['GOLD', 'ZZYZX', 'MINING']) == {
+        'GOLD': [('GOLD', 'DIST')],
+        'MINING': [('MINING', 'DESC')]
+    }
+
+
+def test_patch_returns_a_new_index():
+    index = get_index(('GOLD', 'DIST'), ('MINING', 'DESC'))
+
+    patched = index.patch({'gold': (), 'silver': (WordClassificationRow('SILVER', 'DIST'),)}, 'v2')
+
+    assert patched.version == 'v2'
+    assert patched.find('gold') == []
+    assert patched.find('silver') == [('SILVER', 'DIST')]
+    assert patched.find('mining') == [('MINING', 'DESC')]
+    assert index.find('gold') == [('GOLD', 'DIST')]
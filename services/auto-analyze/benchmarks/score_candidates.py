@@ -0,0 +1,83 @@
+# Copyright © 2020 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the candidate scoring engine against the number of worker processes.
+
+Needs the same environment as the service (database and SOLR_SYNONYMS_API_URL). Run it from src:
+
+    python ../benchmarks/score_candidates.py --candidates 500 --workers 1 2 4 8
+
+Each pool size scores the same payload; the results are checked against the single process run.
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from auto_analyze.scoring import ScoringEngine
+from namex.services.name_processing.reference_data import reference_data_service
+
+
+DISTINCTIVE = ['ARMSTRONG', 'BLUE', 'CEDAR', 'DELTA', 'EAGLE', 'FRASER', 'GRANITE', 'HARBOUR', 'ISLAND', 'JADE',
+               'KOOTENAY', 'LIONS', 'MOUNTAIN', 'NORTHERN', 'OKANAGAN', 'PACIFIC', 'QUALITY', 'RAVEN', 'SUNSHINE',
+               'TIMBER']
+DESCRIPTIVE = ['BAKERY', 'CONSTRUCTION', 'CONSULTING', 'DESIGN', 'ENGINEERING', 'FITNESS', 'HOLDINGS', 'LANDSCAPING',
+               'PLUMBING', 'REALTY', 'ROOFING', 'SOFTWARE', 'TRANSPORT', 'TRAVEL', 'VENTURES']
+DESIGNATIONS = ['LTD.', 'INC.', 'CORP.']
+
+
+def get_payload(candidates: int) -> tuple:
+    """Return the names and the arguments of a request for ARMSTRONG PLUMBING LTD."""
+    names = [' '.join(words) for words in itertools.islice(
+        itertools.cycle(itertools.product(DISTINCTIVE, DESCRIPTIVE, DESIGNATIONS)), candidates)]
+    list_name = ['armstrong', 'plumbing']
+    list_dist = ['armstrong']
+    list_desc = ['plumbing']
+    dict_substitution = {'armstrong': ['armstrong']}
+    dict_synonyms = {'plumbing': ['plumbing', 'plumber', 'plumbers']}
+
+    return names, list_name, list_dist, list_desc, dict_substitution, dict_synonyms
+
+
+async def run(candidates: int, pool_sizes: list):
+    """Time the scoring of the payload for each pool size."""
+    names, *args = get_payload(candidates)
+    np_svc_prep_data = reference_data_service.get()
+
+    baseline = None
+    baseline_elapsed = None
+    for workers in pool_sizes:
+        engine = ScoringEngine(workers)
+        # Start the pool before timing it
+        await engine.score(names[:workers * 2], *args, np_svc_prep_data)
+
+        start = time.perf_counter()
+        result = await engine.score(names, *args, np_svc_prep_data)
+        elapsed = time.perf_counter() - start
+        engine.shutdown()
+
+        if baseline is None:
+            baseline, baseline_elapsed = result, elapsed
+        assert result == baseline, 'workers={0} returned a different result'.format(workers)
+
+        print('workers={0:>3}  candidates={1}  {2:8.2f}s  speedup={3:5.2f}x'.format(
+            workers, len(names), elapsed, baseline_elapsed / elapsed))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=500)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    arguments = parser.parse_args()
+
+    asyncio.get_event_loop().run_until_complete(run(arguments.candidates, arguments.workers))
@@ -16,17 +16,20 @@
 # Without this, Flask-SQLAlchemy may not work!
 # Thanks!
 import asyncio
+import json
 import os
 
 import config  # pylint: disable=wrong-import-order; # noqa: I001
 import quart.flask_patch
 from namex import models
 from namex.models import db, ma
-from namex.services.name_request.auto_analyse.protected_name_analysis import ProtectedNameAnalysisService
+from namex.services.name_processing.reference_data import reference_data_service
+from namex.services.word_classification.word_classification_index import word_classification_index_service
 from quart import Quart, jsonify, request
 
 
-from .analyzer import auto_analyze
+from .analyzer import EXACT_MATCH
+from .scoring import scoring_engine
 
 
 # Set config
@@ -42,6 +45,8 @@ async def create_app(run_mode):
         quart_app.config.from_object(config.CONFIGURATION[run_mode])
         db.init_app(quart_app)
         ma.init_app(quart_app)
+        reference_data_service.init_app(quart_app)
+        scoring_engine.init_app(quart_app)
     except Exception as err:
         quart_app.logger.debug(
             'Error creating application in auto-analyze service: {0}'.format(repr(err.with_traceback(None))))
@@ -75,15 +80,15 @@ def register_shellcontext(quart_app):
 loop = asyncio.get_event_loop()
 app = loop.run_until_complete(create_app(RUN_MODE))
 db.app = app  # Just set it, see if it works...
+# Loads the word classifications in the background, it needs db.app as Quart app contexts are async
+word_classification_index_service.init_app(app)
 
 
 @app.route('/', methods=['POST'])
 async def private_service():
     """Return the outcome of this private service call."""
-    name_analysis_service = ProtectedNameAnalysisService()
-    service = name_analysis_service
-    np_svc_prep_data = service.name_processing_service
-    np_svc_prep_data.prepare_data()
+    # Shared, immutable snapshot of the synonym-table reference data, refreshed in the background.
+    np_svc_prep_data = reference_data_service.get()
 
     json_data = await request.get_json()
     list_dist = json_data.get('list_dist')
@@ -95,12 +100,44 @@ async def private_service():
 
     app.logger.debug('Number of matches: {0}'.format(len(matches)))
 
-    result = await asyncio.gather(
-        *[auto_analyze(name, list_name, list_dist, list_desc, dict_substitution, dict_synonyms, np_svc_prep_data) for
-          name in matches]
-    )
+    result = await scoring_engine.score(matches, list_name, list_dist, list_desc, dict_substitution, dict_synonyms,
+                                        np_svc_prep_data)
     return jsonify(result=result)
 
 
+@app.route('/stream', methods=['POST'])
+async def private_service_stream():
+    """Stream the outcome of this private service call as NDJSON, one {"result": [...]} line per chunk of the names.
+
+    The request is the same as for /. Unless stop_on_exact_match is false, the stream ends after the first chunk with an
+    exact match; the remaining chunks are not scored either when the caller closes the connection.
+    """
+    np_svc_prep_data = reference_data_service.get()
+
+    json_data = await request.get_json()
+    list_dist = json_data.get('list_dist')
+    list_desc = json_data.get('list_desc')
+    list_name = json_data.get('list_name')
+    dict_substitution = json_data.get('dict_substitution')
+    dict_synonyms = json_data.get('dict_synonyms')
+    matches = json_data.get('names')
+    stop_on_exact_match = json_data.get('stop_on_exact_match', True)
+
+    app.logger.debug('Number of matches: {0}'.format(len(matches)))
+
+    async def stream_results():
+        results = scoring_engine.score_stream(matches, list_name, list_dist, list_desc, dict_substitution,
+                                              dict_synonyms, np_svc_prep_data)
+        try:
+            async for chunk_results in results:
+                yield (json.dumps({'result': chunk_results}) + '\n').encode()
+                if stop_on_exact_match and any(EXACT_MATCH in result.values() for result in chunk_results):
+                    break
+        finally:
+            await results.aclose()
+
+    return stream_results(), 200, {'Content-Type': 'application/x-ndjson'}
+
+
 if __name__ == '__main__':
     app.run(port=7000, host='localhost')
@@ -11,14 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Analyzes a single name."""
+"""Analyzes the candidate names of a request against the requested name."""
+import copy
 import itertools
 import logging
 import math
 import re
 from collections import Counter
+from typing import List, NamedTuple
 
-from namex.services.name_processing.name_processing import NameProcessingService
+import numpy as np
+from namex.services.name_processing.reference_data import ReferenceData
 from namex.services.name_request.auto_analyse.name_analysis_utils import (
     get_classification,
     get_flat_list,
@@ -28,16 +31,11 @@ from namex.services.name_request.auto_analyse.name_analysis_utils import (
 )
 from namex.services.name_request.auto_analyse.protected_name_analysis import ProtectedNameAnalysisService
 from namex.services.name_request.builders.name_analysis_builder import NameAnalysisBuilder
-from nltk.stem import PorterStemmer
-from swagger_client import SynonymsApi as SynonymService
+from namex.utils.stemming import porter
 
 
-porter = PorterStemmer()
-
-synonym_service = SynonymService()
-name_processing_service = NameProcessingService()
-name_analysis_service = ProtectedNameAnalysisService()
-builder = NameAnalysisBuilder(name_analysis_service)
+# Holds the API clients shared by every candidate analysed in this process, see new_analysis_service
+_process_service = None
 
 STEM_W = 0.85
 SUBS_W = 0.65
@@ -52,106 +50,253 @@ MINIMUM_SIMILARITY = 0.66
 HIGH_CONFLICT_RECORDS = 20
 
 
+def new_analysis_service() -> ProtectedNameAnalysisService:
+    """Return an analysis service that holds the state of a single candidate.
+
+    The synonym, word classification and condition clients are stateless, so they are created once per process and
+    shared. The classification lists and name tokens are written to the copy and its own NameProcessingService.
+    """
+    global _process_service  # pylint: disable=global-statement
+    if _process_service is None:
+        _process_service = ProtectedNameAnalysisService()
+
+    service = copy.copy(_process_service)
+    service.name_processing_service = copy.copy(_process_service.name_processing_service)
+    return service
+
+
+class Candidate(NamedTuple):
+    """A candidate name classified and ready to be scored against the request."""
+
+    name: str
+    service: ProtectedNameAnalysisService
+    list_dist: list
+    list_desc: list
+    dict_synonyms: dict
+    dist_substitution_dict: dict
+    stand_alone_words: list
+    exact_match: bool
+
+
 # ok deep function
-async def auto_analyze(name: str,  # pylint: disable=too-many-locals, too-many-arguments
+async def auto_analyze(name: str,  # pylint: disable=too-many-arguments
                        list_name: list, list_dist: list,
                        list_desc: list, dict_substitution: dict,
                        dict_synonyms: dict,
-                       np_svc_prep_data: name_analysis_service) -> dict:
+                       np_svc_prep_data: ReferenceData) -> dict:
     """Return a dictionary with name as key and similarity as value, 1.0 is an exact match."""
+    candidate = get_candidate(name, list_name, list_dist, list_desc, dict_substitution, dict_synonyms,
+                              np_svc_prep_data)
+    return score_candidates([candidate], list_name)[0]
+
+
+def get_candidate(name: str,  # pylint: disable=too-many-locals, too-many-arguments
+                  list_name: list, list_dist: list,
+                  list_desc: list, dict_substitution: dict,
+                  dict_synonyms: dict,
+                  np_svc_prep_data: ReferenceData) -> Candidate:
+    """Return the candidate name classified against the request, the API and DB calls of the analysis happen here."""
     logging.getLogger(__name__).debug(
         'name: %s ,  list_name %s,  list_dist: %s, list_desc: %s, dict_subst: %s,  dict_syns: %s',
         name, list_name, list_dist, list_desc, dict_substitution, dict_synonyms)
-    syn_svc = synonym_service
-    service = name_analysis_service
+    # The request lists are shared by all the candidates and are modified below, work on this candidate's own copy
+    list_dist = list(list_dist)
+    dict_synonyms = copy.deepcopy(dict_synonyms)
+
+    service = new_analysis_service()
+    builder = NameAnalysisBuilder(service)
+    syn_svc = service.synonym_service
     np_svc = service.name_processing_service
     wc_svc = service.word_classification_service
     token_svc = service.token_classifier_service
 
-    dict_matches_counter = {}
-
     np_svc.set_name(name, np_svc_prep_data)
     stand_alone_words = np_svc_prep_data.get_stand_alone_words()
 
     if np_svc.name_tokens == list_name:
-        similarity = EXACT_MATCH
-    else:
-        match_list = np_svc.name_tokens
-        get_classification(service, stand_alone_words, syn_svc, match_list, wc_svc, token_svc, True)
-
-        dist_db_substitution_dict = builder.get_substitutions_distinctive(service.get_list_dist())
-        service._list_dist_words, match_list, _ = remove_double_letters_list_dist_words(service.get_list_dist(),
-                                                                                        match_list)
-
-        desc_tmp_synonym_dict = builder.get_substitutions_descriptive(service.get_list_desc())
-        desc_tmp_synonym_dict = remove_extra_value(desc_tmp_synonym_dict, dict_synonyms)
-
-        # Update key in desc_db_synonym_dict
-        service._dict_desc_words_search_conflicts = stem_key_dictionary(  # pylint: disable=protected-access
-            desc_tmp_synonym_dict
-        )
-        service._dict_desc_words_search_conflicts = add_key_values(  # pylint: disable=protected-access
-            service.get_dict_desc_search_conflicts()
-        )
-        dict_synonyms = stem_key_dictionary(dict_synonyms)
-        dict_synonyms = add_key_values(dict_synonyms)
-
-        list_desc, dict_synonyms = remove_descriptive_same_category(dict_synonyms)
-
-        service._list_desc_words = list(  # pylint: disable=protected-access
-            service.get_dict_desc_search_conflicts().keys()
-        )
-
-        # Check if list_dist needs to be spplitted based on service.get_list_dist()
-        list_dist = get_split_compound(list_dist, service.get_list_dist())
-        service._list_dist_words = get_split_compound(  # pylint: disable=protected-access
-            service.get_list_dist(),
-            list_dist)
-
-        list_dist_stem = [porter.stem(word) for word in list_dist]
-        vector1_dist = text_to_vector(list_dist_stem)
-
-        vector2_dist, entropy_dist = get_vector(service.get_list_dist(), list_dist,
-                                                dist_db_substitution_dict, True)
-
-        if all(value == OTHER_W_DIST for value in vector2_dist.values()):
-            vector2_dist, entropy_dist, _ = check_compound_dist(list_dist=list(vector2_dist.keys()),
-                                                                list_desc=None,
-                                                                original_class_list=list_dist,
-                                                                class_subs_dict=dist_db_substitution_dict)
-
-        if not vector2_dist:
-            match_list_desc = list(service.get_list_desc())
-            match_list_dist_desc = service.get_list_dist() + match_list_desc[0:-1]
-            vector2_dist, entropy_dist, service._list_desc_words = check_compound_dist(
-                list_dist=match_list_dist_desc,
-                list_desc=service.get_list_desc(),
-                original_class_list=list_dist,
-                class_subs_dict=dict_synonyms)
-
-        similarity_dist = round(get_similarity(vector1_dist, vector2_dist, entropy_dist), 2)
-
-        list_desc_stem = [porter.stem(word) for word in list_desc]
-        vector1_desc = text_to_vector(list_desc_stem)
-
-        vector2_desc, entropy_desc = get_vector(
-            remove_spaces_list(service.get_list_desc()), list_desc,
-            service.get_dict_desc_search_conflicts())
-        similarity_desc = round(
-            get_similarity(vector1_desc, vector2_desc, entropy_desc), 2)
-
-        similarity = round((similarity_dist + similarity_desc) / 2, 2)
+        return Candidate(name, service, list_dist, list_desc, dict_synonyms, {}, stand_alone_words, True)
+
+    match_list = np_svc.name_tokens
+    get_classification(service, stand_alone_words, syn_svc, match_list, wc_svc, token_svc, True)
+
+    dist_db_substitution_dict = builder.get_substitutions_distinctive(service.get_list_dist())
+    service._list_dist_words, match_list, _ = remove_double_letters_list_dist_words(service.get_list_dist(),
+                                                                                    match_list)
+
+    desc_tmp_synonym_dict = builder.get_substitutions_descriptive(service.get_list_desc())
+    desc_tmp_synonym_dict = remove_extra_value(desc_tmp_synonym_dict, dict_synonyms)
+
+    # Update key in desc_db_synonym_dict
+    service._dict_desc_words_search_conflicts = stem_key_dictionary(  # pylint: disable=protected-access
+        desc_tmp_synonym_dict
+    )
+    service._dict_desc_words_search_conflicts = add_key_values(  # pylint: disable=protected-access
+        service.get_dict_desc_search_conflicts()
+    )
+    dict_synonyms = stem_key_dictionary(dict_synonyms)
+    dict_synonyms = add_key_values(dict_synonyms)
+
+    list_desc, dict_synonyms = remove_descriptive_same_category(dict_synonyms)
+
+    service._list_desc_words = list(  # pylint: disable=protected-access
+        service.get_dict_desc_search_conflicts().keys()
+    )
+
+    # Check if list_dist needs to be spplitted based on service.get_list_dist()
+    list_dist = get_split_compound(list_dist, service.get_list_dist())
+    service._list_dist_words = get_split_compound(  # pylint: disable=protected-access
+        service.get_list_dist(),
+        list_dist)
+
+    return Candidate(name, service, list_dist, list_desc, dict_synonyms, dist_db_substitution_dict, stand_alone_words,
+                     False)
+
+
+def score_candidates(candidates: List[Candidate], list_name: list) -> List[dict]:
+    """Return the auto_analyze result of each candidate, the similarities of all of them are computed in batches."""
+    scored = [candidate for candidate in candidates if not candidate.exact_match]
+
+    # The distinctive pass can move descriptive words of a candidate into a compound distinctive, so it runs first
+    similarities_dist = get_similarities(
+        scored,
+        lambda candidate: candidate.list_dist,
+        lambda candidate: candidate.service.get_list_dist(),
+        lambda candidate: candidate.dist_substitution_dict,
+        dist=True)
+    similarities_desc = get_similarities(
+        scored,
+        lambda candidate: candidate.list_desc,
+        lambda candidate: remove_spaces_list(candidate.service.get_list_desc()),
+        lambda candidate: candidate.service.get_dict_desc_search_conflicts())
+
+    similarities = {}
+    for idx, candidate in enumerate(scored):
+        similarity = round((similarities_dist[idx] + similarities_desc[idx]) / 2, 2)
         logging.getLogger(__name__).debug('similarity: %s', similarity)
+        similarities[id(candidate)] = similarity
+
+    results = []
+    for candidate in candidates:
+        similarity = EXACT_MATCH if candidate.exact_match else similarities[id(candidate)]
+
+        dict_matches_counter = {}
+        if similarity == EXACT_MATCH or (
+                similarity >= MINIMUM_SIMILARITY and not is_not_real_conflict(list_name,
+                                                                              candidate.stand_alone_words,
+                                                                              candidate.list_dist,
+                                                                              candidate.dict_synonyms,
+                                                                              candidate.service)):
+            dict_matches_counter.update({candidate.name: similarity})
+        results.append(dict_matches_counter)
+
+    return results
+
+
+def get_similarities(candidates, get_original_class_list, get_conflict_class_list, get_class_subs_dict, dist=False):
+    """Return the rounded distinctive (dist=True) or descriptive similarity of each candidate.
+
+    Candidates sharing the same request words are scored together with get_similarity_batch. A distinctive
+    vector with no match falls back to the compound distinctives of check_compound_dist, one candidate at a time.
+    """
+    similarities = [0.0] * len(candidates)
+
+    groups = {}
+    for idx, candidate in enumerate(candidates):
+        groups.setdefault(tuple(get_original_class_list(candidate)), []).append(idx)
+
+    for original_class_list, indexes in groups.items():
+        original_class_list = list(original_class_list)
+        vector1 = text_to_vector(porter.stem_many(original_class_list))
+
+        vocabulary, matches, entropy = get_vector_batch(
+            [get_conflict_class_list(candidates[idx]) for idx in indexes],
+            original_class_list,
+            [get_class_subs_dict(candidates[idx]) for idx in indexes],
+            dist)
+        batch_similarities = get_similarity_batch(vector1, vocabulary, matches, entropy)
+
+        for row, idx in enumerate(indexes):
+            if dist and not matches[row].any():
+                similarity = get_compound_dist_similarity(candidates[idx], vector1)
+            else:
+                similarity = float(batch_similarities[row])
+            similarities[idx] = round(similarity, 2)
+
+    return similarities
+
+
+def get_compound_dist_similarity(candidate, vector1_dist):
+    """Return the distinctive similarity of a candidate from its compound distinctives."""
+    service = candidate.service
+    match_list_desc = list(service.get_list_desc())
+    match_list_dist_desc = service.get_list_dist() + match_list_desc[0:-1]
+    vector2_dist, entropy_dist, service._list_desc_words = check_compound_dist(  # pylint: disable=protected-access
+        list_dist=match_list_dist_desc,
+        list_desc=service.get_list_desc(),
+        original_class_list=candidate.list_dist,
+        class_subs_dict=candidate.dict_synonyms)
+
+    return get_similarity(vector1_dist, vector2_dist, entropy_dist)
+
+
+def get_vector_batch(conflict_class_lists, original_class_list, class_subs_dicts, dist=False):
+    """Return get_vector of original_class_list against each conflict list, as arrays over a shared vocabulary.
+
+    vocabulary is the list of stems of original_class_list, matches[n, v] is True when vocabulary[v] is in the
+    vector of candidate n and entropy[n] is its entropy score. dist has no effect on the result, as in get_vector.
+    """
+    original_class_list = original_class_list if original_class_list else []
+    words = [word.lower() for word in original_class_list]
+    stems = porter.stem_many(words)
+
+    # Columns of the request words, looked up by word and by stem
+    vocabulary = list(dict.fromkeys(stems))
+    vocabulary_index = {word_stem: idx for idx, word_stem in enumerate(vocabulary)}
+    word_columns = {}
+    stem_columns = {}
+    for col, (word, word_stem) in enumerate(zip(words, stems)):
+        word_columns.setdefault(word, []).append(col)
+        stem_columns.setdefault(word_stem, []).append(col)
+
+    shape = (len(conflict_class_lists), len(words))
+    word_match = np.zeros(shape, dtype=bool)
+    stem_match = np.zeros(shape, dtype=bool)
+    subs_match = np.zeros(shape, dtype=bool)
+
+    for row, (conflict_class_list, class_subs_dict) in enumerate(zip(conflict_class_lists, class_subs_dicts)):
+        for name in conflict_class_list:
+            word_match[row, word_columns.get(name, [])] = True
+            stem_match[row, stem_columns.get(porter.stem(name.lower()), [])] = True
+        for word_stem in get_flat_list(class_subs_dict.values()) if class_subs_dict else []:
+            subs_match[row, stem_columns.get(word_stem, [])] = True
+
+    weights = np.select([word_match, stem_match, subs_match], [1.0, STEM_W, SUBS_W], default=0.0)
+
+    # Add the columns one at a time, in the order sum() adds them up in get_vector
+    entropy = np.zeros(shape[0])
+    for col in range(shape[1]):
+        entropy += weights[:, col]
+    if shape[1] > 0:
+        entropy /= shape[1]
+
+    vocabulary_columns = np.zeros((len(words), len(vocabulary)))
+    vocabulary_columns[np.arange(len(words)), [vocabulary_index[word_stem] for word_stem in stems]] = 1
+    matches = (weights > 0).astype(float) @ vocabulary_columns > 0
+
+    return vocabulary, matches, entropy
+
+
+def get_similarity_batch(vector1, vocabulary, matches, entropy):
+    """Return get_similarity of vector1 against each row of matches, see get_vector_batch."""
+    counts = np.array([vector1.get(word_stem, 0) for word_stem in vocabulary], dtype=float)
+    numerator = matches.astype(float) @ counts
 
-    if similarity == EXACT_MATCH or (
-            similarity >= MINIMUM_SIMILARITY and not is_not_real_conflict(list_name,
-                                                                          stand_alone_words,
-                                                                          list_dist,
-                                                                          dict_synonyms,
-                                                                          service)):
-        dict_matches_counter.update({name: similarity})
+    sum1 = sum([vector1[x] ** 2 for x in list(vector1.keys())])
+    sum2 = matches.sum(axis=1)
+    denominator = math.sqrt(sum1) * np.sqrt(sum2)
 
-    return dict_matches_counter
+    cosine = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+    return cosine * entropy
 
 
 def get_vector(conflict_class_list, original_class_list, class_subs_dict, dist=False):
@@ -161,7 +306,7 @@ def get_vector(conflict_class_list, original_class_list, class_subs_dict, dist=F
     original_class_list = original_class_list if original_class_list else []
     class_subs_dict = class_subs_dict if class_subs_dict else {}
 
-    conflict_class_stem = [porter.stem(name.lower()) for name in conflict_class_list]
+    conflict_class_stem = porter.stem_many(name.lower() for name in conflict_class_list)
 
     for idx, word in enumerate(original_class_list):  # pylint: disable=unused-variable
         k = word.lower()
@@ -0,0 +1,166 @@
+# Copyright © 2020 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Scores the candidate names of a request across a pool of worker processes.
+
+auto_analyze is CPU bound and makes blocking API and DB calls, so gathering it on the event loop runs the candidates
+one after the other. The engine splits the candidates into contiguous shards and scores each shard in a worker
+process; the shards are put back together in their original order, so the result does not depend on the pool size.
+
+score_stream scores the candidates in fixed size chunks instead and hands back each chunk as soon as it is scored, so a
+caller that has its answer (eg. an exact match) can stop before the remaining chunks are scored.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, List
+
+from namex.models import db
+from namex.services.name_processing.reference_data import ReferenceData
+
+from .analyzer import get_candidate, score_candidates
+
+
+# Shards handed to each worker, more than one evens out candidates that take longer to score
+SHARDS_PER_WORKER = 4
+
+# Names scored together by score_stream
+DEFAULT_CHUNK_SIZE = 10
+
+
+def get_shards(names: list, shard_count: int) -> List[list]:
+    """Return names split into at most shard_count contiguous, ordered shards of near equal size."""
+    if not names:
+        return []
+
+    shard_size = math.ceil(len(names) / max(shard_count, 1))
+    return [names[i:i + shard_size] for i in range(0, len(names), shard_size)]
+
+
+def get_chunks(names: list, chunk_size: int) -> List[list]:
+    """Return names split into ordered chunks of chunk_size names, the last one may be smaller."""
+    chunk_size = max(chunk_size, 1)
+    return [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+
+
+async def score_names(names: list,  # pylint: disable=too-many-arguments
+                      list_name: list, list_dist: list,
+                      list_desc: list, dict_substitution: dict,
+                      dict_synonyms: dict,
+                      np_svc_prep_data: ReferenceData) -> list:
+    """Return the auto_analyze result of each name, in the order of names."""
+    candidates = [
+        get_candidate(name, list_name, list_dist, list_desc, dict_substitution, dict_synonyms, np_svc_prep_data)
+        for name in names
+    ]
+    return score_candidates(candidates, list_name)
+
+
+def score_shard(*args) -> list:
+    """Score a shard in a worker process, see score_names for the arguments."""
+    return asyncio.run(score_names(*args))
+
+
+class ScoringEngine:
+    """Runs score_names over a process pool, or in the calling process when the pool size is 1."""
+
+    def __init__(self, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Create an engine with workers processes, it defaults to the number of CPUs."""
+        self._workers = workers or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._executor = None
+
+    @property
+    def workers(self) -> int:
+        """Return the number of worker processes."""
+        return self._workers
+
+    @property
+    def chunk_size(self) -> int:
+        """Return the number of names score_stream scores together."""
+        return self._chunk_size
+
+    def init_app(self, app):
+        """Read the pool size and the stream chunk size from the app config."""
+        self._workers = int(app.config.get('AUTO_ANALYZE_WORKERS') or os.cpu_count() or 1)
+        self._chunk_size = int(app.config.get('AUTO_ANALYZE_STREAM_CHUNK_SIZE') or DEFAULT_CHUNK_SIZE)
+
+    async def score(self, names: list, *args) -> list:
+        """Return the auto_analyze result of each name, in the order of names, see score_names for the arguments."""
+        if self._workers <= 1 or len(names) <= 1:
+            return await score_names(names, *args)
+
+        executor = self._get_executor()
+        loop = asyncio.get_event_loop()
+
+        shards = get_shards(names, self._workers * SHARDS_PER_WORKER)
+        results = await asyncio.gather(
+            *[loop.run_in_executor(executor, score_shard, shard, *args) for shard in shards]
+        )
+        return [result for shard_results in results for result in shard_results]
+
+    async def score_stream(self, names: list, *args) -> AsyncIterator[list]:
+        """Yield the auto_analyze results of names one chunk at a time, in order, see score_names for the arguments.
+
+        Each worker scores at most one chunk ahead of the caller; closing the generator cancels the chunks that have not
+        started yet.
+        """
+        chunks = get_chunks(names, self._chunk_size)
+        if self._workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield await score_names(chunk, *args)
+            return
+
+        executor = self._get_executor()
+        loop = asyncio.get_event_loop()
+
+        remaining = iter(chunks)
+        pending = deque()
+        try:
+            for chunk in itertools.islice(remaining, self._workers):
+                pending.append(loop.run_in_executor(executor, score_shard, chunk, *args))
+
+            while pending:
+                results = await pending.popleft()
+                chunk = next(remaining, None)
+                if chunk is not None:
+                    pending.append(loop.run_in_executor(executor, score_shard, chunk, *args))
+                yield results
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # The workers are forked from this process. Close the pooled DB connections first, so that no socket ends
+            # up shared between processes; each worker opens its own connections.
+            db.engine.dispose()
+            self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                 mp_context=multiprocessing.get_context('fork'))
+            logging.getLogger(__name__).info('Started %s auto-analyze scoring workers', self._workers)
+
+        return self._executor
+
+
+scoring_engine = ScoringEngine()
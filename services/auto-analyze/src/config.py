@@ -64,6 +64,15 @@ class Config:  # pylint: disable=too-few-public-methods
     )
 
     SOLR_SYNONYMS_API_URL = os.getenv('SOLR_SYNONYMS_API_URL', None)
+    # Seconds between checks of the synonyms version, the reference data is reloaded when it changes. 0 disables it.
+    REFERENCE_DATA_REFRESH_INTERVAL = int(os.getenv('REFERENCE_DATA_REFRESH_INTERVAL', '300'))
+    # Seconds between checks for word classification changes, the in-memory index is patched when there are some.
+    # 0 disables the index, the word classifications are then read from the database.
+    WORD_CLASSIFICATION_REFRESH_INTERVAL = int(os.getenv('WORD_CLASSIFICATION_REFRESH_INTERVAL', '10'))
+    # Worker processes that score the candidate names, defaults to the number of CPUs. 1 scores them in the app process.
+    AUTO_ANALYZE_WORKERS = int(os.getenv('AUTO_ANALYZE_WORKERS', '0'))
+    # Names scored together by the /stream endpoint, each chunk is sent back as soon as it is scored
+    AUTO_ANALYZE_STREAM_CHUNK_SIZE = int(os.getenv('AUTO_ANALYZE_STREAM_CHUNK_SIZE', '10'))
 
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv('JWT_OIDC_WELL_KNOWN_CONFIG')
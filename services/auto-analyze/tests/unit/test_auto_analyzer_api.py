@@ -22,3 +22,13 @@ async def test_auto_analyzer_api(app):
     client = app.test_client()
     response = await client.post('/', json=data)
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_auto_analyzer_api_stream(app):
+    """Assert that the streaming API answers with NDJSON."""
+    data = {'names': ['person', 'man', 'woman', 'camera', 'tv', 'genius']}
+    client = app.test_client()
+    response = await client.post('/stream', json=data)
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'application/x-ndjson'
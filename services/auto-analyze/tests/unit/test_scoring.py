@@ -0,0 +1,67 @@
+# Copyright © 2020 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test suite for the candidate scoring engine."""
+import pytest
+
+
+@pytest.mark.parametrize('test_name, names, shard_count, expected', [
+    ('no names', [], 4, []),
+    ('fewer names than shards', ['a', 'b'], 4, [['a'], ['b']]),
+    ('even split', ['a', 'b', 'c', 'd'], 2, [['a', 'b'], ['c', 'd']]),
+    ('uneven split', ['a', 'b', 'c', 'd', 'e'], 2, [['a', 'b', 'c'], ['d', 'e']]),
+])
+def test_get_shards(test_name, names, shard_count, expected):
+    """Assert that the shards keep the order of the names."""
+    from auto_analyze.scoring import get_shards
+
+    shards = get_shards(names, shard_count)
+
+    assert shards == expected
+    assert [name for shard in shards for name in shard] == names
+
+
+@pytest.mark.parametrize('test_name, names, chunk_size, expected', [
+    ('no names', [], 2, []),
+    ('even split', ['a', 'b', 'c', 'd'], 2, [['a', 'b'], ['c', 'd']]),
+    ('last chunk smaller', ['a', 'b', 'c'], 2, [['a', 'b'], ['c']]),
+])
+def test_get_chunks(test_name, names, chunk_size, expected):
+    """Assert that the chunks have chunk_size names and keep their order."""
+    from auto_analyze.scoring import get_chunks
+
+    assert get_chunks(names, chunk_size) == expected
+
+
+@pytest.mark.asyncio
+async def test_score_stream_stops_when_closed(monkeypatch):
+    """Assert that the chunks are scored in order, and not after the caller closes the stream."""
+    from auto_analyze import scoring
+
+    scored = []
+
+    async def fake_score_names(names, *args):
+        scored.extend(names)
+        return [{name: 0.5} for name in names]
+
+    monkeypatch.setattr(scoring, 'score_names', fake_score_names)
+    engine = scoring.ScoringEngine(workers=1, chunk_size=2)
+
+    stream = engine.score_stream(['a', 'b', 'c', 'd', 'e'])
+    first = await stream.__anext__()
+    second = await stream.__anext__()
+    await stream.aclose()
+
+    assert first == [{'a': 0.5}, {'b': 0.5}]
+    assert second == [{'c': 0.5}, {'d': 0.5}]
+    assert scored == ['a', 'b', 'c', 'd']
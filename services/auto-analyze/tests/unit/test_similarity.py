@@ -0,0 +1,69 @@
+# Copyright © 2020 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Golden tests of the batch similarity kernel against the per-name vectors."""
+import pytest
+
+
+ORIGINAL_CLASS_LISTS = [
+    [],
+    ['armstrong'],
+    ['Armstrong', 'plumbing'],
+    ['plumbing', 'plumbers', 'heating'],
+    ['north', 'pacific', 'north'],
+]
+
+CONFLICT_CLASS_LISTS = [
+    [],
+    ['armstrong'],
+    ['ARMSTRONG'],
+    ['plumber', 'heat'],
+    ['armstrongs', 'plumbing', 'heating'],
+    ['northern', 'pacific'],
+    ['bakery'],
+]
+
+CLASS_SUBS_DICTS = [
+    {},
+    {'plumber': ['plumb', 'pipe']},
+    {'heating': ['heat', 'furnac']},
+    {'north': ['north', 'nord']},
+]
+
+
+@pytest.mark.parametrize('original_class_list', ORIGINAL_CLASS_LISTS)
+@pytest.mark.parametrize('dist', [True, False])
+def test_get_similarity_batch(original_class_list, dist):
+    """Assert that the batch kernel returns the same numbers as get_vector and get_similarity."""
+    from auto_analyze.analyzer import (
+        get_similarity,
+        get_similarity_batch,
+        get_vector,
+        get_vector_batch,
+        porter,
+        text_to_vector,
+    )
+
+    conflict_class_lists = [conflict for conflict in CONFLICT_CLASS_LISTS for _ in CLASS_SUBS_DICTS]
+    class_subs_dicts = [subs for _ in CONFLICT_CLASS_LISTS for subs in CLASS_SUBS_DICTS]
+    vector1 = text_to_vector([porter.stem(word) for word in original_class_list])
+
+    vocabulary, matches, entropy = get_vector_batch(conflict_class_lists, original_class_list, class_subs_dicts, dist)
+    similarities = get_similarity_batch(vector1, vocabulary, matches, entropy)
+
+    for row, (conflict_class_list, class_subs_dict) in enumerate(zip(conflict_class_lists, class_subs_dicts)):
+        vector2, entropy2 = get_vector(conflict_class_list, original_class_list, class_subs_dict, dist)
+
+        assert float(entropy[row]) == entropy2
+        assert {vocabulary[col] for col in range(len(vocabulary)) if matches[row, col]} == set(vector2)
+        assert float(similarities[row]) == get_similarity(vector1, vector2, entropy2)
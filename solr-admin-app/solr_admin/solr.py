@@ -11,7 +11,7 @@ _SOLR_INSTANCE = os.getenv('SOLR_ADMIN_APP_SOLR_INSTANCE', 'http://localhost:839
 _SOLR_RELOAD_URL = _SOLR_INSTANCE + '/admin/cores?action=RELOAD&wt=json&core={}'
 
 
-# Reload all the cores.
+# Reload all the cores. The namex api drops its cached Solr lookups when it sees the reload (see solr_lookup_cache).
 def reload_solr_cores() -> None:
     for core_name in _SOLR_CORE_NAMES:
         sessions.FuturesSession().get(_SOLR_RELOAD_URL.format(core_name), background_callback=_core_reload_callback)
@@ -39,6 +39,12 @@ class Config(object):
     SQLALCHEMY_DATABASE_URI = 'postgresql://{user}:{password}@{host}:{port}/{name}'.format(
         user=DATABASE_USER, password=DATABASE_PASSWORD, host=DATABASE_HOST, port=int(DATABASE_PORT), name=DATABASE_NAME)
 
+    # Stem the synonym table vocabulary at startup, so the first requests don't fill the stemming cache.
+    STEM_CACHE_WARM_UP = os.getenv('SOLR_SYNONYMS_API_STEM_CACHE_WARM_UP', 'False').lower() == 'true'
+    # Seconds between checks of the synonym table version, the in-memory synonym index is rebuilt when it changes.
+    # 0 disables the index, the synonyms are then queried from the database.
+    SYNONYM_INDEX_REFRESH_INTERVAL = int(os.getenv('SOLR_SYNONYMS_API_SYNONYM_INDEX_REFRESH_INTERVAL', '60'))
+
     DEBUG = False
     TESTING = False
 
@@ -55,3 +61,4 @@ class TestConfig(Config):
 
     DEBUG = True
     TESTING = True
+    SYNONYM_INDEX_REFRESH_INTERVAL = 0
@@ -11,8 +11,11 @@ import config
 from synonyms import models
 from synonyms.endpoints import api
 from synonyms.models import db, ma
+from synonyms.services.synonyms.synonym import SynonymService
+from synonyms.services.synonyms.synonym_index import synonym_index_service
 from synonyms.utils.logging import setup_logging
 from synonyms.utils.run_version import get_run_version
+from synonyms.utils.stemming import porter
 
 setup_logging()
 jwt = JwtManager()
@@ -30,6 +33,8 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     api.init_app(app)
     setup_jwt_manager(app, jwt)
 
+    synonym_index_service.init_app(app)
+
     @app.after_request
     def add_version(response):
         os.getenv('OPENSHIFT_BUILD_COMMIT', '')
@@ -38,9 +43,22 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
 
     register_shellcontext(app)
 
+    if app.config.get('STEM_CACHE_WARM_UP'):
+        warm_up_stem_cache(app)
+
     return app
 
 
+def warm_up_stem_cache(app):
+    """Stem the synonym table vocabulary into the stemming cache."""
+    with app.app_context():
+        try:
+            count = porter.warm_up(SynonymService().get_vocabulary())
+            app.logger.info('Stemming cache warmed up with {count} words'.format(count=count))
+        except Exception as err:
+            app.logger.warning('Could not warm up the stemming cache: {err}'.format(err=repr(err)))
+
+
 def setup_jwt_manager(app, jwt):
     """Initialize jwt config."""
     def get_roles(a_dict):
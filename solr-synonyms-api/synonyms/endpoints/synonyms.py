@@ -53,6 +53,22 @@ response_string = api.model('String', {
     'data': fields.String
 })
 
+# Define our batch request objects
+transform_text_batch = api.model('TransformTextBatch', {
+    'texts': fields.List(fields.String, required=True),
+    'designation_all': fields.List(fields.String),
+    'prefix_list': fields.List(fields.String),
+    'number_list': fields.List(fields.String),
+    'exceptions_ws': fields.List(fields.String)
+})
+
+regex_prefixes_batch = api.model('RegexPrefixesBatch', {
+    'texts': fields.List(fields.String, required=True),
+    'prefixes_str': fields.String,
+    'exception_designation': fields.List(fields.String),
+    'exception_designations': fields.List(fields.List(fields.String))
+})
+
 
 @api.route('/synonyms', strict_slashes=False, methods=['GET'])
 class _WordSynonyms(Resource):
@@ -79,6 +95,28 @@ class _WordSynonyms(Resource):
         }
 
 
+@api.route('/version', strict_slashes=False, methods=['GET'])
+class _Version(Resource):
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    # @jwt.requires_auth
+    # @api.expect()
+    @api.response(200, 'SynonymsApi', response_string)
+    @marshal_with(response_string)
+    @api.doc(params={
+    })
+    def get():
+        if not validate_request(request.args):
+            return
+
+        service = SynonymService()
+        result = service.get_version()
+
+        return {
+            'data': result
+        }
+
+
 @api.route('/substitutions', strict_slashes=False, methods=['GET'])
 class _WordSubstitutions(Resource):
     @staticmethod
@@ -762,6 +800,60 @@ class _RegexPrefixes(Resource):
             'data': result
         }
 
+
+@api.route('/transform-text/batch', strict_slashes=False, methods=['POST'])
+class _TransformTextBatch(Resource):
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    # @jwt.requires_auth
+    @api.expect(transform_text_batch)
+    @api.response(200, 'SynonymsApi', response_list)
+    @marshal_with(response_list)
+    def post():
+        json_data = request.get_json()
+        texts = json_data.get('texts', [])
+        designation_all = json_data.get('designation_all', [])
+        prefix_list = json_data.get('prefix_list', [])
+        number_list = json_data.get('number_list', [])
+        exceptions_ws = json_data.get('exceptions_ws', [])
+
+        if not validate_request(json_data):
+            return
+
+        service = SynonymService()
+        results = service.regex_transform_batch(texts, designation_all, prefix_list, number_list, exceptions_ws)
+
+        return {
+            'data': results
+        }
+
+
+@api.route('/regex-prefixes/batch', strict_slashes=False, methods=['POST'])
+class _RegexPrefixesBatch(Resource):
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    # @jwt.requires_auth
+    @api.expect(regex_prefixes_batch)
+    @api.response(200, 'SynonymsApi', response_list)
+    @marshal_with(response_list)
+    def post():
+        json_data = request.get_json()
+        texts = json_data.get('texts', [])
+        prefixes_str = json_data.get('prefixes_str', '')
+        # Either one exception list per text, or a single one shared by all the texts
+        exception_designations = json_data.get('exception_designations') or \
+            [json_data.get('exception_designation', [])] * len(texts)
+
+        if not validate_request(json_data):
+            return
+
+        service = SynonymService()
+        results = service.regex_prefixes_batch(texts, prefixes_str, exception_designations)
+
+        return {
+            'data': results
+        }
+
 @api.route('/<col>/<term>', strict_slashes=False, methods=['GET'])
 class _Synonyms(Resource):
     @staticmethod
@@ -1,6 +1,7 @@
 from . import db, ma
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
 from synonyms.criteria.synonym.query_criteria import SynonymQueryCriteria
 
@@ -72,6 +73,37 @@ class Synonym(db.Model):
 
         return query.all()
 
+    '''
+    Fingerprint of the whole synonym table. Changes whenever a row is added, removed or edited, so clients that cache
+    reference data (stop words, prefixes, designations...) can poll it instead of reloading every list.
+    '''
+    @classmethod
+    def get_version(cls):
+        row_text = func.concat_ws('|', cls.id, cls.category, cls.synonyms_text, cls.stems_text, cls.enabled)
+        table_text = func.string_agg(row_text, aggregate_order_by(literal_column("';'"), cls.id))
+
+        return db.session.query(func.md5(func.coalesce(table_text, ''))).scalar()
+
+    '''
+    Every row, without the comment, for the in-memory synonym index.
+    '''
+    @classmethod
+    def find_all(cls):
+        return cls.query.with_entities(cls.id, cls.category, cls.synonyms_text, cls.stems_text).all()
+
+    '''
+    Every word and phrase of the enabled synonym rows, used to warm up the stemming cache.
+    '''
+    @classmethod
+    def get_vocabulary(cls):
+        rows = cls.query.with_entities(cls.synonyms_text).filter(cls.enabled.is_(True)).all()
+
+        vocabulary = set()
+        for row in rows:
+            vocabulary.update(word.strip().lower() for word in row.synonyms_text.split(',') if word.strip())
+
+        return sorted(vocabulary)
+
 
 class SynonymSchema(ma.ModelSchema):
     class Meta:
@@ -1,7 +1,6 @@
 from enum import Enum
-from nltk.stem import PorterStemmer
 
-porter = PorterStemmer()
+from synonyms.utils.stemming import porter
 
 
 # Modes
@@ -0,0 +1,135 @@
+import re
+import threading
+
+from synonyms.constants import \
+    BCProtectedNameEntityTypes, BCUnprotectedNameEntityTypes, XproUnprotectedNameEntityTypes
+
+from . import DesignationPositionCodes, LanguageCodes
+
+"""
+Designation lists and matchers of one version of the synonym table.
+The designation endpoints used to query the synonym table and build a fresh alternation regex for every name;
+a DesignationCatalogue computes each list and regex once, on first use, and is kept until the table changes
+(see SynonymDesignationMixin.get_designation_catalogue).
+"""
+
+END_DESIGNATION_ENTITY_TYPES = [
+    XproUnprotectedNameEntityTypes.XPRO_LIMITED_LIABILITY_COMPANY,
+    BCUnprotectedNameEntityTypes.LIMITED_LIABILITY_PARTNERSHIP,
+    BCProtectedNameEntityTypes.UNLIMITED_LIABILITY_COMPANY,
+    BCProtectedNameEntityTypes.CORPORATION
+]
+
+ANY_DESIGNATION_ENTITY_TYPES = []
+
+
+def _get_value(code):
+    return getattr(code, 'value', code)
+
+
+def _find_entity_types(entity_designation_dict, designation):
+    # A designation belongs to the entity types with a designation containing it, eg. limited is one of UL's too
+    return tuple(entity_type for entity_type, designations in entity_designation_dict.items()
+                 if any(designation in value for value in designations))
+
+
+class DesignationCatalogue(object):
+    """
+    Lists are stored as tuples and returned as new lists, callers may change them.
+    """
+
+    @property
+    def version(self):
+        return self._version
+
+    def __init__(self, version, find_designations):
+        """
+        @:param find_designations Function (entity_type_code, position_code, lang) returning the designations from the
+                                  synonym table, sorted longest first, see SynonymService.find_designations
+        """
+        self._version = version
+        self._find_designations = find_designations
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get_designations(self, entity_type_code, position_code, lang):
+        # Equal codes come from different enums (eg. BCProtectedNameEntityTypes / BCUnprotectedNameEntityTypes), key on
+        # their values
+        key = ('designations', _get_value(entity_type_code), _get_value(position_code), lang.lower())
+        return list(self._get(key, lambda: tuple(self._find_designations(entity_type_code, position_code, lang))))
+
+    def get_designations_all_languages(self, entity_type_code, position_code):
+        return self.get_designations(entity_type_code, position_code, LanguageCodes.ENG.value) + \
+            self.get_designations(entity_type_code, position_code, LanguageCodes.FR.value)
+
+    def get_designation_end_regex(self):
+        def build():
+            designation_end_all_list = self.get_designations_all_languages(None, DesignationPositionCodes.END)
+            designation_end_all_list.sort(key=len, reverse=True)
+            designation_end_rgx = '(' + '|'.join(map(str, designation_end_all_list)) + ')'
+            return re.compile(r'{0}(?=(\s{0})*$)'.format(designation_end_rgx))
+
+        return self._get('designation_end_regex', build)
+
+    def get_designation_any_regex(self):
+        def build():
+            designation_any_all_list = self.get_designations_all_languages(None, DesignationPositionCodes.ANY)
+            designation_any_all_list.sort(key=len, reverse=True)
+            designation_any_rgx = '(' + '|'.join(map(str, designation_any_all_list)) + ')'
+            return re.compile(r'(?<!\w)({0})(?!\w)(?=\s|$)'.format(designation_any_rgx))
+
+        return self._get('designation_any_regex', build)
+
+    def get_designation_all_regex(self):
+        def build():
+            all_designations = list(set(self.get_designations_all_languages(None, DesignationPositionCodes.END) +
+                                        self.get_designations_all_languages(None, DesignationPositionCodes.ANY)))
+            all_designations.sort(key=len, reverse=True)
+            all_designations_rgx = '|'.join(map(str, all_designations))
+            return re.compile(r'(?<!\w)({0})(?!\w)(?=\s|$)'.format(all_designations_rgx))
+
+        return self._get('designation_all_regex', build)
+
+    def get_all_end_designations(self):
+        return self._get_entity_type_designations(END_DESIGNATION_ENTITY_TYPES, DesignationPositionCodes.END)
+
+    def get_all_any_designations(self):
+        return self._get_entity_type_designations(ANY_DESIGNATION_ENTITY_TYPES, DesignationPositionCodes.ANY)
+
+    def get_entity_types_by_end_designation(self, designation):
+        """
+        Reverse of get_all_end_designations, same as SynonymDesignationMixin.get_entity_type_by_value with it.
+        The end designations are looked up in a map built once from the lists, other values are matched each time.
+        """
+        entity_types = self._get_end_designation_entity_types().get(designation)
+        if entity_types is None:
+            entity_types = _find_entity_types(self.get_all_end_designations(), designation)
+        return list(entity_types)
+
+    def _get_entity_type_designations(self, entity_types, position_code):
+        def build():
+            entity_designation_dict = {}
+            for entity_type in entity_types:
+                designations = self.get_designations_all_languages(entity_type, position_code)
+                designations.sort(key=len, reverse=True)
+                entity_designation_dict[entity_type.value] = tuple(designations)
+            return entity_designation_dict
+
+        entity_designation_dict = self._get(('entity_type_designations', position_code), build)
+        return {entity_type: list(designations) for entity_type, designations in entity_designation_dict.items()}
+
+    def _get_end_designation_entity_types(self):
+        def build():
+            entity_designation_dict = self.get_all_end_designations()
+            return {designation: _find_entity_types(entity_designation_dict, designation)
+                    for designations in entity_designation_dict.values() for designation in designations}
+
+        return self._get('end_designation_entity_types', build)
+
+    def _get(self, key, build):
+        value = self._values.get(key)
+        if value is None:
+            value = build()
+            with self._lock:
+                value = self._values.setdefault(key, value)
+        return value
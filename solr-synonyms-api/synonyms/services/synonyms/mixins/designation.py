@@ -1,16 +1,44 @@
 import re
 import collections
-
-from synonyms.constants import \
-    BCProtectedNameEntityTypes, BCUnprotectedNameEntityTypes, XproUnprotectedNameEntityTypes
+import threading
 
 from synonyms.utils.service_utils import get_flat_list
 
 from . import SynonymServiceMixin
 from .. import DesignationPositionCodes, LanguageCodes
+from ..designation_catalogue import DesignationCatalogue
+from ..synonym_index import synonym_index_service
+
+# The DesignationCatalogue of the current synonym index version, shared by the service instances
+_catalogue = None
+_catalogue_lock = threading.Lock()
 
 
 class SynonymDesignationMixin(SynonymServiceMixin):
+    '''
+    The designation lists and regexes, built once per version of the synonym table.
+    Without the synonym index (eg. in the tests) there is no version to check, so each service instance builds its own.
+    '''
+
+    def get_designation_catalogue(self):
+        global _catalogue
+
+        index = synonym_index_service.get()
+        if index is None:
+            catalogue = getattr(self, '_designation_catalogue', None)
+            if catalogue is None:
+                catalogue = self._designation_catalogue = DesignationCatalogue(None, self.find_designations)
+            return catalogue
+
+        catalogue = _catalogue
+        if catalogue is None or catalogue.version != index.version:
+            with _catalogue_lock:
+                if _catalogue is None or _catalogue.version != index.version:
+                    _catalogue = DesignationCatalogue(index.version, self.find_designations)
+                catalogue = _catalogue
+
+        return catalogue
+
     def get_designated_end_all_words(self):
         return self.get_designations(None, DesignationPositionCodes.END, LanguageCodes.ENG.value)
 
@@ -30,9 +58,14 @@ class SynonymDesignationMixin(SynonymServiceMixin):
         return misplaced_designation_any_list
 
     def get_entity_type_end_designation(self, entity_end_designation_dict, all_designation_any_end_list):
+        catalogue = self.get_designation_catalogue()
+        # Clients pass back the dict of get_all_end_designations, use its precomputed reverse lookups
+        use_catalogue = entity_end_designation_dict == catalogue.get_all_end_designations()
+
         entity_type_end_designation_name = list()
         for designation_end in all_designation_any_end_list:
             entity_type_end_designation_name.extend(
+                catalogue.get_entity_types_by_end_designation(designation_end) if use_catalogue else
                 self.get_entity_type_by_value(entity_end_designation_dict, designation_end))
 
         all_entity_types = [item for item, count in collections.Counter(entity_type_end_designation_name).items() if
@@ -44,10 +77,15 @@ class SynonymDesignationMixin(SynonymServiceMixin):
         return entity_type_end_designation_name
 
     def get_entity_type_any_designation(self, entity_any_designation_dict, all_designation_any_end_list):
+        catalogue = self.get_designation_catalogue()
+        # Some clients pass the dict of get_all_end_designations here too
+        use_catalogue = entity_any_designation_dict == catalogue.get_all_end_designations()
+
         entity_type_any_designation_name = list()
 
         for designation_any in all_designation_any_end_list:
             entity_type_any_designation_name.extend(
+                catalogue.get_entity_types_by_end_designation(designation_any) if use_catalogue else
                 self.get_entity_type_by_value(entity_any_designation_dict, designation_any))
 
         all_entity_types = [item for item, count in collections.Counter(entity_type_any_designation_name).items() if
@@ -64,18 +102,10 @@ class SynonymDesignationMixin(SynonymServiceMixin):
     '''
 
     def get_designation_end_in_name(self, name):
-        eng_designation_end_all_list = self.get_designations(None, DesignationPositionCodes.END,
-                                                             LanguageCodes.ENG.value)
-        fr_designation_end_all_list = self.get_designations(None, DesignationPositionCodes.END,
-                                                            LanguageCodes.FR.value)
-
-        designation_end_all_list = eng_designation_end_all_list + fr_designation_end_all_list
-        designation_end_all_list.sort(key=len, reverse=True)
-        designation_end_rgx = '(' + '|'.join(map(str, designation_end_all_list)) + ')'
-        designation_end_regex = r'{0}(?=(\s{0})*$)'.format(designation_end_rgx)
+        designation_end_regex = self.get_designation_catalogue().get_designation_end_regex()
 
         # Returns list of tuples
-        designation_end_list = re.findall(designation_end_regex, name.lower())
+        designation_end_list = designation_end_regex.findall(name.lower())
 
         designation_end_list = [designation[0].strip() for designation in designation_end_list if designation[0]]
 
@@ -104,19 +134,10 @@ class SynonymDesignationMixin(SynonymServiceMixin):
     '''
 
     def get_designation_any_in_name(self, name):
-        eng_designation_any_all_list = self.get_designations(None, DesignationPositionCodes.ANY,
-                                                             LanguageCodes.ENG.value)
-        fr_designation_any_all_list = self.get_designations(None, DesignationPositionCodes.ANY,
-                                                            LanguageCodes.FR.value)
-
-        designation_any_all_list = eng_designation_any_all_list + fr_designation_any_all_list
-        designation_any_all_list.sort(key=len, reverse=True)
-
-        designation_any_rgx = '(' + '|'.join(map(str, designation_any_all_list)) + ')'
-        designation_any_regex = r'(?<!\w)({0})(?!\w)(?=\s|$)'.format(designation_any_rgx)
+        designation_any_regex = self.get_designation_catalogue().get_designation_any_regex()
 
         # Returns list of tuples
-        found_designation_any = re.findall(designation_any_regex, name.lower())
+        found_designation_any = designation_any_regex.findall(name.lower())
         found_designation_any = list(set([x for designation in found_designation_any for x in designation]))
 
         return found_designation_any
@@ -126,75 +147,18 @@ class SynonymDesignationMixin(SynonymServiceMixin):
         '''
 
     def get_designation_all_in_name(self, name):
-        eng_all_designations_end_all_list = self.get_designations(None, DesignationPositionCodes.END,
-                                                                  LanguageCodes.ENG.value)
-        eng_all_designations_any_all_list = self.get_designations(None, DesignationPositionCodes.ANY,
-                                                                  LanguageCodes.ENG.value)
-
-        fr_all_designations_end_all_list = self.get_designations(None, DesignationPositionCodes.END,
-                                                                 LanguageCodes.FR.value)
-        fr_all_designations_any_all_list = self.get_designations(None, DesignationPositionCodes.ANY,
-                                                                 LanguageCodes.FR.value)
-
-        all_designations_end_all_list = eng_all_designations_end_all_list + fr_all_designations_end_all_list
-        all_designations_any_all_list = eng_all_designations_any_all_list + fr_all_designations_any_all_list
-
-        all_designations = list(set(all_designations_end_all_list + all_designations_any_all_list))
-        all_designations.sort(key=len, reverse=True)
-
-        all_designations_rgx = '|'.join(map(str, all_designations))
-        all_designations_regex = r'(?<!\w)({0})(?!\w)(?=\s|$)'.format(all_designations_rgx)
+        all_designations_regex = self.get_designation_catalogue().get_designation_all_regex()
 
         # Returns list of tuples
-        found_all_designations = re.findall(all_designations_regex, name.lower())
+        found_all_designations = all_designations_regex.findall(name.lower())
 
         return found_all_designations
 
     def get_all_end_designations(self):
-        entity_types = [
-            XproUnprotectedNameEntityTypes.XPRO_LIMITED_LIABILITY_COMPANY,
-            BCUnprotectedNameEntityTypes.LIMITED_LIABILITY_PARTNERSHIP,
-            BCProtectedNameEntityTypes.UNLIMITED_LIABILITY_COMPANY,
-            BCProtectedNameEntityTypes.CORPORATION
-        ]
-
-        entity_end_designation_dict = {}
-
-        for entity_type in entity_types:
-            entity_end_designation_dict[entity_type.value] = self.get_designations(
-                entity_type,
-                DesignationPositionCodes.END,
-                LanguageCodes.ENG
-            )
-            eng_designation_end = self.get_designations(entity_type.value, DesignationPositionCodes.END,
-                                                        LanguageCodes.ENG.value)
-            fr_designation_end = self.get_designations(entity_type.value, DesignationPositionCodes.END,
-                                                       LanguageCodes.FR.value)
-
-            designation_end = eng_designation_end + fr_designation_end
-            designation_end.sort(key=len, reverse=True)
-
-            entity_end_designation_dict[entity_type.value] = designation_end
-
-        return entity_end_designation_dict
+        return self.get_designation_catalogue().get_all_end_designations()
 
     def get_all_any_designations(self):
-        entity_types = [
-        ]
-
-        entity_any_designation_dict = {}
-
-        for entity_type in entity_types:
-            eng_designation_any = self.get_designations(entity_type, DesignationPositionCodes.ANY,
-                                                        LanguageCodes.ENG.value)
-            fr_designation_any = self.get_designations(entity_type, DesignationPositionCodes.ANY,
-                                                       LanguageCodes.FR.value)
-            designation_any = eng_designation_any + fr_designation_any
-            designation_any.sort(key=len, reverse=True)
-
-            entity_any_designation_dict[entity_type.value] = designation_any
-
-        return entity_any_designation_dict
+        return self.get_designation_catalogue().get_all_any_designations()
 
     def get_entity_type_by_value(self, entity_type_dicts, designation):
         entity_list = list()
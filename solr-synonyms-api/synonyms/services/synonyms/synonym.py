@@ -1,6 +1,7 @@
 import re
 import string
-from sqlalchemy import func
+from functools import lru_cache
+from sqlalchemy import func, not_
 
 from synonyms.models.synonym import Synonym
 from synonyms.criteria.synonym.query_criteria import SynonymQueryCriteria
@@ -10,6 +11,7 @@ from pyinflect import getInflection
 
 from .mixins.designation import SynonymDesignationMixin
 from .mixins.model import SynonymModelMixin
+from .synonym_index import CategoryFilter, synonym_index_service
 
 from synonyms.utils.service_utils import get_entity_type_code, get_designation_position_code
 
@@ -39,60 +41,73 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
 
     '''
     Designations, distinctives and descriptives return stems_text
+    @:param filters CategoryFilters the rows must pass
     '''
 
     def find_word_synonyms(self, word, filters, stand_alone=False, category=False, entity_type=None, stem=False):
         model = self.get_model()
         word = word.lower() if isinstance(word, str) else None
-
         if word:
-            if stem:
-                filters.append(
-                    func.lower(model.stems_text).op('~')(r'\y{}\y'.format(porter.stem(word).replace(" ", ""))))
-            else:
-                filters.append(
-                    func.lower(model.synonyms_text).op('~')(r'\y{}\y'.format(word).replace(" ", "")))
+            word = porter.stem(word).replace(" ", "") if stem else word.replace(" ", "")
 
         field = []
         if category:
-            field = [model.category]
+            field = ['category']
         else:
-            field = [model.synonyms_text] if stand_alone else [model.stems_text] if entity_type else [model.stems_text,
-                                                                                                      model.synonyms_text]
+            field = ['synonyms_text'] if stand_alone else ['stems_text'] if entity_type else ['stems_text',
+                                                                                              'synonyms_text']
+
+        index = synonym_index_service.get()
+        if index is not None:
+            rows = index.find(word or None, filters, stem)
+            return [tuple(getattr(row, name) for name in field) for row in rows]
+
+        query_filters = [self.get_category_filter_clause(category_filter) for category_filter in filters]
+        if word:
+            text_field = model.stems_text if stem else model.synonyms_text
+            query_filters.append(func.lower(text_field).op('~')(r'\y{}\y'.format(word)))
 
         criteria = SynonymQueryCriteria(
             word=word,
-            fields=field,
-            filters=filters
+            fields=[getattr(model, name) for name in field],
+            filters=query_filters
         )
 
         return model.find_by_criteria(criteria)
 
+    def get_category_filter_clause(self, category_filter):
+        model = self.get_model()
+        clause = func.lower(model.category).op('~')(category_filter.pattern)
+        return not_(clause) if category_filter.negate else clause
+
     def get_model(self):
         return self._model
 
-    def get_synonyms(self, word=None, category=False):
+    def get_version(self):
+        model = self.get_model()
+        return model.get_version()
+
+    def get_vocabulary(self):
         model = self.get_model()
+        return model.get_vocabulary()
 
+    def get_synonyms(self, word=None, category=False):
         filters = [
-            ~func.lower(model.category).op('~')(r'\y{}\y'.format('sub')),
-            ~func.lower(model.category).op('~')(r'\y{}\y'.format('stop'))
+            CategoryFilter(r'\y{}\y'.format('sub'), negate=True),
+            CategoryFilter(r'\y{}\y'.format('stop'), negate=True)
         ]
 
         results = self.find_word_synonyms(word, filters, category, stem=False)
         if not results:
-            # Remove filter searching for synonyms_text and add filter for stems_text
-            filters.pop()
+            # Search stems_text instead of synonyms_text
             results = self.find_word_synonyms(word, filters, category, stem=True)
         flattened = list(map(str.strip, (list(filter(None, self.flatten_synonyms_text(results))))))
 
         return flattened
 
     def get_substitutions(self, word=None):
-        model = self.get_model()
-
         filters = [
-            func.lower(model.category).op('~')(r'\y{}\y'.format('sub'))
+            CategoryFilter(r'\y{}\y'.format('sub'), negate=False)
         ]
 
         results = self.find_word_synonyms(word, filters)
@@ -104,10 +119,8 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
         return flattened
 
     def get_stop_words(self, word=None):
-        model = self.get_model()
-
         filters = [
-            func.lower(model.category).op('~')(r'\y{}\y'.format('stop word[s]?')),
+            CategoryFilter(r'\y{}\y'.format('stop word[s]?'), negate=False),
         ]
 
         results = self.find_word_synonyms(word, filters)
@@ -118,10 +131,8 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
         return stop_words_list
 
     def get_prefixes(self):
-        model = self.get_model()
-
         filters = [
-            func.lower(model.category).op('~')(r'\y{}\y'.format('prefix(es)?'))
+            CategoryFilter(r'\y{}\y'.format('prefix(es)?'), negate=False)
         ]
 
         results = self.find_word_synonyms(None, filters)
@@ -129,10 +140,8 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
         return flattened
 
     def get_standalone(self):
-        model = self.get_model()
-
         filters = [
-            func.lower(model.category).op('~')(r'\y{}\y'.format('stand-alone'))
+            CategoryFilter(r'\y{}\y'.format('stand-alone'), negate=False)
         ]
 
         results = self.find_word_synonyms(None, filters, stand_alone=True)
@@ -143,10 +152,8 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
         return stand_alone_list
 
     def get_number_words(self):
-        model = self.get_model()
-
         filters = [
-            func.lower(model.category).op('~')(r'\y{}\y'.format('number(s)? sub')),
+            CategoryFilter(r'\y{}\y'.format('number(s)? sub'), negate=False),
         ]
 
         results = self.find_word_synonyms(None, filters)
@@ -155,24 +162,29 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
 
     def get_designations(self, entity_type_str, position_str, lang):
         lang = lang if isinstance(lang, str) else LanguageCodes.ENG.value
-        model = self.get_model()
 
         entity_type_code = get_entity_type_code(entity_type_str)
         position_code = get_designation_position_code(position_str) if isinstance(position_str, str) else position_str
 
+        return self.get_designation_catalogue().get_designations(entity_type_code, position_code, lang)
+
+    '''
+    Query the designations of the entity type, position and language, use get_designations instead (it caches them).
+    '''
+
+    def find_designations(self, entity_type_code, position_code, lang):
         filters = []
 
         if entity_type_code is not None:
-            filters.append(
-                func.lower(model.category).op('~')(r'\y{}[-_]+valid\y'.format(entity_type_code.value.lower())))
+            filters.append(CategoryFilter(r'\y{}[-_]+valid\y'.format(entity_type_code.value.lower()), negate=False))
 
         if position_code is not None:
-            filters.append(func.lower(model.category).op('~')(
-                r'\y{}\y'.format('designation[s]?[_-]+' + position_code.value.lower())))
+            filters.append(
+                CategoryFilter(r'\y{}\y'.format('designation[s]?[_-]+' + position_code.value.lower()), negate=False))
         else:
-            filters.append(func.lower(model.category).op('~')(r'\y{}\y'.format('designation[s]?[_-]')))
+            filters.append(CategoryFilter(r'\y{}\y'.format('designation[s]?[_-]'), negate=False))
 
-        filters.append(func.lower(model.category).op('~')(r'\y{}\y'.format(lang.lower())))
+        filters.append(CategoryFilter(r'\y{}\y'.format(lang.lower()), negate=False))
 
         results = self.find_word_synonyms(None, filters, entity_type=entity_type_code)
         flattened = list(set(map(str.strip, (list(filter(None, self.flatten_synonyms_text(results)))))))
@@ -211,9 +223,15 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
     '''
 
     def regex_transform(self, text, designation_all, prefix_list, number_list, exceptions_ws):
-        stand_alone_list = self.get_standalone()
-        stand_alone_list.sort(key=len, reverse=True)
+        return self.regex_transform_batch([text], designation_all, prefix_list, number_list, exceptions_ws)[0]
+
+    '''
+    regex_transform of each text, the regexes built from the shared lists are compiled once for the whole batch.
+    '''
 
+    def regex_transform_batch(self, texts, designation_all, prefix_list, number_list, exceptions_ws):
+        # The stand-alone list is only needed by regex_numbers_standalone, which is not part of the transform;
+        # get it with self.get_standalone() if that step comes back instead of querying it for every name.
         designation_all_regex = '|'.join(designation_all)
         # stand_alone_regex = '$|'.join(stand_alone_list) + '$'
         # prefixes = '|'.join(prefix_list)
@@ -222,41 +240,69 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
         internet_domains = '.COM|.ORG|.NET|.EDU'
         # stand_alone_words = 'HOLDINGS$|BC$|VENTURES$|SOLUTION$|ENTERPRISE$|ENTERPRISES$|INDUSTRIES$'
 
-        text = self.regex_remove_designations(text, internet_domains, designation_all_regex)
-        # regex_prefixes is called in namex api before remove french
-        # text = self.regex_prefixes(text, prefixes)
-        text = self.regex_numbers_lot(text)
-        text = self.regex_repeated_strings(text)
-        text = self.regex_separated_ordinals(text, ordinal_suffixes)
-        # text = self.regex_keep_together_abv(text, exceptions_ws)
-        text = self.regex_punctuation(text)
-        text = self.regex_together_one_letter(text)
-        # text = self.regex_numbers_standalone(text, ordinal_suffixes, numbers, stand_alone_regex)
-        text = self.regex_remove_extra_spaces(text)
-
-        return text
+        designations_rx = self.get_remove_designations_regex(internet_domains, designation_all_regex)
+
+        results = []
+        for text in texts:
+            text = self.regex_remove_designations(text, internet_domains, designation_all_regex, designations_rx)
+            # regex_prefixes is called in namex api before remove french
+            # text = self.regex_prefixes(text, prefixes)
+            text = self.regex_numbers_lot(text)
+            text = self.regex_repeated_strings(text)
+            text = self.regex_separated_ordinals(text, ordinal_suffixes)
+            # text = self.regex_keep_together_abv(text, exceptions_ws)
+            text = self.regex_punctuation(text)
+            text = self.regex_together_one_letter(text)
+            # text = self.regex_numbers_standalone(text, ordinal_suffixes, numbers, stand_alone_regex)
+            text = self.regex_remove_extra_spaces(text)
+            results.append(text)
+
+        return results
 
     @classmethod
-    def regex_remove_designations(cls, text, internet_domains, designation_all_regex):
-        text = re.sub(r'\b({0})\b|(?<=\d),(?=\d)|(?<!\w)({1})(?![A-Za-z0-9_.])(?=.*$)'.format(
+    def get_remove_designations_regex(cls, internet_domains, designation_all_regex):
+        return re.compile(r'\b({0})\b|(?<=\d),(?=\d)|(?<!\w)({1})(?![A-Za-z0-9_.])(?=.*$)'.format(
             internet_domains,
             designation_all_regex),
-            '',
-            text,
-            0,
             re.IGNORECASE)
+
+    @classmethod
+    def regex_remove_designations(cls, text, internet_domains, designation_all_regex, designations_rx=None):
+        designations_rx = designations_rx or cls.get_remove_designations_regex(internet_domains, designation_all_regex)
+        text = designations_rx.sub('', text)
         return " ".join(text.split())
 
     @classmethod
-    def regex_prefixes(cls, text, prefixes, exception_designation):
+    def get_prefixes_regex(cls, prefixes, exception_designation):
         exception_designation_rx = '|'.join(map(re.escape, exception_designation))
         ws_generic_rx = r'(?<![a-zA-Z0-9_.])({0})\s*([ &/.-])\s*([A-Za-z]+)'.format(prefixes)
-        designation_rx = re.compile(r'({0})|{1}'.format(exception_designation_rx, ws_generic_rx), re.I)
+        return re.compile(r'({0})|{1}'.format(exception_designation_rx, ws_generic_rx), re.I)
+
+    @classmethod
+    def regex_prefixes(cls, text, prefixes, exception_designation, designation_rx=None):
+        designation_rx = designation_rx or cls.get_prefixes_regex(prefixes, exception_designation)
 
         text = designation_rx.sub(lambda x: x.group(1) or (x.group(2) + x.group(4)), text)
 
         return " ".join(text.split())
 
+    '''
+    regex_prefixes of each text. exception_designations holds the exception designations of each text, the regex of
+    every distinct exception list is compiled once for the whole batch.
+    '''
+
+    @classmethod
+    def regex_prefixes_batch(cls, texts, prefixes, exception_designations):
+        regexes = {}
+        results = []
+        for text, exception_designation in zip(texts, exception_designations):
+            key = tuple(exception_designation)
+            if key not in regexes:
+                regexes[key] = cls.get_prefixes_regex(prefixes, exception_designation)
+            results.append(cls.regex_prefixes(text, prefixes, exception_designation, regexes[key]))
+
+        return results
+
     @classmethod
     def regex_numbers_lot(cls, text):
         text = re.sub(r'(?<=[a-zA-Z\.])\'[Ss]|\(.*\d+.*\)|\(?No.?\s*\d+\)?|\(?lot.?\s*\d+[-]?\d*\)?',
@@ -351,5 +397,12 @@ class SynonymService(SynonymDesignationMixin, SynonymModelMixin):
         return exceptions_ws
 
     def get_gerund_word(self, word):
-        gerund = getInflection(word, 'VBG')
-        return [gerund[0]] if gerund is not None else ''
+        gerund = get_gerund(word)
+        return [gerund] if gerund is not None else ''
+
+
+# pyinflect looks the word up in its tables every time, substitutions fall back to it for every word without one
+@lru_cache(maxsize=10000)
+def get_gerund(word):
+    gerund = getInflection(word, 'VBG')
+    return gerund[0] if gerund is not None else None
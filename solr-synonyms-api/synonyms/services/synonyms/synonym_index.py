@@ -0,0 +1,195 @@
+import logging
+import os
+import re
+import threading
+from collections import namedtuple
+
+from synonyms.models.synonym import Synonym
+
+"""
+In-memory inverted index of the synonym table.
+Every lookup of SynonymService.find_word_synonyms used to be a regex scan of the table (lower(synonyms_text) ~ '\\yword\\y'),
+which no index can serve. The table is small and rarely edited, so it is loaded once into an immutable SynonymIndex:
+word -> rows and stem -> rows (the words of synonyms_text and stems_text), and category -> rows.
+SynonymIndexService polls the table version (Synonym.get_version) and swaps in a new index when it changes.
+"""
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 60  # seconds
+
+SynonymRow = namedtuple('SynonymRow', ['id', 'category', 'synonyms_text', 'stems_text'])
+
+"""
+A filter on the category of the rows, pattern is a Postgres regex (\\y word boundaries), negate excludes the matches.
+As in SQL, rows without a category never pass a category filter.
+"""
+CategoryFilter = namedtuple('CategoryFilter', ['pattern', 'negate'])
+
+_words_rx = re.compile(r'\w+')
+_word_rx = re.compile(r'\w+$')
+
+
+def to_python_regex(pattern):
+    return pattern.replace(r'\y', r'\b')
+
+
+def _get_words(text):
+    return set(_words_rx.findall(text.lower())) if text else set()
+
+
+class SynonymIndex(object):
+    """
+    Immutable snapshot of the synonym table. Lookups return the rows in id order.
+    """
+
+    @property
+    def version(self):
+        return self._version
+
+    def __init__(self, version, rows):
+        self._version = version
+        self._rows = tuple(sorted(rows, key=lambda row: row.id))
+
+        self._by_word = {}
+        self._by_stem = {}
+        self._by_category = {}
+        for idx, row in enumerate(self._rows):
+            for word in _get_words(row.synonyms_text):
+                self._by_word.setdefault(word, []).append(idx)
+            for stem in _get_words(row.stems_text):
+                self._by_stem.setdefault(stem, []).append(idx)
+            if row.category is not None:
+                self._by_category.setdefault(row.category.lower(), []).append(idx)
+
+        # Rows passing each category filter, there are only a handful of different filters
+        self._category_filter_cache = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def find(self, word=None, filters=(), stem=False):
+        """
+        The rows where the word is a whole word of synonyms_text (of stems_text if stem), like
+        lower(synonyms_text) ~ '\\yword\\y', that pass all the category filters.
+        @:param word The lower case word, or None for all the rows
+        """
+        if word is None:
+            found = range(len(self._rows))
+        elif _word_rx.match(word):
+            found = (self._by_stem if stem else self._by_word).get(word, [])
+        else:
+            # Not a plain word, eg. "h&m", match the regex like the database does
+            word_rx = re.compile(to_python_regex(r'\y{}\y'.format(word)))
+            found = [idx for idx, row in enumerate(self._rows)
+                     if word_rx.search((row.stems_text if stem else row.synonyms_text).lower())]
+
+        for category_filter in filters:
+            passing = self._get_category_filter_rows(category_filter)
+            found = [idx for idx in found if idx in passing]
+
+        return [self._rows[idx] for idx in found]
+
+    def _get_category_filter_rows(self, category_filter):
+        passing = self._category_filter_cache.get(category_filter)
+        if passing is None:
+            category_rx = re.compile(to_python_regex(category_filter.pattern))
+            passing = frozenset(idx for category, rows in self._by_category.items()
+                                if bool(category_rx.search(category)) != category_filter.negate for idx in rows)
+            self._category_filter_cache[category_filter] = passing
+        return passing
+
+
+class SynonymIndexService(object):
+    """
+    Holds the current SynonymIndex of the process.
+    The index is disabled when the refresh interval is 0, lookups then go to the database.
+    """
+
+    @property
+    def version(self):
+        return self._index.version if self._index else None
+
+    def __init__(self):
+        self._app = None
+        self._index = None
+        self._refresh_interval = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+        self._pid = None
+
+    def init_app(self, app):
+        self._app = app
+        self._refresh_interval = int(app.config.get('SYNONYM_INDEX_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL))
+
+        if self._refresh_interval > 0:
+            self.start_refresh()
+
+    def get(self):
+        if self._refresh_interval <= 0:
+            return None
+
+        # Gunicorn workers are forked from the app process, the refresh thread doesn't survive the fork
+        if self._pid != os.getpid():
+            self.start_refresh()
+
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load()
+                index = self._index
+
+        return index
+
+    def refresh(self):
+        """
+        Rebuild the index if the synonym table changed since it was loaded.
+        @:return True if a new index was swapped in
+        """
+        with self._app.app_context():
+            version = Synonym.get_version()
+        if self._index is not None and version == self._index.version:
+            return False
+
+        index = self._load()
+        with self._lock:
+            self._index = index
+
+        logger.info('Loaded the synonym index, %d rows, version %s', len(index), version)
+        return True
+
+    def start_refresh(self):
+        with self._lock:
+            if self._pid == os.getpid() and self._refresh_thread and self._refresh_thread.is_alive():
+                return
+
+            self._pid = os.getpid()
+            self._stop_event = threading.Event()
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, args=(self._stop_event,),
+                                                    name='synonym-index-refresh', daemon=True)
+            self._refresh_thread.start()
+
+    def stop_refresh(self):
+        self._stop_event.set()
+
+    def _refresh_loop(self, stop_event):
+        while True:
+            try:
+                self.refresh()
+            except Exception as err:
+                logger.error('Refreshing the synonym index failed: %s', repr(err))
+
+            if stop_event.wait(self._refresh_interval):
+                break
+
+    def _load(self):
+        with self._app.app_context():
+            version = Synonym.get_version()
+            rows = [SynonymRow(*row) for row in Synonym.find_all()]
+
+        return SynonymIndex(version, rows)
+
+
+synonym_index_service = SynonymIndexService()
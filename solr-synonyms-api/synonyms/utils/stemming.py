@@ -0,0 +1,50 @@
+from functools import lru_cache
+
+from nltk.stem import PorterStemmer
+
+'''
+Porter stemming with a bounded, process-wide LRU cache.
+Names are made of a small vocabulary, so the analysers stem the same few thousand words over and over; import porter
+from here rather than creating a PorterStemmer. PorterStemmer.stem is deterministic, so caching it changes no result.
+'''
+
+# TODO: Implement a true shared lib for stuff like this!
+#  This module is duplicated in the namex api project (namex.utils.stemming)
+
+DEFAULT_CACHE_SIZE = 50000  # words
+
+
+class CachedStemmer(object):
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self._stemmer = PorterStemmer()
+        self._stem = lru_cache(maxsize=maxsize)(self._stemmer.stem)
+
+    def stem(self, word):
+        return self._stem(word)
+
+    def stem_many(self, words):
+        stem = self._stem
+        return [stem(word) for word in words]
+
+    '''
+    Pre-load the cache, eg. with the synonym table vocabulary at startup.
+    @:return The number of words stemmed
+    '''
+    def warm_up(self, words):
+        count = 0
+        for word in words:
+            self._stem(word)
+            count += 1
+        return count
+
+    '''
+    @:return CacheInfo(hits, misses, maxsize, currsize)
+    '''
+    def cache_info(self):
+        return self._stem.cache_info()
+
+    def cache_clear(self):
+        self._stem.cache_clear()
+
+
+porter = CachedStemmer()
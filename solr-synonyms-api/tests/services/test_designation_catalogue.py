@@ -0,0 +1,85 @@
+import re
+
+from synonyms.constants import BCProtectedNameEntityTypes
+from synonyms.services.synonyms import DesignationPositionCodes, LanguageCodes
+from synonyms.services.synonyms.designation_catalogue import DesignationCatalogue
+
+designations = {
+    (None, 'end', 'english'): ['limited liability company', 'limited', 'ltd.', 'ltd', 'inc.', 'inc'],
+    (None, 'end', 'french'): ['limitee', 'ltee'],
+    (None, 'any', 'english'): ['co-operative', 'cooperative', 'co-op'],
+    (None, 'any', 'french'): ['cooperative'],
+    ('CR', 'end', 'english'): ['limited', 'ltd.', 'ltd', 'inc.', 'inc'],
+    ('CR', 'end', 'french'): ['limitee', 'ltee'],
+    ('UL', 'end', 'english'): ['unlimited liability company', 'ulc'],
+    ('UL', 'end', 'french'): []
+}
+
+
+class FakeDesignations(object):
+    def __init__(self):
+        self.calls = 0
+
+    def find_designations(self, entity_type_code, position_code, lang):
+        self.calls += 1
+        key = (getattr(entity_type_code, 'value', None), position_code.value, lang.lower())
+        return list(designations.get(key, []))
+
+
+def test_designations_are_found_once():
+    fake = FakeDesignations()
+    catalogue = DesignationCatalogue('v1', fake.find_designations)
+
+    first = catalogue.get_designations(None, DesignationPositionCodes.END, LanguageCodes.ENG.value)
+    first.append('changed by the caller')
+    second = catalogue.get_designations(None, DesignationPositionCodes.END, 'english')
+
+    assert second == designations[(None, 'end', 'english')]
+    assert fake.calls == 1
+
+
+def test_designation_end_regex():
+    catalogue = DesignationCatalogue('v1', FakeDesignations().find_designations)
+
+    found = catalogue.get_designation_end_regex().findall('armstrong plumbing ltd. limitee')
+
+    assert [designation[0].strip() for designation in found if designation[0]] == ['ltd.', 'limitee']
+
+
+def test_designation_any_and_all_regexes():
+    catalogue = DesignationCatalogue('v1', FakeDesignations().find_designations)
+
+    assert catalogue.get_designation_any_regex().findall('mountain co-op ltd') == [('co-op', 'co-op')]
+    assert catalogue.get_designation_all_regex().findall('mountain co-op ltd') == ['co-op', 'ltd']
+
+
+def test_all_end_designations_and_reverse_lookup():
+    fake = FakeDesignations()
+    catalogue = DesignationCatalogue('v1', fake.find_designations)
+
+    all_end_designations = catalogue.get_all_end_designations()
+
+    assert all_end_designations[BCProtectedNameEntityTypes.CORPORATION.value] == \
+        ['limited', 'limitee', 'ltd.', 'inc.', 'ltee', 'ltd', 'inc']
+    assert all_end_designations[BCProtectedNameEntityTypes.UNLIMITED_LIABILITY_COMPANY.value] == \
+        ['unlimited liability company', 'ulc']
+    assert catalogue.get_entity_types_by_end_designation('ulc') == ['UL']
+    assert catalogue.get_entity_types_by_end_designation('limited') == ['UL', 'CR']
+    assert catalogue.get_entity_types_by_end_designation('liability') == ['UL']
+
+    calls = fake.calls
+    catalogue.get_all_end_designations()
+    assert fake.calls == calls
+
+
+def test_reverse_lookup_of_other_values_is_not_kept():
+    catalogue = DesignationCatalogue('v1', FakeDesignations().find_designations)
+    catalogue.get_entity_types_by_end_designation('ltd')
+    cached = len(catalogue._values)
+
+    for value in ('lim', 'company', 'not a designation'):
+        catalogue.get_entity_types_by_end_designation(value)
+
+    assert catalogue.get_entity_types_by_end_designation('lim') == ['UL', 'CR']
+    assert catalogue.get_entity_types_by_end_designation('not a designation') == []
+    assert len(catalogue._values) == cached
@@ -1,7 +1,7 @@
 import pytest
 
 from . import syn_svc, designation_all_regex, prefixes, ordinal_suffixes, \
-    exceptions_ws, numbers, stand_alone_words, internet_domains
+    exceptions_ws, numbers, stand_alone_words, internet_domains, all_designations, prefix_list, number_list
 
 
 # class TestSynonymService(TestCase):
@@ -181,3 +181,23 @@ def test_regex_strip_out_numbers_middle_end(name, expected):
                          ])
 def test_regex_numbers_standalone(name, expected):
     assert syn_svc.regex_numbers_standalone(name, ordinal_suffixes, numbers, stand_alone_words) == expected
+
+
+'''
+Batch variants: same results as one call per text, in order
+'''
+
+
+def test_regex_transform_batch():
+    names = ["TOBI.COM CANADA OPERATIONS LTD.", "REYNOLD'S HAIR SALON", "4THGEN A.B.C. HOLDINGS INC."]
+
+    assert syn_svc.regex_transform_batch(names, all_designations, prefix_list, number_list, []) == \
+        [syn_svc.regex_transform(name, all_designations, prefix_list, number_list, []) for name in names]
+
+
+def test_regex_prefixes_batch():
+    names = ["MONTESSORI PRE-SCHOOL LTD.", "HOME STAGING & RE-DESIGN INC.", "MOUNTAIN CO-OP"]
+    exception_designations = [['null'], ['null'], ['co-op']]
+
+    assert syn_svc.regex_prefixes_batch(names, prefixes, exception_designations) == \
+        ["MONTESSORI PRESCHOOL LTD.", "HOME STAGING & REDESIGN INC.", "MOUNTAIN CO-OP"]
@@ -0,0 +1,37 @@
+from synonyms.services.synonyms.synonym_index import CategoryFilter, SynonymIndex, SynonymRow
+
+synonym_index = SynonymIndex('v1', [
+    SynonymRow(3, 'English Designations_end', 'limited, ltd', 'limit, ltd'),
+    SynonymRow(1, 'Sub', 'mountain, mount, mt', 'mountain, mount, mt'),
+    SynonymRow(2, 'Stop Words', 'the, and, of', 'the, and, of'),
+    SynonymRow(4, None, 'h&m, mountain', 'h&m, mountain'),
+    SynonymRow(5, 'Real Estate', 'real estate, realty', 'real estat, realti')
+])
+
+'''
+Same rows as the synonym table queries: lower(synonyms_text) ~ '\\yword\\y' and the category regexes
+'''
+
+
+def test_find_whole_words():
+    assert [row.id for row in synonym_index.find('mountain')] == [1, 4]
+    assert [row.id for row in synonym_index.find('mount')] == [1]
+    assert [row.id for row in synonym_index.find('estate')] == [5]
+    assert [row.id for row in synonym_index.find('h&m')] == [4]
+    assert synonym_index.find('mounta') == []
+
+
+def test_find_stems():
+    assert [row.id for row in synonym_index.find('realti', stem=True)] == [5]
+    assert synonym_index.find('realti') == []
+
+
+def test_find_with_category_filters():
+    not_sub_or_stop = [CategoryFilter(r'\ysub\y', negate=True), CategoryFilter(r'\ystop\y', negate=True)]
+
+    assert [row.id for row in synonym_index.find(None, not_sub_or_stop)] == [3, 5]
+    assert [row.id for row in synonym_index.find('mountain', [CategoryFilter(r'\ysub\y', negate=False)])] == [1]
+    assert [row.id for row in synonym_index.find(None, [
+        CategoryFilter(r'\ydesignation[s]?[_-]+end\y', negate=False),
+        CategoryFilter(r'\yenglish\y', negate=False)
+    ])] == [3]